@@ -0,0 +1,209 @@
+# backend/admission_control.py
+"""
+Priority admission control for outbound LLM calls.
+
+A fixed number of calls may be in flight at once. Callers beyond that wait
+in a bounded FIFO queue per priority class; a freed slot always goes to the
+oldest waiter of the highest priority class that is below its own in-flight
+cap. Waiters give up after their class's queue-time limit, and callers
+arriving at a full queue are rejected immediately, so background work
+(quiz generation) can never crowd out interactive requests (translation,
+tutor, avatar chat).
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BACKGROUND = 'background'
+
+WAIT_SAMPLES = 1000
+
+class AdmissionRejected(Exception):
+    """Raised when a call is not admitted (queue full or queue-time limit reached)"""
+
+    def __init__(self, name: str, priority: str, reason: str, retry_after: float):
+        super().__init__(f"{name} admission rejected for {priority} call: {reason}")
+        self.name = name
+        self.priority = priority
+        self.reason = reason
+        self.retry_after = retry_after
+
+class _Waiter:
+    """A queued caller waiting for a slot"""
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.granted = threading.Event()
+
+class _ClassStats:
+    """Counters and recent wait times for one priority class"""
+
+    def __init__(self):
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_full = 0
+        self.timed_out = 0
+        self.max_depth = 0
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+class AdmissionController:
+    """
+    Limits concurrent calls with prioritized, bounded waiting.
+
+    Usage:
+        with controller.slot(PRIORITY_BACKGROUND):
+            call_upstream()
+    """
+
+    def __init__(self, name: str, max_in_flight: int, priorities: Sequence[str],
+                 queue_limits: Dict[str, int], queue_timeouts: Dict[str, float],
+                 class_limits: Optional[Dict[str, int]] = None):
+        """
+        Initialize the controller.
+
+        Args:
+            name (str): Name used in logs and errors
+            max_in_flight (int): Concurrent calls allowed across all classes
+            priorities (sequence): Priority classes, highest first
+            queue_limits (dict): Maximum queued callers per class
+            queue_timeouts (dict): Maximum seconds a caller of each class may wait
+            class_limits (dict): Optional in-flight cap per class, so a
+                lower class cannot hold every slot
+        """
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.priorities = list(priorities)
+        self.queue_limits = dict(queue_limits)
+        self.queue_timeouts = dict(queue_timeouts)
+        self.class_limits = dict(class_limits or {})
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._class_in_flight = {priority: 0 for priority in self.priorities}
+        self._queues = {priority: deque() for priority in self.priorities}
+        self._stats = {priority: _ClassStats() for priority in self.priorities}
+
+    def _has_capacity(self, priority: str) -> bool:
+        if self._in_flight >= self.max_in_flight:
+            return False
+        limit = self.class_limits.get(priority)
+        return limit is None or self._class_in_flight[priority] < limit
+
+    def _grant(self, priority: str):
+        self._in_flight += 1
+        self._class_in_flight[priority] += 1
+        self._stats[priority].admitted += 1
+
+    def _dispatch(self):
+        """Hand free slots to queued waiters, highest priority first (lock held)"""
+        for priority in self.priorities:
+            queue = self._queues[priority]
+            while queue and self._has_capacity(priority):
+                waiter = queue.popleft()
+                self._grant(priority)
+                waiter.granted.set()
+
+    def acquire(self, priority: str, timeout: Optional[float] = None):
+        """
+        Wait for a slot.
+
+        Args:
+            priority (str): Priority class of the call
+            timeout (float): Optional cap on the wait below the class's
+                queue-time limit (e.g. the remaining request budget)
+
+        Raises:
+            AdmissionRejected: If the class queue is full or the wait times out
+        """
+        stats = self._stats[priority]
+        max_wait = self.queue_timeouts[priority]
+        if timeout is not None:
+            max_wait = max(0.0, min(max_wait, timeout))
+
+        with self._lock:
+            if self._has_capacity(priority) and not any(
+                self._queues[p] for p in self.priorities[:self.priorities.index(priority) + 1]
+            ):
+                self._grant(priority)
+                stats.waits.append(0.0)
+                return
+            queue = self._queues[priority]
+            if len(queue) >= self.queue_limits[priority]:
+                stats.rejected_full += 1
+                raise AdmissionRejected(self.name, priority, 'queue full', max_wait or 1.0)
+            waiter = _Waiter(priority)
+            queue.append(waiter)
+            stats.queued += 1
+            stats.max_depth = max(stats.max_depth, len(queue))
+
+        start = time.monotonic()
+        granted = waiter.granted.wait(max_wait)
+        waited = time.monotonic() - start
+        if not granted:
+            with self._lock:
+                # The slot may have been granted between the timeout and the lock
+                if not waiter.granted.is_set():
+                    queue.remove(waiter)
+                    stats.timed_out += 1
+                    stats.waits.append(waited)
+                    logger.warning(f"{self.name}: {priority} call waited {waited:.2f}s without a slot")
+                    raise AdmissionRejected(self.name, priority, 'queue timeout', max(max_wait, 1.0))
+        stats.waits.append(waited)
+
+    def release(self, priority: str):
+        """Return a slot taken by acquire()"""
+        with self._lock:
+            self._in_flight -= 1
+            self._class_in_flight[priority] -= 1
+            self._dispatch()
+
+    def slot(self, priority: str, timeout: Optional[float] = None) -> '_Slot':
+        """Context manager that holds a slot for the duration of the block"""
+        return _Slot(self, priority, timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of in-flight calls, queue depths and wait times per class"""
+        with self._lock:
+            classes = {}
+            for priority in self.priorities:
+                stats = self._stats[priority]
+                waits = sorted(stats.waits)
+                classes[priority] = {
+                    'in_flight': self._class_in_flight[priority],
+                    'queue_depth': len(self._queues[priority]),
+                    'max_queue_depth': stats.max_depth,
+                    'admitted': stats.admitted,
+                    'queued': stats.queued,
+                    'rejected_queue_full': stats.rejected_full,
+                    'rejected_timeout': stats.timed_out,
+                    'wait_ms_avg': round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+                    'wait_ms_p95': round(waits[max(int(len(waits) * 0.95) - 1, 0)] * 1000, 1) if waits else 0.0,
+                    'wait_ms_max': round(waits[-1] * 1000, 1) if waits else 0.0
+                }
+            return {
+                'name': self.name,
+                'max_in_flight': self.max_in_flight,
+                'in_flight': self._in_flight,
+                'classes': classes
+            }
+
+class _Slot:
+    """Context manager returned by AdmissionController.slot()"""
+
+    def __init__(self, controller: AdmissionController, priority: str, timeout: Optional[float]):
+        self.controller = controller
+        self.priority = priority
+        self.timeout = timeout
+
+    def __enter__(self):
+        self.controller.acquire(self.priority, self.timeout)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.controller.release(self.priority)
+        return False
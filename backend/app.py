@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context, has_request_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
@@ -9,22 +9,62 @@ from google.cloud.texttospeech_v1 import TextToSpeechClient
 import logging
 import json
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 import random
 import base64
 import time
 from functools import wraps
 import threading
 from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 import hashlib
 import uuid
 import requests
 from google.auth import default
-from fuzzywuzzy import fuzz
 import re
-import google.generativeai as genai
 
 # Import centralized configuration
 from config import get_llm_config, get_model_name, LLM_PROVIDER, GEMINI_API_KEY
+from config import (
+    TRANSLATION_CACHE_TTL, TRANSLATION_CACHE_MAX_ENTRIES, TRANSLATION_CACHE_MAX_BYTES,
+    TTS_CACHE_TTL, TTS_CACHE_MAX_ENTRIES, TTS_CACHE_MAX_BYTES,
+    TRANSLATION_DISK_CACHE_PATH, TRANSLATION_DISK_CACHE_TTL,
+    TRANSLATION_DISK_CACHE_MAX_ENTRIES, TRANSLATION_DISK_CACHE_MAX_BYTES,
+    LLM_BREAKER_FAILURE_RATE, LLM_BREAKER_WINDOW, LLM_BREAKER_MIN_CALLS,
+    LLM_BREAKER_COOLDOWN, LLM_BREAKER_HALF_OPEN_CALLS,
+    LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY, LLM_RETRY_INLINE_MAX_DELAY,
+    LLM_HTTP_READ_TIMEOUT, REQUEST_DEADLINE_DEFAULT, REQUEST_DEADLINE_MAX,
+    LLM_MIN_ATTEMPT_BUDGET, LOCAL_LLM_LATENCY_MS, LOCAL_LLM_LATENCY_JITTER_MS,
+    LOCAL_LLM_ERROR_RATE, LOCAL_LLM_TIMEOUT_RATE, LOCAL_LLM_MALFORMED_RATE, LOCAL_LLM_SEED,
+    LLM_RECORD_PATH, LLM_RECORD_PROMPTS, LLM_REPLAY_PATH, LLM_REPLAY_LATENCY_SCALE, LLM_REPLAY_MISS,
+    LLM_MAX_IN_FLIGHT, LLM_BACKGROUND_MAX_IN_FLIGHT, LLM_INTERACTIVE_QUEUE_LIMIT,
+    LLM_INTERACTIVE_QUEUE_TIMEOUT, LLM_BACKGROUND_QUEUE_LIMIT, LLM_BACKGROUND_QUEUE_TIMEOUT,
+    LOCAL_LLM_MS_PER_OUTPUT_CHAR, QUIZ_GENERATION_MODE,
+    QUIZ_POOL_PATH, QUIZ_POOL_LOW_WATER, QUIZ_POOL_REFILL_BATCH, QUIZ_POOL_MAX_SIZE,
+    SQLITE_JOURNAL_MODE, SQLITE_WAL_CHECKPOINT_INTERVAL, SQLITE_WAL_CHECKPOINT_MODE,
+    WORD_OF_DAY_TIMEZONE
+)
+from cache_service import TTLCache, SQLiteCacheStore
+from request_coalescer import SingleFlight, make_key
+from llm_providers import create_llm_provider
+from llm_recording import LLMRecorder, RecordingProvider
+from circuit_breaker import CircuitBreaker, CircuitOpenError, backoff_delay
+from admission_control import (
+    AdmissionController, AdmissionRejected, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+)
+from request_deadline import (
+    DEADLINE_HEADER, Deadline, DeadlineExceeded, parse_budget, start_deadline, get_deadline, clear_deadline,
+    deadline_failure
+)
+from question_pool import QuestionPool
+from quiz_catalog import QuizCatalog, read_quizzes_file
+from quiz_grading import grade_quiz_answer, grade_quiz_answers
+from sqlite_tuning import WalCheckpointer
+from daily_word import DailyWordPublisher
+from json_extractor import (
+    IncrementalObjectParser, JSONExtractionError, extract_json, extract_json_object,
+    strip_code_fence, extraction_stats
+)
 
 # Configure comprehensive logging first with UTF-8 encoding
 logging.basicConfig(
@@ -47,8 +87,8 @@ logger.addHandler(console_handler)
 
 # Import database service
 try:
-    from models import create_tables
-    from db_service import db_service
+    from models import create_tables, engine
+    from db_service import db_service, QuizAnswerConflict
     logger.info("Successfully imported models and db_service")
 except ImportError as e:
     logger.error(f"Failed to import models or db_service: {e}")
@@ -60,6 +100,12 @@ except ImportError as e:
     logger.error(f"Files in current directory: {os.listdir('.')}")
     raise
 
+# Keep the SQLite write-ahead log small with periodic checkpoints
+wal_checkpointer = None
+if engine.dialect.name == 'sqlite' and SQLITE_JOURNAL_MODE.upper() == 'WAL' and SQLITE_WAL_CHECKPOINT_INTERVAL > 0:
+    wal_checkpointer = WalCheckpointer(engine, SQLITE_WAL_CHECKPOINT_INTERVAL, SQLITE_WAL_CHECKPOINT_MODE)
+    wal_checkpointer.start()
+
 # Import vector service for RAG functionality
 try:
     from vector_service import vector_service
@@ -124,7 +170,7 @@ CORS(app, resources={
             "https://6837027b175dc48ca24afe5c--ttsai.netlify.app"
         ],
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization", "X-Requested-With"],
+        "allow_headers": ["Content-Type", "Authorization", "X-Requested-With", DEADLINE_HEADER],
         "supports_credentials": True
     }
 })
@@ -158,15 +204,91 @@ if auth_available:
 else:
     logger.warning("Authentication components not available")
 
+# Request deadline budgets (seconds) for endpoints that differ from REQUEST_DEADLINE_DEFAULT
+REQUEST_DEADLINES = {
+    'basic_translate': 15,
+    'batch_translate': 45,
+    'advanced_translate': 25,
+    'language_tutor_explain': 30,
+    'avatar_conversation': 20,
+    'generate_quiz': 60
+}
+
+@app.before_request
+def start_request_deadline():
+    """Start the deadline budget for this request"""
+    default = REQUEST_DEADLINES.get(request.endpoint, REQUEST_DEADLINE_DEFAULT)
+    start_deadline(parse_budget(request.headers.get(DEADLINE_HEADER), default, REQUEST_DEADLINE_MAX))
+
+@app.after_request
+def report_refused_deadline(response):
+    """
+    Answer 504 when a request failed because the deadline refused an operation it needed.
+    
+    db_service reads re-raise refusals, which endpoints map through
+    deadline_exceeded_response; a write refused at the deadline still
+    comes back as a failed result and the endpoint's 500. Successful
+    responses are left alone, e.g. when only track_event was refused.
+    """
+    error = None if response.is_streamed else deadline_failure(response.status_code)
+    if error is not None:
+        logger.warning(f"Request deadline exceeded in {request.endpoint}: {error.operation} refused")
+        timeout_response, status = deadline_exceeded_response(error)
+        timeout_response.status_code = status
+        return timeout_response
+    return response
+
+@app.teardown_request
+def clear_request_deadline(error=None):
+    clear_deadline()
+
+@app.teardown_request
+def remove_db_session(error=None):
+    """Release this request's database session so its connection goes back to the pool"""
+    db_service.close_session()
+
 # Rate limiting configuration
 RATE_LIMIT_REQUESTS = 100  # requests per window
 RATE_LIMIT_WINDOW = 60     # window in seconds
 rate_limit_storage = defaultdict(lambda: deque())
 
-# Cache configuration
-CACHE_DURATION = 300  # 5 minutes
-translation_cache = {}
-tts_cache = {}
+# Batch translation limits
+BATCH_TRANSLATION_MAX_ITEMS = 100   # texts per request
+BATCH_TRANSLATION_CHUNK_SIZE = 20   # texts per LLM call
+BATCH_TRANSLATION_MAX_WORKERS = 4   # concurrent LLM calls per request
+
+# Quiz question generation
+QUIZ_GENERATION_MAX_WORKERS = 6     # concurrent LLM calls per quiz
+QUIZ_GENERATION_TIMEOUT = 20        # seconds for all LLM questions of a quiz
+
+# Cache configuration (size-bounded LRU caches with per-cache TTL)
+translation_disk_cache = None
+if TRANSLATION_DISK_CACHE_PATH:
+    try:
+        translation_disk_cache = SQLiteCacheStore(
+            TRANSLATION_DISK_CACHE_PATH,
+            ttl=TRANSLATION_DISK_CACHE_TTL,
+            max_entries=TRANSLATION_DISK_CACHE_MAX_ENTRIES,
+            max_bytes=TRANSLATION_DISK_CACHE_MAX_BYTES
+        )
+        logger.info(f"Persistent translation cache enabled at {TRANSLATION_DISK_CACHE_PATH}")
+    except Exception as e:
+        logger.error(f"Failed to open persistent translation cache: {e}")
+        translation_disk_cache = None
+
+translation_cache = TTLCache(
+    'translation',
+    ttl=TRANSLATION_CACHE_TTL,
+    max_entries=TRANSLATION_CACHE_MAX_ENTRIES,
+    max_bytes=TRANSLATION_CACHE_MAX_BYTES,
+    backing_store=translation_disk_cache
+)
+tts_cache = TTLCache(
+    'tts',
+    ttl=TTS_CACHE_TTL,
+    max_entries=TTS_CACHE_MAX_ENTRIES,
+    max_bytes=TTS_CACHE_MAX_BYTES
+)
 
 # Initialize Google Cloud clients with error handling
 try:
@@ -191,60 +313,51 @@ except Exception as e:
 # Configure LLM API using centralized configuration
 llm_config = get_llm_config()
 model_name = get_model_name()
-gemini_model = None
+llm_provider = None
+gemini_model = None  # Truthy when an LLM provider is ready (name kept from the Gemini-only setup)
 
-if not llm_config["api_key"]:
+if llm_config["provider"] not in ("local", "replay") and not llm_config["api_key"]:
     logger.warning("LLM API key not found in environment variables")
     logger.warning("Translation services will be limited. Set GEMINI_API_KEY for full functionality.")
-    gemini_model = None
 else:
     try:
-        if llm_config["provider"] == "google_ai_studio":
-            logger.info(f"Configuring Google AI Studio with model: {model_name}")
-            logger.info(f"API key: {llm_config['api_key'][:8]}...{llm_config['api_key'][-4:]}")
-            
-            # Configure the Google Generative AI library
-            genai.configure(api_key=llm_config["api_key"])
-            
-            # Initialize the model
-            gemini_model = genai.GenerativeModel(model_name)
-            
-            # Test connection
-            test_response = gemini_model.generate_content("Test connection")
-            logger.info("Gemini connection test successful")
-            
+        if llm_config["provider"] == "local":
+            logger.info(f"Using local stub LLM provider (latency {LOCAL_LLM_LATENCY_MS:.0f}ms, error rate {LOCAL_LLM_ERROR_RATE})")
+        elif llm_config["provider"] == "replay":
+            logger.info(f"Replaying recorded LLM responses from {LLM_REPLAY_PATH} (latency x{LLM_REPLAY_LATENCY_SCALE})")
         else:
-            # Legacy OpenRouter support (fallback)
-            logger.info(f"Using legacy OpenRouter with model: {model_name}")
+            logger.info(f"Configuring LLM provider {llm_config['provider']} with model: {model_name}")
             logger.info(f"API key: {llm_config['api_key'][:8]}...{llm_config['api_key'][-4:]}")
-            
-            # Test OpenRouter connection
-            headers = {
-                "Authorization": f"Bearer {llm_config['api_key']}",
-                "Content-Type": "application/json"
-            }
-            
-            test_data = {
-                "model": model_name,
-                "messages": [{"role": "user", "content": "Test connection"}]
-            }
-            
-            test_response = requests.post(
-                llm_config["base_url"],
-                headers=headers,
-                json=test_data,
-                timeout=10
+        
+        provider = create_llm_provider(llm_config, local_settings={
+            'latency_ms': LOCAL_LLM_LATENCY_MS,
+            'latency_jitter_ms': LOCAL_LLM_LATENCY_JITTER_MS,
+            'error_rate': LOCAL_LLM_ERROR_RATE,
+            'timeout_rate': LOCAL_LLM_TIMEOUT_RATE,
+            'malformed_rate': LOCAL_LLM_MALFORMED_RATE,
+            'seed': LOCAL_LLM_SEED,
+            'output_ms_per_char': LOCAL_LLM_MS_PER_OUTPUT_CHAR
+        }, replay_settings={
+            'path': LLM_REPLAY_PATH,
+            'latency_scale': LLM_REPLAY_LATENCY_SCALE,
+            'miss_fallback': LLM_REPLAY_MISS
+        })
+        if LLM_RECORD_PATH:
+            logger.info(f"Recording LLM calls to {LLM_RECORD_PATH}")
+            provider = RecordingProvider(
+                provider,
+                LLMRecorder(LLM_RECORD_PATH, include_prompts=LLM_RECORD_PROMPTS),
+                source=lambda: request.endpoint if has_request_context() else None
             )
-            
-            if test_response.status_code == 200:
-                logger.info(f"OpenRouter connection test successful for {model_name}")
-                gemini_model = "openrouter"  # Flag for OpenRouter usage
-            else:
-                logger.error(f"OpenRouter connection test failed: {test_response.status_code}")
-                gemini_model = None
+        
+        # Test connection
+        if provider.check_connection():
+            llm_provider = provider
+            gemini_model = provider
             
     except Exception as e:
         logger.error(f"Failed to configure LLM: {e}")
+        llm_provider = None
         gemini_model = None
 
 # Enhanced rate limiting decorator
@@ -278,185 +391,592 @@ def get_cache_key(data):
     """Generate a cache key from request data"""
     return hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
 
-def get_cached_result(cache_dict, key):
-    """Get cached result if not expired"""
-    if key in cache_dict:
-        result, timestamp = cache_dict[key]
-        if time.time() - timestamp < CACHE_DURATION:
-            return result
-        else:
-            del cache_dict[key]
-    return None
+# Concurrent identical LLM calls share one upstream request
+llm_single_flight = SingleFlight('llm')
+
+# Stop calling the LLM while it is failing; callers fail fast with 503
+llm_circuit_breaker = CircuitBreaker(
+    'llm',
+    failure_rate=LLM_BREAKER_FAILURE_RATE,
+    window=LLM_BREAKER_WINDOW,
+    min_calls=LLM_BREAKER_MIN_CALLS,
+    cooldown=LLM_BREAKER_COOLDOWN,
+    half_open_max_calls=LLM_BREAKER_HALF_OPEN_CALLS
+)
+
+# Admission control for upstream LLM calls: interactive requests are served before
+# background quiz generation, which may never hold more than its own share of slots
+llm_admission = AdmissionController(
+    'llm',
+    max_in_flight=LLM_MAX_IN_FLIGHT,
+    priorities=(PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND),
+    queue_limits={
+        PRIORITY_INTERACTIVE: LLM_INTERACTIVE_QUEUE_LIMIT,
+        PRIORITY_BACKGROUND: LLM_BACKGROUND_QUEUE_LIMIT
+    },
+    queue_timeouts={
+        PRIORITY_INTERACTIVE: LLM_INTERACTIVE_QUEUE_TIMEOUT,
+        PRIORITY_BACKGROUND: LLM_BACKGROUND_QUEUE_TIMEOUT
+    },
+    class_limits={PRIORITY_BACKGROUND: LLM_BACKGROUND_MAX_IN_FLIGHT}
+)
 
-def cache_result(cache_dict, key, result):
-    """Cache a result with timestamp"""
-    cache_dict[key] = (result, time.time())
+def deadline_exceeded_response(error):
+    """504 response for requests whose deadline budget ran out"""
+    return jsonify({
+        'error': 'Request deadline exceeded',
+        'details': str(error)
+    }), 504
+
+def llm_unavailable_response(error):
+    """503 response for calls rejected by the open LLM circuit or by admission control"""
+    response = jsonify({
+        'error': 'AI service temporarily unavailable',
+        'retry_after': round(error.retry_after)
+    })
+    response.headers['Retry-After'] = str(max(1, round(error.retry_after)))
+    return response, 503
 
 # LLM API helper function
-def call_llm_api(prompt, model=None, max_tokens=None, retries=2):
-    """Make a call to the configured LLM API with retry logic"""
+def call_llm_api(prompt, model=None, max_tokens=None, retries=2, deadline=None, priority=PRIORITY_INTERACTIVE):
+    """
+    Make a call to the configured LLM API with retry logic.
+    
+    Concurrent calls with the same prompt and generation parameters are
+    coalesced: only one request is sent upstream and every caller receives
+    its result or error. The leader's deadline and priority bound the shared call;
+    a follower stops waiting when its own deadline runs out.
+    
+    Args:
+        deadline (Deadline): Budget for the call, defaults to the current request's
+        priority (str): Admission class, PRIORITY_BACKGROUND for quiz generation
+    
+    Raises:
+        CircuitOpenError: If the LLM circuit breaker is open
+        AdmissionRejected: If no upstream slot frees up within the queue-time limit
+        DeadlineExceeded: If the deadline cannot cover an attempt, or runs out
+            while waiting for a coalesced call
+    """
     llm_config = get_llm_config()
     
-    if not gemini_model or not llm_config["api_key"]:
+    if not gemini_model or not llm_provider:
         raise Exception("LLM API not configured")
     
+    llm_circuit_breaker.check()
+    deadline = deadline or get_deadline()
+    if deadline and not deadline.can_afford(LLM_MIN_ATTEMPT_BUDGET):
+        raise DeadlineExceeded('LLM call')
+    
+    key = make_key(
+        prompt,
+        llm_config["provider"],
+        model or llm_config["model"],
+        max_tokens or llm_config["max_tokens"],
+        llm_config["temperature"]
+    )
+    return llm_single_flight.do(key, _call_llm_api, prompt, model, max_tokens, retries, deadline, priority, deadline=deadline)
+
+def get_llm_read_timeout(deadline):
+    """Read timeout for one LLM attempt, bounded by the remaining deadline budget"""
+    return deadline.timeout(LLM_HTTP_READ_TIMEOUT) if deadline else LLM_HTTP_READ_TIMEOUT
+
+def get_admission_timeout(deadline):
+    """Longest an LLM call may queue for a slot and still leave budget for the attempt"""
+    return max(0.0, deadline.remaining() - LLM_MIN_ATTEMPT_BUDGET) if deadline else None
+
+def can_retry_llm(attempt, retries, deadline):
+    """
+    Decide whether to retry a failed LLM attempt.
+    
+    The backoff is slept on the request thread, so only retries whose
+    backoff window fits within LLM_RETRY_INLINE_MAX_DELAY are made inline;
+    longer waits are left to the caller (the circuit breaker sheds load
+    while the provider keeps failing).
+    
+    Returns:
+        float: Backoff delay before the retry, or None when there are no
+        retries left, the backoff window exceeds the inline limit, or the
+        remaining budget cannot cover the delay plus another attempt
+    """
+    if attempt >= retries:
+        return None
+    if min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * (2 ** attempt)) > LLM_RETRY_INLINE_MAX_DELAY:
+        logger.warning(f"Skipping LLM retry: backoff would block the request for over {LLM_RETRY_INLINE_MAX_DELAY:.1f}s")
+        return None
+    delay = backoff_delay(attempt, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY)
+    if deadline and not deadline.can_afford(delay + LLM_MIN_ATTEMPT_BUDGET):
+        logger.warning(f"Skipping LLM retry: {deadline.remaining():.1f}s left in request budget")
+        return None
+    return delay
+
+def _call_llm_api(prompt, model=None, max_tokens=None, retries=2, deadline=None, priority=PRIORITY_INTERACTIVE):
+    """
+    Send one LLM API request, retrying with backoff while the circuit and deadline allow it.
+    
+    Each attempt holds an admission slot; the slot is released during backoff.
+    """
+    llm_config = get_llm_config()
+    
     last_error = None
     for attempt in range(retries + 1):
-        try:
-            if llm_config["provider"] == "google_ai_studio" and isinstance(gemini_model, genai.GenerativeModel):
-                # Use Google AI Studio API directly
-                generation_config = genai.types.GenerationConfig(
-                    max_output_tokens=max_tokens or llm_config["max_tokens"],
-                    temperature=llm_config["temperature"]
-                )
-                
-                response = gemini_model.generate_content(
-                    prompt,
-                    generation_config=generation_config
-                )
-                
-                if response.text:
-                    return response.text.strip()
-                else:
-                    raise Exception("Empty response from Gemini API")
+        with llm_admission.slot(priority, get_admission_timeout(deadline)):
+            try:
+                # The breaker records the attempt's failure before it is converted below
+                with llm_circuit_breaker.attempt():
+                    content = llm_provider.generate(
+                        prompt,
+                        model=model or llm_config["model"],
+                        max_tokens=max_tokens or llm_config["max_tokens"],
+                        temperature=llm_config["temperature"],
+                        timeout=get_llm_read_timeout(deadline)
+                    )
+                return content
                     
-            else:
-                # OpenRouter fallback
-                model = model or llm_config["model"]
-                max_tokens = max_tokens or llm_config["max_tokens"]
-                
-                headers = {
-                    "Authorization": f"Bearer {llm_config['api_key']}",
-                    "Content-Type": "application/json"
-                }
-                
-                data = {
-                    "model": model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": max_tokens,
-                    "temperature": llm_config["temperature"]
-                }
-                
-                response = requests.post(
-                    llm_config["base_url"],
-                    headers=headers,
-                    json=data,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    return result['choices'][0]['message']['content']
-                else:
-                    error_msg = f"OpenRouter API error: {response.status_code}"
-                    if response.text:
-                        error_msg += f" - {response.text}"
-                    raise Exception(error_msg)
-                
-        except requests.exceptions.Timeout:
-            last_error = Exception("LLM API timeout")
-        except requests.exceptions.RequestException as e:
-            last_error = Exception(f"LLM API request failed: {e}")
-        except Exception as e:
-            last_error = Exception(f"LLM API error: {e}")
-        
-        # If we're here, there was an error
-        if attempt < retries:
-            logger.warning(f"LLM API call failed (attempt {attempt+1}/{retries+1}), retrying...")
-            time.sleep(1)  # Wait before retrying
+            except CircuitOpenError:
+                raise
+            except requests.exceptions.Timeout:
+                last_error = Exception("LLM API timeout")
+            except requests.exceptions.RequestException as e:
+                last_error = Exception(f"LLM API request failed: {e}")
+            except Exception as e:
+                last_error = Exception(f"LLM API error: {e}")
+        delay = can_retry_llm(attempt, retries, deadline)
+        if delay is None:
+            break
+        logger.warning(f"LLM API call failed (attempt {attempt+1}/{retries+1}), retrying in {delay:.2f}s...")
+        time.sleep(delay)
         
     # If we've exhausted all retries, raise the last error
     if last_error:
         raise last_error
 
+def stream_llm_api(prompt, model=None, max_tokens=None, retries=2, deadline=None):
+    """
+    Stream a response from the configured LLM API, yielding text chunks.
+    
+    Streams are not coalesced. Failed attempts are retried only until the
+    first chunk has been yielded. Streams are interactive and hold an
+    admission slot until the last chunk.
+    
+    Raises:
+        CircuitOpenError: If the LLM circuit breaker is open
+        AdmissionRejected: If no upstream slot frees up within the queue-time limit
+        DeadlineExceeded: If the deadline cannot cover an attempt
+    """
+    llm_config = get_llm_config()
+    
+    if not gemini_model or not llm_provider:
+        raise Exception("LLM API not configured")
+    
+    deadline = deadline or get_deadline()
+    if deadline and not deadline.can_afford(LLM_MIN_ATTEMPT_BUDGET):
+        raise DeadlineExceeded('LLM stream')
+    
+    last_error = None
+    for attempt in range(retries + 1):
+        received = False
+        with llm_admission.slot(PRIORITY_INTERACTIVE, get_admission_timeout(deadline)):
+            try:
+                # A stream closed by the client mid-response releases its
+                # reservation instead of recording an outcome
+                with llm_circuit_breaker.attempt():
+                    for chunk_text in llm_provider.stream(
+                        prompt,
+                        model=model or llm_config["model"],
+                        max_tokens=max_tokens or llm_config["max_tokens"],
+                        temperature=llm_config["temperature"],
+                        timeout=get_llm_read_timeout(deadline)
+                    ):
+                        received = True
+                        yield chunk_text
+                return
+                    
+            except CircuitOpenError:
+                raise
+            except requests.exceptions.Timeout:
+                last_error = Exception("LLM API timeout")
+            except requests.exceptions.RequestException as e:
+                last_error = Exception(f"LLM API request failed: {e}")
+            except Exception as e:
+                last_error = Exception(f"LLM API error: {e}")
+        if received:
+            # Part of the response was already delivered; a retry would duplicate it
+            raise last_error
+        
+        delay = can_retry_llm(attempt, retries, deadline)
+        if delay is None:
+            break
+        logger.warning(f"LLM API stream failed (attempt {attempt+1}/{retries+1}), retrying in {delay:.2f}s...")
+        time.sleep(delay)
+    
+    if last_error:
+        raise last_error
+
+# Server-Sent Events helpers for streaming endpoints
+def wants_event_stream(data):
+    """Check whether the client opted in to a Server-Sent Events response"""
+    return data.get('stream') is True or 'text/event-stream' in request.headers.get('Accept', '')
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def event_stream_response(events):
+    """Wrap an event generator in a streaming response"""
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def stream_cached_sections(result):
+    """Replay a cached result as section events followed by the complete object"""
+    for key, value in result.items():
+        if key != 'metadata':
+            yield sse_event('section', {'key': key, 'value': value})
+    yield sse_event('complete', result)
+
+def stream_json_sections(prompt, finalize, max_tokens=None, error_message='Generation failed'):
+    """
+    Stream an LLM JSON response section by section.
+    
+    Emits a ``section`` event for each top-level key as soon as its value has
+    been generated and parses, then a ``complete`` event with the object
+    returned by ``finalize(sections, raw_text)``. Failures are reported as an
+    ``error`` event since the response status has already been sent.
+    """
+    parser = IncrementalObjectParser()
+    try:
+        for chunk in stream_llm_api(prompt, max_tokens=max_tokens):
+            for key, value in parser.feed(chunk):
+                yield sse_event('section', {'key': key, 'value': value})
+        sections = parser.result()
+        if not sections or not parser.finished:
+            # Prose with braces before the JSON, or a cut-off response
+            try:
+                sections = extract_json_object(parser.text)
+            except JSONExtractionError:
+                pass
+        yield sse_event('complete', finalize(sections, parser.text))
+    except Exception as e:
+        logger.error(f"Streaming generation error: {e}")
+        yield sse_event('error', {'error': error_message, 'details': 'Please try again later'})
+
+# Target languages written in non-Latin scripts get romanization in translations
+NON_LATIN_LANGUAGES = ['ar', 'zh', 'zh-CN', 'zh-TW', 'ja', 'ko', 'hi', 'ru', 'th', 'he', 'ur', 'fa', 'bn', 'ta', 'te', 'ml', 'kn', 'gu', 'pa', 'ne', 'si', 'my', 'km', 'lo', 'ka', 'am', 'ti', 'dv']
+
+def needs_romanization(target_lang):
+    """Check whether translations into the target language should include romanization"""
+    return any(lang in target_lang.lower() for lang in NON_LATIN_LANGUAGES)
+
+def get_basic_translation_cache_key(text, source_lang, target_lang):
+    """Cache key shared by single and batch basic translations"""
+    return get_cache_key({
+        'text': text, 'source': source_lang, 'target': target_lang, 'type': 'basic'
+    })
+
+# Sections of an advanced translation, in response order
+ADVANCED_TRANSLATION_SECTIONS = ['main_translation', 'alternatives', 'pronunciation', 'grammar', 'context', 'additional']
+
+def get_advanced_translation_cache_key(text, source_lang, target_lang, formality='neutral', dialect=None, context=None,
+                                       section='main_translation'):
+    """Cache key for one section of an advanced translation result"""
+    return get_cache_key({
+        'text': text, 'source': source_lang, 'target': target_lang,
+        'formality': formality, 'dialect': dialect, 'context': context,
+        'section': section
+    })
+
+def get_cached_advanced_sections(text, source_lang, target_lang, formality, dialect, context, sections):
+    """
+    Look up the requested sections of an advanced translation.
+    
+    Each section is cached under its own key, so a request for more sections
+    than a previous one only needs to generate the missing ones.
+    
+    Returns:
+        dict: Cached section values keyed by section name
+    """
+    cached_sections = {}
+    for section in sections:
+        value = translation_cache.get(get_advanced_translation_cache_key(
+            text, source_lang, target_lang, formality, dialect, context, section
+        ))
+        if value is not None:
+            cached_sections[section] = value
+    return cached_sections
+
+def cache_advanced_sections(text, source_lang, target_lang, formality, dialect, context, translation_data):
+    """Cache each known section of a generated advanced translation separately"""
+    for section in ADVANCED_TRANSLATION_SECTIONS:
+        if section in translation_data:
+            translation_cache.set(
+                get_advanced_translation_cache_key(text, source_lang, target_lang, formality, dialect, context, section),
+                translation_data[section]
+            )
+
+# Basic translations answered from cached advanced results
+translation_derivation_metrics = {
+    'derived_hits': 0
+}
+translation_derivation_metrics_lock = threading.Lock()
+
+def translation_derivation_stats():
+    """Snapshot of the derived basic translation counters"""
+    with translation_derivation_metrics_lock:
+        return dict(translation_derivation_metrics)
+
+def derive_basic_translation(advanced_result, source_lang, target_lang):
+    """
+    Map a cached advanced translation onto the basic translation schema.
+    
+    Returns:
+        dict: Basic translation data, or None if the advanced result is a
+        fallback or has no main translation
+    """
+    metadata = advanced_result.get('metadata') or {}
+    main_translation = advanced_result.get('main_translation')
+    if not main_translation or metadata.get('fallback'):
+        return None
+    
+    translation_data = {
+        'translation': main_translation,
+        'source_lang': source_lang,
+        'target_lang': target_lang
+    }
+    pronunciation = advanced_result.get('pronunciation') or {}
+    if needs_romanization(target_lang) and pronunciation.get('romanization'):
+        translation_data['romanization'] = pronunciation['romanization']
+        translation_data['romanization_system'] = pronunciation.get('romanization_system', '')
+    translation_data['timestamp'] = metadata.get('timestamp') or datetime.now().isoformat()
+    return translation_data
+
+def get_cached_basic_translation(text, source_lang, target_lang):
+    """
+    Look up a basic translation in the cache.
+    
+    Falls back to deriving it from a cached neutral-formality advanced
+    translation of the same text; derived results are cached under the
+    basic key so later lookups hit directly.
+    """
+    cache_key = get_basic_translation_cache_key(text, source_lang, target_lang)
+    cached_result = translation_cache.get(cache_key)
+    if cached_result:
+        return cached_result
+    
+    # Romanized targets also need the pronunciation section
+    required = ['main_translation', 'pronunciation'] if needs_romanization(target_lang) else ['main_translation']
+    advanced_result = get_cached_advanced_sections(
+        text, source_lang, target_lang, 'neutral', None, None, required
+    )
+    if len(advanced_result) < len(required):
+        return None
+    
+    translation_data = derive_basic_translation(advanced_result, source_lang, target_lang)
+    if translation_data:
+        with translation_derivation_metrics_lock:
+            translation_derivation_metrics['derived_hits'] += 1
+        translation_cache.set(cache_key, translation_data)
+    return translation_data
+
+def get_basic_translation_prompt(text, source_lang, target_lang):
+    """Prompt for a single basic translation, with romanization for non-Latin scripts"""
+    if needs_romanization(target_lang):
+        return f"""Translate the following text from {source_lang} to {target_lang}. Return only a clean translation without any formatting. Also provide romanization for non-Latin scripts.
+
+Text to translate: "{text}"
+
+Return your response as a JSON object with this exact structure:
+{{
+    "translation": "the translated text",
+    "romanization": "romanized version using standard system",
+    "romanization_system": "name of romanization system used (e.g., Pinyin, Hepburn, IAST)",
+    "source_lang": "{source_lang}",
+    "target_lang": "{target_lang}"
+}}"""
+    return f"""Translate the following text from {source_lang} to {target_lang}. Return only a clean translation without any formatting.
+
+Text to translate: "{text}"
+
+Return your response as a JSON object with this exact structure:
+{{
+    "translation": "the translated text",
+    "source_lang": "{source_lang}",
+    "target_lang": "{target_lang}"
+}}"""
+
+def get_batch_translation_prompt(items, source_lang, target_lang):
+    """
+    Prompt for translating several texts in one call.
+    
+    Uses the same per-item structure as the basic translation prompt, wrapped
+    in a JSON array. ``items`` is a list of (index, text) pairs; the model echoes
+    each index so results can be matched to inputs.
+    """
+    texts_json = json.dumps([{'index': index, 'text': text} for index, text in items], ensure_ascii=False, indent=2)
+    if needs_romanization(target_lang):
+        item_structure = f"""{{
+        "index": 0,
+        "translation": "the translated text",
+        "romanization": "romanized version using standard system",
+        "romanization_system": "name of romanization system used (e.g., Pinyin, Hepburn, IAST)",
+        "source_lang": "{source_lang}",
+        "target_lang": "{target_lang}"
+    }}"""
+        romanization_instruction = " Also provide romanization for non-Latin scripts."
+    else:
+        item_structure = f"""{{
+        "index": 0,
+        "translation": "the translated text",
+        "source_lang": "{source_lang}",
+        "target_lang": "{target_lang}"
+    }}"""
+        romanization_instruction = ""
+    
+    return f"""Translate each of the following texts from {source_lang} to {target_lang}. Translate every text independently. Return only clean translations without any formatting.{romanization_instruction}
+
+Texts to translate:
+{texts_json}
+
+Return your response as a JSON array with exactly one object per text, using the "index" of the text it translates. Each object must have this exact structure:
+[
+    {item_structure}
+]"""
+
+def parse_advanced_translation_sections(value):
+    """
+    Parse the ``sections`` request parameter.
+    
+    Args:
+        value: List of section names, comma-separated string, or None for all sections
+        
+    Returns:
+        list: Requested sections in response order; main_translation is always included
+        
+    Raises:
+        ValueError: If the value is malformed or names an unknown section
+    """
+    if value is None or value == '' or value == []:
+        return list(ADVANCED_TRANSLATION_SECTIONS)
+    if isinstance(value, str):
+        value = [section.strip() for section in value.split(',') if section.strip()]
+    if not isinstance(value, list) or not all(isinstance(section, str) for section in value):
+        raise ValueError('sections must be a list of section names')
+    unknown = [section for section in value if section not in ADVANCED_TRANSLATION_SECTIONS]
+    if unknown:
+        raise ValueError(
+            f'Unknown sections: {", ".join(unknown)} (valid: {", ".join(ADVANCED_TRANSLATION_SECTIONS)})'
+        )
+    requested = set(value) | {'main_translation'}
+    return [section for section in ADVANCED_TRANSLATION_SECTIONS if section in requested]
+
 # Enhanced translation prompt with more detailed instructions
-def get_advanced_translation_prompt(text, source_lang, target_lang, formality="neutral", dialect=None, context=None):
+def get_advanced_translation_prompt(text, source_lang, target_lang, formality="neutral", dialect=None, context=None,
+                                    sections=None, main_translation=None):
+    """
+    Build the advanced translation prompt for the requested sections only.
+    
+    Output tokens dominate generation time, so sections the client did not
+    ask for (or that are already cached) are left out of the prompt. When
+    ``main_translation`` is given it is not generated again; the other
+    sections are asked to describe that translation.
+    """
+    sections = sections or ADVANCED_TRANSLATION_SECTIONS
     context_instruction = f"\nContext: {context}" if context else ""
     dialect_instruction = f"\n- Target dialect: {dialect}" if dialect else ""
     
-    # Check if target language uses non-Latin script for romanization
-    non_latin_languages = ['ar', 'zh', 'zh-CN', 'zh-TW', 'ja', 'ko', 'hi', 'ru', 'th', 'he', 'ur', 'fa', 'bn', 'ta', 'te', 'ml', 'kn', 'gu', 'pa', 'ne', 'si', 'my', 'km', 'lo', 'ka', 'am', 'ti', 'dv']
-    needs_romanization = any(lang in target_lang.lower() for lang in non_latin_languages)
-    
     romanization_instruction = ""
-    if needs_romanization:
+    if needs_romanization(target_lang):
         romanization_instruction = """
    - Romanization: Latin script representation for easy reading
    - Romanization system: Standard system used (e.g., Pinyin for Chinese, Hepburn for Japanese, etc.)"""
     
-    return f"""Provide a comprehensive translation analysis with the following components:
-
-1. Main Translation:
+    if 'main_translation' in sections or not main_translation:
+        main_block = f"""Main Translation:
    - Translate from {source_lang} to {target_lang}
    - Formality level: {formality}{dialect_instruction}
-   - Preserve original meaning while adapting to cultural context{context_instruction}
-
-2. Alternative Translations (provide exactly 3):
+   - Preserve original meaning while adapting to cultural context{context_instruction}"""
+    else:
+        main_block = f"""Main Translation (already provided, do not include it in your response):
+   - {target_lang} translation: "{main_translation}"
+   - Formality level: {formality}{dialect_instruction}{context_instruction}"""
+    
+    blocks = {
+        'alternatives': """Alternative Translations (provide exactly 3):
    - Alternative 1: More literal translation with confidence %
    - Alternative 2: More colloquial/natural translation with confidence %
    - Alternative 3: Formal/professional version with confidence %
-   - Include brief explanations for each alternative
-
-3. Pronunciation Guide:
+   - Include brief explanations for each alternative""",
+        'pronunciation': f"""Pronunciation Guide:
    - IPA notation for the main translation
    - Syllable breakdown with hyphens
    - Stress markers and tone information (if applicable)
-   - Phonetic spelling for easy pronunciation{romanization_instruction}
-
-4. Grammar Analysis:
+   - Phonetic spelling for easy pronunciation{romanization_instruction}""",
+        'grammar': """Grammar Analysis:
    - Part of speech tags for key words
    - Sentence structure breakdown
    - Grammar rules and patterns used
-   - Grammatical differences from source language
-
-5. Contextual Usage:
+   - Grammatical differences from source language""",
+        'context': """Contextual Usage:
    - 3 different contexts where this phrase is commonly used
    - 3 example sentences in real-world scenarios
    - Cultural notes and regional variations
-   - Appropriate situations for usage
-
-6. Additional Information:
+   - Appropriate situations for usage""",
+        'additional': """Additional Information:
    - Difficulty level (beginner/intermediate/advanced)
    - Common mistakes to avoid
    - Related phrases or expressions
-   - Etymology or word origin (if interesting)
-
-Text to analyze: "{text}"
-
-Return ONLY a valid JSON response with these exact keys:
-{{
-    "main_translation": "",
-    "alternatives": [
-        {{"text": "", "confidence": 0, "explanation": "", "type": "literal"}},
-        {{"text": "", "confidence": 0, "explanation": "", "type": "colloquial"}},
-        {{"text": "", "confidence": 0, "explanation": "", "type": "formal"}}
-    ],
-    "pronunciation": {{
+   - Etymology or word origin (if interesting)"""
+    }
+    
+    keys = {
+        'main_translation': '"main_translation": ""',
+        'alternatives': """"alternatives": [
+        {"text": "", "confidence": 0, "explanation": "", "type": "literal"},
+        {"text": "", "confidence": 0, "explanation": "", "type": "colloquial"},
+        {"text": "", "confidence": 0, "explanation": "", "type": "formal"}
+    ]""",
+        'pronunciation': """"pronunciation": {
         "ipa": "",
         "syllables": "",
         "stress": "",
         "phonetic": "",
         "romanization": "",
         "romanization_system": ""
-    }},
-    "grammar": {{
+    }""",
+        'grammar': """"grammar": {
         "parts_of_speech": [],
         "structure": "",
         "rules": [],
         "differences": ""
-    }},
-    "context": {{
+    }""",
+        'context': """"context": {
         "usage_contexts": [],
         "examples": [],
         "cultural_notes": "",
         "appropriate_situations": []
-    }},
-    "additional": {{
+    }""",
+        'additional': """"additional": {
         "difficulty": "",
         "common_mistakes": [],
         "related_phrases": [],
         "etymology": ""
-    }}
+    }"""
+    }
+    
+    components = [main_block] + [blocks[section] for section in ADVANCED_TRANSLATION_SECTIONS[1:] if section in sections]
+    numbered = "\n\n".join(f"{number}. {block}" for number, block in enumerate(components, 1))
+    response_keys = ",\n    ".join(keys[section] for section in ADVANCED_TRANSLATION_SECTIONS if section in sections)
+    
+    return f"""Provide a comprehensive translation analysis with the following components:
+
+{numbered}
+
+Text to analyze: "{text}"
+
+Return ONLY a valid JSON response with these exact keys:
+{{
+    {response_keys}
 }}"""
 
 @app.route('/api/health', methods=['GET'])
@@ -471,6 +991,27 @@ def health_check():
                 'gemini': bool(gemini_model),
                 'speech_client': bool(speech_client),
                 'tts_client': bool(tts_client)
+            },
+            'database': {
+                'pool': engine.pool.status(),
+                'wal_checkpoint': wal_checkpointer.stats() if wal_checkpointer else None
+            },
+            'caches': {
+                'translation': translation_cache.stats(),
+                'translation_derived': translation_derivation_stats(),
+                'tts': tts_cache.stats(),
+                'quiz_question_pool': question_pool.stats() if question_pool else None,
+                'quiz_catalog': quiz_catalog.stats(),
+                'word_of_day': daily_words.stats()
+            },
+            'llm': {
+                'provider': llm_provider.name if llm_provider else None,
+                'provider_stats': llm_provider.stats() if hasattr(llm_provider, 'stats') else None,
+                'coalescing': llm_single_flight.stats(),
+                'circuit_breaker': llm_circuit_breaker.stats(),
+                'admission': llm_admission.stats(),
+                'quiz_generation': quiz_generation_stats(),
+                'json_extraction': extraction_stats()
             }
         }
         return jsonify(service_status)
@@ -748,12 +1289,10 @@ def basic_translate():
         if not text:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
-        # Check cache first
-        cache_key = get_cache_key({
-            'text': text, 'source': source_lang, 'target': target_lang, 'type': 'basic'
-        })
+        # Check cache first (including advanced results for the same text)
+        cache_key = get_basic_translation_cache_key(text, source_lang, target_lang)
         
-        cached_result = get_cached_result(translation_cache, cache_key)
+        cached_result = get_cached_basic_translation(text, source_lang, target_lang)
         if cached_result:
             logger.info(f"Returning cached basic translation for: {text[:50]}...")
             return jsonify(cached_result)
@@ -762,83 +1301,283 @@ def basic_translate():
             return jsonify({'error': 'Translation service temporarily unavailable'}), 503
         
         # Generate basic translation prompt with romanization
-        non_latin_languages = ['ar', 'zh', 'zh-CN', 'zh-TW', 'ja', 'ko', 'hi', 'ru', 'th', 'he', 'ur', 'fa', 'bn', 'ta', 'te', 'ml', 'kn', 'gu', 'pa', 'ne', 'si', 'my', 'km', 'lo', 'ka', 'am', 'ti', 'dv']
-        needs_romanization = any(lang in target_lang.lower() for lang in non_latin_languages)
+        prompt = get_basic_translation_prompt(text, source_lang, target_lang)
         
-        if needs_romanization:
-            prompt = f"""Translate the following text from {source_lang} to {target_lang}. Return only a clean translation without any formatting. Also provide romanization for non-Latin scripts.
-
-Text to translate: "{text}"
-
-Return your response as a JSON object with this exact structure:
-{{
-    "translation": "the translated text",
-    "romanization": "romanized version using standard system",
-    "romanization_system": "name of romanization system used (e.g., Pinyin, Hepburn, IAST)",
-    "source_lang": "{source_lang}",
-    "target_lang": "{target_lang}"
-}}"""
-        else:
-            prompt = f"""Translate the following text from {source_lang} to {target_lang}. Return only a clean translation without any formatting.
+        logger.info(f"Basic translating: '{text}' from {source_lang} to {target_lang}")
+        
+        try:
+            response_text = call_llm_api(prompt)
+            if not response_text:
+                raise Exception("Empty response from LLM API")
+            
+            # Parse JSON response (tolerates code fences and surrounding prose)
+            try:
+                translation_data = extract_json_object(response_text, required_keys=['translation'])
+            except JSONExtractionError:
+                # Fallback: extract translation from plain text
+                translation_data = {
+                    "translation": strip_code_fence(response_text),
+                    "source_lang": source_lang,
+                    "target_lang": target_lang
+                }
+            
+            # Add timestamp
+            translation_data['timestamp'] = datetime.now().isoformat()
+            
+            # Cache the result
+            translation_cache.set(cache_key, translation_data)
+            
+            logger.info(f"Basic translation completed successfully for: {text[:50]}...")
+            return jsonify(translation_data)
+            
+        except (CircuitOpenError, AdmissionRejected) as e:
+            logger.warning(f"Basic translate rejected: {e}")
+            return llm_unavailable_response(e)
+        except DeadlineExceeded as e:
+            logger.warning(f"Basic translate timed out: {e}")
+            return deadline_exceeded_response(e)
+        except Exception as e:
+            logger.error(f"Gemini API error in basic translate: {e}")
+            return jsonify({
+                'error': 'Translation service error',
+                'details': 'Please try again later'
+            }), 503
+            
+    except Exception as e:
+        logger.error(f"Basic translation error: {e}", exc_info=True)
+        return jsonify({
+            'error': 'Internal server error',
+            'details': 'An unexpected error occurred'
+        }), 500
 
-Text to translate: "{text}"
+def translate_batch_chunk(items, source_lang, target_lang, deadline=None):
+    """
+    Translate a chunk of texts with a single LLM call.
+    
+    Args:
+        items (list): (index, text) pairs to translate
+        source_lang (str): Source language code
+        target_lang (str): Target language code
+        deadline (Deadline): Request budget (worker threads have no request context)
+        
+    Returns:
+        dict: Translation data keyed by item index; items missing from the
+        model response are left out
+    """
+    prompt = get_batch_translation_prompt(items, source_lang, target_lang)
+    response_text = call_llm_api(prompt, deadline=deadline)
+    if not response_text:
+        raise Exception("Empty response from LLM API")
+    
+    parsed = extract_json(response_text, allow_array=True)
+    if isinstance(parsed, dict):
+        parsed = parsed.get('translations', [])
+    if not isinstance(parsed, list):
+        raise ValueError("Batch translation response is not a JSON array")
+    
+    expected_indexes = {index for index, _ in items}
+    results = {}
+    for entry in parsed:
+        if not isinstance(entry, dict) or not entry.get('translation'):
+            continue
+        try:
+            index = int(entry.pop('index'))
+        except (KeyError, TypeError, ValueError):
+            continue
+        if index in expected_indexes:
+            entry['source_lang'] = source_lang
+            entry['target_lang'] = target_lang
+            results[index] = entry
+    return results
 
-Return your response as a JSON object with this exact structure:
-{{
-    "translation": "the translated text",
-    "source_lang": "{source_lang}",
-    "target_lang": "{target_lang}"
-}}"""
+@app.route('/api/translate/batch', methods=['POST'])
+@rate_limit
+def batch_translate():
+    """
+    Translate a list of texts for one source/target pair.
+    
+    Each text is looked up in the basic translation cache first. Only the
+    misses are sent to the LLM, packed into one prompt per chunk of
+    BATCH_TRANSLATION_CHUNK_SIZE texts, with chunks dispatched concurrently.
+    Every new translation is cached individually, so later /api/translate
+    calls for the same text are cache hits.
+    
+    Returns:
+        dict: Per-item results in input order, each with either the
+        translation data or an error
+    """
+    try:
+        data = request.json
+        if not data:
+            return jsonify({'error': 'No JSON data provided'}), 400
+        
+        # Validate required fields
+        required_fields = ['texts', 'sourceLang', 'targetLang']
+        missing_fields = [field for field in required_fields if not data.get(field)]
+        if missing_fields:
+            return jsonify({
+                'error': f'Missing required fields: {", ".join(missing_fields)}'
+            }), 400
+        
+        texts = data.get('texts')
+        source_lang = data.get('sourceLang')
+        target_lang = data.get('targetLang')
+        
+        # Input validation
+        if not isinstance(texts, list):
+            return jsonify({'error': 'texts must be a list of strings'}), 400
+        
+        if len(texts) > BATCH_TRANSLATION_MAX_ITEMS:
+            return jsonify({'error': f'Too many texts (max {BATCH_TRANSLATION_MAX_ITEMS})'}), 400
         
-        logger.info(f"Basic translating: '{text}' from {source_lang} to {target_lang}")
+        if not all(isinstance(text, str) for text in texts):
+            return jsonify({'error': 'texts must be a list of strings'}), 400
         
-        try:
-            response_text = call_llm_api(prompt)
-            if not response_text:
-                raise Exception("Empty response from LLM API")
-            
-            # Clean up response text - remove markdown formatting if present
-            response_text = response_text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
+        texts = [text.strip() for text in texts]
+        if any(not text for text in texts):
+            return jsonify({'error': 'Text cannot be empty'}), 400
+        
+        if any(len(text) > 1000 for text in texts):
+            return jsonify({'error': 'Text too long (max 1000 characters)'}), 400
+        
+        # Check cache per item; identical texts are translated once
+        results = [None] * len(texts)
+        pending = {}  # text -> indexes of items with that text
+        for index, text in enumerate(texts):
+            cached_result = get_cached_basic_translation(text, source_lang, target_lang)
+            if cached_result:
+                results[index] = {'index': index, 'text': text, 'cached': True, **cached_result}
+            else:
+                pending.setdefault(text, []).append(index)
+        
+        if pending:
+            if not gemini_model:
+                return jsonify({'error': 'Translation service temporarily unavailable'}), 503
             
-            # Parse JSON response
             try:
-                translation_data = json.loads(response_text)
-            except json.JSONDecodeError:
-                # Fallback: extract translation from plain text
-                translation_data = {
-                    "translation": response_text,
-                    "source_lang": source_lang,
-                    "target_lang": target_lang
-                }
-            
-            # Add timestamp
-            translation_data['timestamp'] = datetime.now().isoformat()
+                llm_circuit_breaker.check()
+            except CircuitOpenError as e:
+                logger.warning(f"Batch translate rejected: {e}")
+                return llm_unavailable_response(e)
             
-            # Cache the result
-            cache_result(translation_cache, cache_key, translation_data)
-            
-            logger.info(f"Basic translation completed successfully for: {text[:50]}...")
-            return jsonify(translation_data)
+            unique_items = [(indexes[0], text) for text, indexes in pending.items()]
+            chunks = [
+                unique_items[i:i + BATCH_TRANSLATION_CHUNK_SIZE]
+                for i in range(0, len(unique_items), BATCH_TRANSLATION_CHUNK_SIZE)
+            ]
+            logger.info(f"Batch translating {len(unique_items)} texts in {len(chunks)} chunks from {source_lang} to {target_lang}")
             
-        except Exception as e:
-            logger.error(f"Gemini API error in basic translate: {e}")
-            return jsonify({
-                'error': 'Translation service error',
-                'details': 'Please try again later'
-            }), 503
+            with ThreadPoolExecutor(max_workers=min(len(chunks), BATCH_TRANSLATION_MAX_WORKERS)) as executor:
+                futures = [
+                    executor.submit(translate_batch_chunk, chunk, source_lang, target_lang, get_deadline())
+                    for chunk in chunks
+                ]
+                chunk_results = []
+                for chunk, future in zip(chunks, futures):
+                    try:
+                        chunk_results.append((chunk, future.result(), None))
+                    except Exception as e:
+                        logger.error(f"Batch translation chunk failed: {e}")
+                        chunk_results.append((chunk, {}, e))
             
+            timestamp = datetime.now().isoformat()
+            for chunk, translations, error in chunk_results:
+                for first_index, text in chunk:
+                    translation_data = translations.get(first_index)
+                    if translation_data:
+                        translation_data['timestamp'] = timestamp
+                        translation_cache.set(
+                            get_basic_translation_cache_key(text, source_lang, target_lang),
+                            translation_data
+                        )
+                    for index in pending[text]:
+                        if translation_data:
+                            results[index] = {'index': index, 'text': text, 'cached': False, **translation_data}
+                        else:
+                            results[index] = {
+                                'index': index,
+                                'text': text,
+                                'error': 'Translation service error' if error else 'Translation missing from response'
+                            }
+        
+        failed_count = sum(1 for result in results if 'error' in result)
+        cached_count = sum(1 for result in results if result.get('cached'))
+        return jsonify({
+            'results': results,
+            'source_lang': source_lang,
+            'target_lang': target_lang,
+            'total': len(results),
+            'cached_count': cached_count,
+            'translated_count': len(results) - cached_count - failed_count,
+            'failed_count': failed_count
+        })
+        
     except Exception as e:
-        logger.error(f"Basic translation error: {e}", exc_info=True)
+        logger.error(f"Batch translation error: {e}", exc_info=True)
         return jsonify({
             'error': 'Internal server error',
             'details': 'An unexpected error occurred'
         }), 500
 
+def get_advanced_translation_metadata(source_lang, target_lang, formality, dialect, context, **extra):
+    """Metadata attached to every advanced translation result"""
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'source_lang': source_lang,
+        'target_lang': target_lang,
+        'formality': formality,
+        'dialect': dialect,
+        'context': context,
+        'cached': False,
+        **extra
+    }
+
+def get_advanced_translation_fallback(text, source_lang, target_lang, formality, dialect, context,
+                                      sections=None, cached_sections=None):
+    """
+    Minimal advanced translation result used when the full analysis cannot be parsed.
+    
+    Sections already in the cache are kept; the others are left empty. The
+    main translation comes from a short basic translation call unless it is
+    cached.
+    """
+    logger.info("Falling back to basic translation")
+    sections = sections or ADVANCED_TRANSLATION_SECTIONS
+    cached_sections = cached_sections or {}
+    empty_sections = {
+        'main_translation': text,  # Default to original text
+        'alternatives': [],
+        'pronunciation': {},
+        'grammar': {},
+        'context': {},
+        'additional': {}
+    }
+    basic_translation = {
+        section: cached_sections.get(section, empty_sections[section]) for section in sections
+    }
+    basic_translation['metadata'] = get_advanced_translation_metadata(
+        source_lang, target_lang, formality, dialect, context, fallback=True, sections=sections
+    )
+    if 'main_translation' in cached_sections:
+        return basic_translation
+    
+    # Try to extract at least the main translation using basic translate,
+    # unless the request budget cannot cover another LLM call
+    deadline = get_deadline()
+    if deadline and not deadline.can_afford(LLM_MIN_ATTEMPT_BUDGET):
+        logger.warning(f"Skipping fallback translation: {deadline.remaining():.1f}s left in request budget")
+        return basic_translation
+    
+    try:
+        basic_prompt = f"Translate this text from {source_lang} to {target_lang}: '{text}'. Return ONLY the translation, nothing else."
+        basic_response = call_llm_api(basic_prompt, max_tokens=100, retries=0)
+        if basic_response:
+            basic_translation['main_translation'] = basic_response.strip()
+    except Exception as inner_e:
+        logger.error(f"Fallback translation also failed: {inner_e}")
+    
+    return basic_translation
+
 @app.route('/api/advanced-translate', methods=['POST'])
 @rate_limit
 def advanced_translate():
@@ -870,95 +1609,112 @@ def advanced_translate():
         if not text:
             return jsonify({'error': 'Text cannot be empty'}), 400
         
-        # Check cache first
-        cache_key = get_cache_key({
-            'text': text, 'source': source_lang, 'target': target_lang,
-            'formality': formality, 'dialect': dialect, 'context': context
-        })
+        try:
+            sections = parse_advanced_translation_sections(data.get('sections'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        cached_result = get_cached_result(translation_cache, cache_key)
-        if cached_result:
+        stream = wants_event_stream(data)
+        
+        # Check cache first; sections are cached independently
+        cached_sections = get_cached_advanced_sections(
+            text, source_lang, target_lang, formality, dialect, context, sections
+        )
+        missing_sections = [section for section in sections if section not in cached_sections]
+        
+        if not missing_sections:
             logger.info(f"Returning cached translation for: {text[:50]}...")
+            cached_result = {
+                **cached_sections,
+                'metadata': get_advanced_translation_metadata(
+                    source_lang, target_lang, formality, dialect, context, sections=sections, cached=True
+                )
+            }
+            if stream:
+                return event_stream_response(stream_cached_sections(cached_result))
             return jsonify(cached_result)
         
         if not gemini_model:
             return jsonify({'error': 'Translation service temporarily unavailable'}), 503
         
-        # Generate prompt and get translation
+        # Generate prompt for the missing sections only
         prompt = get_advanced_translation_prompt(
-            text, source_lang, target_lang, formality, dialect, context
+            text, source_lang, target_lang, formality, dialect, context,
+            sections=missing_sections, main_translation=cached_sections.get('main_translation')
         )
         
-        logger.info(f"Translating: '{text}' from {source_lang} to {target_lang}")
+        logger.info(f"Translating: '{text}' from {source_lang} to {target_lang} (sections: {', '.join(missing_sections)})")
+        
+        def merge_sections(generated_data):
+            """Cache the generated sections and merge them with the cached ones"""
+            generated_sections = {
+                section: generated_data[section] for section in missing_sections if section in generated_data
+            }
+            cache_advanced_sections(text, source_lang, target_lang, formality, dialect, context, generated_sections)
+            translation_data = {
+                section: generated_sections.get(section, cached_sections.get(section))
+                for section in sections
+                if section in generated_sections or section in cached_sections
+            }
+            translation_data['metadata'] = get_advanced_translation_metadata(
+                source_lang, target_lang, formality, dialect, context, sections=sections
+            )
+            return translation_data
+        
+        if stream:
+            # Reject before the event stream starts so clients get a real 503
+            try:
+                llm_circuit_breaker.check()
+            except CircuitOpenError as e:
+                logger.warning(f"Advanced translate rejected: {e}")
+                return llm_unavailable_response(e)
+            
+            def finalize(generated_data, response_text):
+                if not generated_data.get('main_translation') and 'main_translation' not in cached_sections:
+                    logger.error(f"Streamed translation incomplete. Response: {response_text[:200]}")
+                    return get_advanced_translation_fallback(
+                        text, source_lang, target_lang, formality, dialect, context, sections, cached_sections
+                    )
+                
+                translation_data = merge_sections(generated_data)
+                logger.info(f"Streamed translation completed successfully for: {text[:50]}...")
+                return translation_data
+            
+            def generate():
+                # Cached sections are sent before the generated ones
+                for section in sections:
+                    if section in cached_sections:
+                        yield sse_event('section', {'key': section, 'value': cached_sections[section]})
+                yield from stream_json_sections(prompt, finalize, error_message='Translation service error')
+            
+            return event_stream_response(generate())
         
         try:
             response_text = call_llm_api(prompt)
             if not response_text:
                 raise Exception("Empty response from LLM API")
                 
-            # Clean up response text - remove markdown formatting if present
-            response_text = response_text.strip()
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-            
+            # The main translation must be recovered unless it is cached; other
+            # sections are salvaged from a damaged response where possible
+            required_keys = ['main_translation'] if 'main_translation' in missing_sections else []
             try:
-                # Parse JSON response
-                translation_data = json.loads(response_text)
-                
-                # Add metadata
-                translation_data['metadata'] = {
-                    'timestamp': datetime.now().isoformat(),
-                    'source_lang': source_lang,
-                    'target_lang': target_lang,
-                    'formality': formality,
-                    'dialect': dialect,
-                    'context': context,
-                    'cached': False
-                }
-                
-                # Cache the result
-                cache_result(translation_cache, cache_key, translation_data)
+                # Parse JSON response, then cache and merge the new sections
+                translation_data = merge_sections(extract_json_object(response_text, required_keys))
                 
                 logger.info(f"Translation completed successfully for: {text[:50]}...")
                 return jsonify(translation_data)
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error: {e}. Response: {response_text[:200]}")
-                
-                # Fallback to basic translation
-                logger.info("Falling back to basic translation")
-                basic_translation = {
-                    'main_translation': text,  # Default to original text
-                    'alternatives': [],
-                    'pronunciation': {},
-                    'grammar': {},
-                    'context': {},
-                    'additional': {},
-                    'metadata': {
-                        'timestamp': datetime.now().isoformat(),
-                        'source_lang': source_lang,
-                        'target_lang': target_lang,
-                        'formality': formality,
-                        'dialect': dialect,
-                        'context': context,
-                        'cached': False,
-                        'fallback': True
-                    }
-                }
-                
-                # Try to extract at least the main translation using basic translate
-                try:
-                    basic_prompt = f"Translate this text from {source_lang} to {target_lang}: '{text}'. Return ONLY the translation, nothing else."
-                    basic_response = call_llm_api(basic_prompt, max_tokens=100)
-                    if basic_response:
-                        basic_translation['main_translation'] = basic_response.strip()
-                except Exception as inner_e:
-                    logger.error(f"Fallback translation also failed: {inner_e}")
-                
-                return jsonify(basic_translation)
+            except JSONExtractionError as e:
+                logger.error(f"JSON extraction error: {e}")
+                return jsonify(get_advanced_translation_fallback(
+                    text, source_lang, target_lang, formality, dialect, context, sections, cached_sections
+                ))
                 
+        except (CircuitOpenError, AdmissionRejected) as e:
+            logger.warning(f"Advanced translate rejected: {e}")
+            return llm_unavailable_response(e)
+        except DeadlineExceeded as e:
+            logger.warning(f"Advanced translate timed out: {e}")
+            return deadline_exceeded_response(e)
         except Exception as e:
             logger.error(f"Translation error: {e}")
             return jsonify({
@@ -1020,8 +1776,12 @@ def language_tutor_explain():
                 search_start = time.time()
                 logger.debug("🔍 Performing vector similarity search...")
                 
+                # Leave enough of the request budget for the LLM call
+                deadline = get_deadline()
+                search_budget = deadline.remaining() - LLM_MIN_ATTEMPT_BUDGET if deadline else None
+                
                 # First try language-specific search
-                lang_specific_docs = vector_service.search(query, k=5, language_filter=language)
+                lang_specific_docs = vector_service.search(query, k=5, language_filter=language, timeout=search_budget)
                 
                 if lang_specific_docs:
                     context_str = "\n\n".join([
@@ -1035,7 +1795,9 @@ def language_tutor_explain():
                 else:
                     logger.info(f"No language-specific documents found for {language}, trying general search...")
                     # Use general results if no language-specific ones found
-                    general_docs = vector_service.search(query, k=3)
+                    if deadline:
+                        search_budget = deadline.remaining() - LLM_MIN_ATTEMPT_BUDGET
+                    general_docs = vector_service.search(query, k=3, timeout=search_budget)
                     if general_docs:
                         context_str = "\n\n".join([
                             f"- Source: {doc['source']}\n- Content: {doc['text']}" 
@@ -1092,28 +1854,41 @@ Example JSON response format:
 IMPORTANT: Return ONLY valid JSON. Do not include any markdown formatting, code blocks, or additional text."""
         
         # 3. Generation: Call the LLM to generate the explanation
+        if wants_event_stream(data):
+            # Stream sections as they are generated; "meaning" is emitted first
+            llm_circuit_breaker.check()
+            
+            def finalize(explanation_data, response_text):
+                if not explanation_data:
+                    error = LLMResponseError(
+                        "Failed to parse LLM JSON response",
+                        raw_response=response_text,
+                        parse_error="No complete JSON members in streamed response"
+                    )
+                    log_error(error, {"query": query, "language": language})
+                    explanation_data = create_fallback_explanation(
+                        query,
+                        language,
+                        "LLM response parsing failed"
+                    )
+                explanation_data = validate_explanation_response(explanation_data, query)
+                logger.info(f"RAG explanation streamed successfully (context_used: {len(retrieved_docs) > 0})")
+                return explanation_data
+            
+            return event_stream_response(
+                stream_json_sections(prompt, finalize, max_tokens=1000, error_message='Failed to generate explanation')
+            )
+        
         logger.debug("Calling LLM for explanation generation...")
         response_text = call_llm_api(prompt, max_tokens=1000)
         
         if not response_text:
             return jsonify({'error': 'Failed to generate explanation'}), 500
         
-        # Clean and parse the JSON response from the LLM
-        response_text = response_text.strip()
-        
-        # Remove any markdown code block formatting if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
+        # Parse the JSON response from the LLM (tolerates code fences and surrounding prose)
         try:
-            explanation_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
+            explanation_data = extract_json_object(response_text)
+        except JSONExtractionError as e:
             error = LLMResponseError(
                 "Failed to parse LLM JSON response",
                 raw_response=response_text,
@@ -1137,6 +1912,12 @@ IMPORTANT: Return ONLY valid JSON. Do not include any markdown formatting, code
         
         return jsonify(explanation_data)
         
+    except (CircuitOpenError, AdmissionRejected) as e:
+        logger.warning(f"Tutor explanation rejected: {e}")
+        return llm_unavailable_response(e)
+    except DeadlineExceeded as e:
+        logger.warning(f"Tutor explanation timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"Tutor explanation error: {e}", exc_info=True)
         return jsonify({
@@ -1169,7 +1950,7 @@ def text_to_speech():
             'text': text, 'language': language, 'voice_gender': voice_gender
         })
         
-        cached_result = get_cached_result(tts_cache, cache_key)
+        cached_result = tts_cache.get(cache_key)
         if cached_result:
             logger.info(f"Returning cached TTS for: {text[:30]}...")
             return jsonify(cached_result)
@@ -1245,7 +2026,7 @@ def text_to_speech():
                 }
                 
                 # Cache the result
-                cache_result(tts_cache, cache_key, result)
+                tts_cache.set(cache_key, result)
                 
                 logger.info(f"TTS synthesis completed for: {text[:30]}...")
                 return jsonify(result)
@@ -1459,6 +2240,9 @@ def save_json_file(file_path, data):
             os.remove(temp_path)
         raise
 
+# Static quizzes, indexed in memory and reloaded when quizzes.json changes
+quiz_catalog = QuizCatalog(QUIZZES_FILE, load=lambda path: read_quizzes_file(path, save_json_file))
+
 @app.route('/api/common-phrases', methods=['GET'])
 @rate_limit
 def get_common_phrases():
@@ -1497,18 +2281,28 @@ def get_common_phrases():
         logger.error(f"Error fetching common phrases: {e}")
         return jsonify({'error': 'Failed to fetch common phrases'}), 500
 
+# Word of the day: one deterministic word per language and local day, served
+# from a precomputed response that clients and CDNs may cache until midnight
+daily_words = DailyWordPublisher(
+    load=db_service.get_daily_word,
+    languages=db_service.get_word_languages,
+    tz=ZoneInfo(WORD_OF_DAY_TIMEZONE) if WORD_OF_DAY_TIMEZONE else None,
+    cleanup=db_service.close_session
+)
+daily_words.start()
+
 @app.route('/api/word-of-day', methods=['GET'])
 @rate_limit
 def get_word_of_day():
-    """Get a random word of the day for the specified language"""
+    """Get today's word of the day for the specified language"""
     try:
         language = request.args.get('language', 'en').lower()
         logger.info(f"Getting word of day for language: {language}")
         
         # Check if we have any words for this language
-        word_data = db_service.get_word_of_day(language)
+        daily = daily_words.get(language)
         
-        if not word_data:
+        if not daily:
             logger.warning(f"No word-of-day data found for language: {language}")
             
             # Try to populate some default data if language is 'en'
@@ -1532,12 +2326,12 @@ def get_word_of_day():
                 if success:
                     logger.info("Successfully added default English word")
                     # Try to get it again
-                    word_data = db_service.get_word_of_day(language)
+                    daily = daily_words.get(language)
                 else:
                     logger.error("Failed to add default English word")
             
             # If still no data, return error with more details
-            if not word_data:
+            if not daily:
                 return jsonify({
                     'error': f'Language {language} not supported',
                     'available_languages': ['en'],  # We know we should have at least English
@@ -1548,8 +2342,13 @@ def get_word_of_day():
                     }
                 }), 404
         
-        logger.info(f"Successfully retrieved word of day: {word_data.get('word', 'Unknown')}")
-        return jsonify(word_data)
+        if request.if_none_match.contains(daily.etag):
+            response = Response(status=304)
+        else:
+            response = Response(daily.body, mimetype='application/json')
+        response.set_etag(daily.etag)
+        response.headers['Cache-Control'] = f'public, max-age={daily.max_age()}'
+        return response
         
     except Exception as e:
         logger.error(f"Error getting word of day: {e}", exc_info=True)
@@ -1634,6 +2433,9 @@ def get_flashcards():
             }
         })
 
+    except DeadlineExceeded as e:
+        logger.warning(f"Getting flashcards timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"Error getting flashcards: {e}")
         return jsonify({'error': 'Failed to get flashcards'}), 500
@@ -1678,10 +2480,7 @@ def generate_quiz():
         if not all([user_id, language]):
             return jsonify({'error': 'Missing required fields'}), 400
             
-        # Load user progress data
-        progress = load_json_file(USER_PROGRESS_FILE, {'users': {}})
-        user_data = progress.get('users', {}).get(user_id, {'flashcards': []})
-        flashcards = user_data.get('flashcards', [])
+        flashcards = db_service.get_flashcards(user_id, language)
         
         # Initialize quiz questions
         questions = []
@@ -1693,17 +2492,19 @@ def generate_quiz():
             vocab_questions = generate_vocabulary_questions(flashcards, difficulty, num_vocab)
             questions.extend(vocab_questions)
             
+        # LLM-generated questions, generated concurrently
+        llm_plan = []
         if quiz_type == 'mixed' or quiz_type == 'grammar':
             # Grammar questions (30% of mixed quiz)
             num_grammar = total_questions if quiz_type == 'grammar' else 3
-            grammar_questions = generate_grammar_questions(language, difficulty, num_grammar)
-            questions.extend(grammar_questions)
+            llm_plan.append(('grammar', num_grammar))
             
         if quiz_type == 'mixed' or quiz_type == 'conversation':
             # Conversation questions (30% of mixed quiz)
             num_conversation = total_questions if quiz_type == 'conversation' else 3
-            conversation_questions = generate_conversation_questions(language, difficulty, num_conversation)
-            questions.extend(conversation_questions)
+            llm_plan.append(('conversation', num_conversation))
+        
+        questions.extend(generate_quiz_llm_questions(user_id, llm_plan, language, difficulty))
             
         # Shuffle questions and ensure we have enough
         random.shuffle(questions)
@@ -1713,26 +2514,9 @@ def generate_quiz():
         while len(questions) < total_questions:
             questions.append(generate_basic_question(language, difficulty))
         
-        # Store quiz in user data
         quiz_id = str(uuid.uuid4())
-        if 'quizzes' not in user_data:
-            user_data['quizzes'] = {}
-            
-        user_data['quizzes'][quiz_id] = {
-            'questions': questions,
-            'started_at': datetime.now().isoformat(),
-            'completed': False,
-            'score': 0,
-            'answers': [],
-            'current_question': 0
-        }
-        
-        # Save updated user data
-        if user_id not in progress['users']:
-            progress['users'][user_id] = user_data
-        else:
-            progress['users'][user_id].update(user_data)
-        save_json_file(USER_PROGRESS_FILE, progress)
+        if not db_service.create_quiz(user_id, quiz_id, language, difficulty, quiz_type, questions):
+            return jsonify({'error': 'Failed to save quiz'}), 500
         
         return jsonify({
             'quiz_id': quiz_id,
@@ -1740,6 +2524,9 @@ def generate_quiz():
             'total_questions': len(questions)
         })
         
+    except DeadlineExceeded as e:
+        logger.warning(f"Quiz generation timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"Error generating quiz: {e}")
         return jsonify({'error': 'Failed to generate quiz'}), 500
@@ -1786,13 +2573,9 @@ def generate_vocabulary_questions(flashcards, difficulty, count):
             
     return questions
 
-def generate_grammar_questions(language, difficulty, count):
-    """Generate grammar-based questions using LLM API"""
-    questions = []
-    
-    try:
-        for _ in range(count):
-            prompt = f"""
+def build_grammar_question_prompt(language, difficulty, number=1, count=1):
+    """Prompt for one grammar question; ``number`` of ``count`` keeps sibling prompts distinct"""
+    prompt = f"""
             Generate a {difficulty} level grammar question for {language} language learning.
             Return a JSON object with this exact structure:
             {{
@@ -1802,38 +2585,13 @@ def generate_grammar_questions(language, difficulty, count):
                 "explanation": "brief explanation of why this is correct"
             }}
             """
-            
-            response_text = call_llm_api(prompt)
-            try:
-                question_data = json.loads(response_text)
-                questions.append({
-                    'id': str(uuid.uuid4()),
-                    'type': 'multiple_choice',
-                    'text': question_data['question'],
-                    'options': question_data['options'],
-                    'correct_answer': question_data['correct_answer'],
-                    'explanation': question_data['explanation'],
-                    'points': 12
-                })
-            except json.JSONDecodeError:
-                # Fallback to basic question if AI response is invalid
-                questions.append(generate_basic_question(language, difficulty))
-                
-    except Exception as e:
-        logger.error(f"Error generating grammar questions: {e}")
-        # Generate fallback questions
-        for _ in range(count):
-            questions.append(generate_basic_question(language, difficulty))
-        
-    return questions
+    if count > 1:
+        prompt += f"This is question {number} of {count} in the quiz; test a different grammar point than the others.\n"
+    return prompt
 
-def generate_conversation_questions(language, difficulty, count):
-    """Generate conversation-based questions using LLM API"""
-    questions = []
-    
-    try:
-        for _ in range(count):
-            prompt = f"""
+def build_conversation_question_prompt(language, difficulty, number=1, count=1):
+    """Prompt for one conversation question; ``number`` of ``count`` keeps sibling prompts distinct"""
+    prompt = f"""
             Generate a {difficulty} level conversation question for {language} language learning.
             Create a realistic scenario and ask how to respond appropriately.
             Return a JSON object with this exact structure:
@@ -1845,30 +2603,310 @@ def generate_conversation_questions(language, difficulty, count):
                 "explanation": "why this response is most appropriate"
             }}
             """
-            
-            response_text = call_llm_api(prompt)
-            try:
-                question_data = json.loads(response_text)
-                questions.append({
-                    'id': str(uuid.uuid4()),
-                    'type': 'conversation',
-                    'scenario': question_data['scenario'],
-                    'text': question_data['question'],
-                    'options': question_data['options'],
-                    'correct_answer': question_data['correct_answer'],
-                    'explanation': question_data['explanation'],
-                    'points': 15
-                })
-            except json.JSONDecodeError:
-                # Fallback to basic question if AI response is invalid
-                questions.append(generate_basic_question(language, difficulty))
-                
+    if count > 1:
+        prompt += f"This is question {number} of {count} in the quiz; use a different scenario than the others.\n"
+    return prompt
+
+def build_question_set_prompt(kind, language, difficulty, count):
+    """Prompt asking for ``count`` questions of one kind as a single JSON array"""
+    if kind == 'grammar':
+        instructions = "Each question must test a different grammar point."
+        structure = """{
+                "question": "The grammar question text",
+                "options": ["option1", "option2", "option3", "option4"],
+                "correct_answer": "the correct option",
+                "explanation": "brief explanation of why this is correct"
+            }"""
+    else:
+        instructions = "Each question must create a different realistic scenario and ask how to respond appropriately."
+        structure = """{
+                "scenario": "Brief scenario description",
+                "question": "The question asking how to respond",
+                "options": ["response1", "response2", "response3", "response4"],
+                "correct_answer": "the most appropriate response",
+                "explanation": "why this response is most appropriate"
+            }"""
+    return f"""
+            Generate {count} different {difficulty} level {kind} questions for {language} language learning.
+            {instructions}
+            Return a JSON array of exactly {count} objects, each with this exact structure:
+            {structure}
+            """
+
+# LLM-generated quiz question kinds: prompt builder, question type, required keys and points
+QUIZ_QUESTION_KINDS = {
+    'grammar': {
+        'prompt': build_grammar_question_prompt,
+        'type': 'multiple_choice',
+        'keys': ['question', 'options', 'correct_answer', 'explanation'],
+        'points': 12
+    },
+    'conversation': {
+        'prompt': build_conversation_question_prompt,
+        'type': 'conversation',
+        'keys': ['scenario', 'question', 'options', 'correct_answer', 'explanation'],
+        'points': 15
+    }
+}
+
+# Recently generated valid questions per (kind, language, difficulty), used to replace invalid items
+QUIZ_RECENT_QUESTIONS = 50
+recent_quiz_questions = defaultdict(lambda: deque(maxlen=QUIZ_RECENT_QUESTIONS))
+recent_quiz_questions_lock = threading.Lock()
+quiz_generation_metrics = {
+    'llm_calls': 0,
+    'generated': 0,
+    'replaced_from_cache': 0,
+    'replaced_with_basic': 0
+}
+# Updated from the generation executor's worker threads
+quiz_generation_metrics_lock = threading.Lock()
+
+def count_quiz_generation(metric, amount=1):
+    """Add to a quiz generation counter"""
+    with quiz_generation_metrics_lock:
+        quiz_generation_metrics[metric] += amount
+
+def quiz_generation_stats():
+    """Snapshot of the quiz generation counters"""
+    with quiz_generation_metrics_lock:
+        return dict(quiz_generation_metrics)
+
+def build_quiz_question(kind, question_data):
+    """
+    Validate one question object from the LLM and convert it to a quiz question.
+    
+    Raises:
+        ValueError: If a field is missing, the options are not a list of at
+        least two strings, or the correct answer is not one of the options
+    """
+    spec = QUIZ_QUESTION_KINDS[kind]
+    if not isinstance(question_data, dict) or not all(question_data.get(key) for key in spec['keys']):
+        raise ValueError(f"Incomplete {kind} question")
+    options = question_data['options']
+    if not isinstance(options, list) or len(options) < 2 or not all(isinstance(option, str) for option in options):
+        raise ValueError(f"Invalid options in {kind} question")
+    answer = str(question_data['correct_answer']).strip().lower()
+    correct_answer = next((option for option in options if option.strip().lower() == answer), None)
+    if correct_answer is None:
+        raise ValueError(f"Correct answer of {kind} question is not one of its options")
+    
+    question = {'id': str(uuid.uuid4()), 'type': spec['type']}
+    if 'scenario' in spec['keys']:
+        question['scenario'] = question_data['scenario']
+    question.update({
+        'text': question_data['question'],
+        'options': options,
+        'correct_answer': correct_answer,
+        'explanation': question_data['explanation'],
+        'points': spec['points']
+    })
+    return question
+
+def generate_llm_question(kind, language, difficulty, number=1, count=1, deadline=None):
+    """
+    Generate one quiz question with its own LLM prompt.
+    
+    Returns:
+        dict: The question, or None if the call fails or the response is invalid
+    """
+    spec = QUIZ_QUESTION_KINDS[kind]
+    try:
+        count_quiz_generation('llm_calls')
+        response_text = call_llm_api(
+            spec['prompt'](language, difficulty, number, count),
+            deadline=deadline,
+            priority=PRIORITY_BACKGROUND
+        )
+        return build_quiz_question(kind, extract_json_object(response_text, spec['keys']))
+    except ValueError as e:
+        logger.warning(f"Invalid {kind} question from LLM: {e}")
     except Exception as e:
-        logger.error(f"Error generating conversation questions: {e}")
-        # Generate fallback questions
-        for _ in range(count):
-            questions.append(generate_basic_question(language, difficulty))
+        logger.error(f"Error generating {kind} question: {e}")
+    return None
+
+def generate_llm_question_set(kind, language, difficulty, count, deadline=None):
+    """
+    Generate ``count`` quiz questions of one kind with a single LLM prompt.
+    
+    Each item of the returned array is validated on its own, so one bad
+    item does not discard the rest (a truncated array keeps its complete
+    items).
+    
+    Returns:
+        list: ``count`` entries, each a question or None where the item was
+        missing or invalid
+    """
+    try:
+        count_quiz_generation('llm_calls')
+        response_text = call_llm_api(
+            build_question_set_prompt(kind, language, difficulty, count),
+            deadline=deadline,
+            priority=PRIORITY_BACKGROUND
+        )
+        items = extract_json(response_text, allow_array=True)
+    except ValueError as e:
+        logger.warning(f"Invalid {kind} question set from LLM: {e}")
+        return [None] * count
+    except Exception as e:
+        logger.error(f"Error generating {kind} questions: {e}")
+        return [None] * count
+    
+    if isinstance(items, dict):
+        # The model wrapped the array in an object, or returned a single question
+        items = items.get('questions', [items])
+    questions = []
+    for item in items[:count]:
+        try:
+            questions.append(build_quiz_question(kind, item))
+        except ValueError as e:
+            logger.warning(f"Invalid item in {kind} question set: {e}")
+            questions.append(None)
+    return questions + [None] * (count - len(questions))
+
+def quiz_question_key(question):
+    """Identity of a question's content, used to spot duplicates within a quiz"""
+    return (question.get('scenario'), question['text'])
+
+def replacement_quiz_question(kind, language, difficulty, exclude_keys):
+    """
+    Question to use in place of a failed or invalid one.
+    
+    Prefers a recently generated question of the same kind that is not
+    already in the quiz, then falls back to a basic question.
+    """
+    with recent_quiz_questions_lock:
+        candidates = [
+            question for question in recent_quiz_questions[(kind, language, difficulty)]
+            if quiz_question_key(question) not in exclude_keys
+        ]
+    if candidates:
+        count_quiz_generation('replaced_from_cache')
+        return dict(random.choice(candidates), id=str(uuid.uuid4()))
+    count_quiz_generation('replaced_with_basic')
+    return generate_basic_question(language, difficulty)
+
+def generate_llm_questions(plan, language, difficulty):
+    """
+    Generate LLM quiz questions concurrently.
+    
+    In 'batch' mode (QUIZ_GENERATION_MODE) each kind is one LLM call asking
+    for all of its questions, so a mixed quiz makes at most two calls; in
+    'per_question' mode every question is its own call. Calls run on a
+    bounded executor under one deadline (at most QUIZ_GENERATION_TIMEOUT,
+    within the request budget). Failed, invalid, duplicate and unfinished
+    questions are replaced by recently generated or basic questions without
+    affecting the others.
+    
+    Args:
+        plan (list): (kind, count) pairs, e.g. [('grammar', 3), ('conversation', 3)]
+        language (str): Quiz language
+        difficulty (str): Quiz difficulty
+    
+    Returns:
+        list: Questions in plan order
+    """
+    request_deadline = get_deadline()
+    budget = QUIZ_GENERATION_TIMEOUT
+    if request_deadline:
+        budget = min(budget, request_deadline.remaining())
+    deadline = Deadline(budget)
+    
+    # Each job is (kind, number of questions, callable returning that many questions or Nones)
+    if QUIZ_GENERATION_MODE == 'batch':
+        jobs = [
+            (kind, count, lambda kind=kind, count=count: generate_llm_question_set(kind, language, difficulty, count, deadline))
+            for kind, count in plan if count > 0
+        ]
+    else:
+        jobs = [
+            (kind, 1, lambda kind=kind, number=number, count=count: [generate_llm_question(kind, language, difficulty, number, count, deadline)])
+            for kind, count in plan for number in range(1, count + 1)
+        ]
+    if not jobs:
+        return []
+    
+    executor = ThreadPoolExecutor(max_workers=min(len(jobs), QUIZ_GENERATION_MAX_WORKERS))
+    try:
+        futures = [executor.submit(job) for _, _, job in jobs]
+        wait(futures, timeout=deadline.remaining())
+    finally:
+        # Do not wait for stragglers; their LLM calls are bounded by the same deadline
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    questions = []
+    seen_keys = set()
+    timed_out = 0
+    for (kind, size, _), future in zip(jobs, futures):
+        if future.done() and not future.cancelled() and future.exception() is None:
+            generated = future.result()
+        else:
+            timed_out += size
+            generated = [None] * size
+        
+        valid = []
+        for question in generated:
+            if question is None or quiz_question_key(question) in seen_keys:
+                question = replacement_quiz_question(kind, language, difficulty, seen_keys)
+            else:
+                valid.append(question)
+            seen_keys.add(quiz_question_key(question))
+            questions.append(question)
         
+        count_quiz_generation('generated', len(valid))
+        with recent_quiz_questions_lock:
+            recent_quiz_questions[(kind, language, difficulty)].extend(valid)
+    
+    if timed_out:
+        logger.warning(f"Quiz generation deadline reached; {timed_out} questions replaced")
+    return questions
+
+def generate_pool_questions(question_type, language, difficulty, count):
+    """Question generator for background pool refills: one set prompt, valid items only"""
+    return [
+        question for question in generate_llm_question_set(question_type, language, difficulty, count)
+        if question is not None
+    ]
+
+# Persistent pool of pre-generated grammar and conversation questions, refilled in the background
+question_pool = None
+if QUIZ_POOL_PATH:
+    try:
+        question_pool = QuestionPool(
+            QUIZ_POOL_PATH,
+            generate=generate_pool_questions if gemini_model else None,
+            low_water=QUIZ_POOL_LOW_WATER,
+            refill_batch=QUIZ_POOL_REFILL_BATCH,
+            max_size=QUIZ_POOL_MAX_SIZE
+        )
+        logger.info(f"Quiz question pool enabled at {QUIZ_POOL_PATH}")
+    except Exception as e:
+        logger.error(f"Failed to open quiz question pool: {e}")
+        question_pool = None
+
+def generate_quiz_llm_questions(user_id, plan, language, difficulty):
+    """
+    Questions for the LLM part of a quiz.
+    
+    Each kind is drawn from the question pool first (never repeating a
+    pooled question for the same user); whatever the pool cannot cover is
+    generated live.
+    
+    Args:
+        user_id (str): User taking the quiz
+        plan (list): (kind, count) pairs
+    
+    Returns:
+        list: Questions in plan order
+    """
+    questions = []
+    live_plan = []
+    for kind, count in plan:
+        pooled = question_pool.draw(user_id, language, difficulty, kind, count) if question_pool else []
+        questions.extend(pooled)
+        if len(pooled) < count:
+            live_plan.append((kind, count - len(pooled)))
+    questions.extend(generate_llm_questions(live_plan, language, difficulty))
     return questions
 
 def generate_basic_question(language, difficulty):
@@ -1919,80 +2957,107 @@ def submit_quiz_answer(quiz_id):
         if not all([user_id, answer, question_index is not None]):
             return jsonify({'error': 'Missing required fields'}), 400
             
-        # Load user data
-        user_data_path = os.path.join('data', 'users', f'{user_id}.json')
-        user_data = load_json_file(user_data_path, default={})
-        
-        if 'quizzes' not in user_data or quiz_id not in user_data['quizzes']:
+        quiz = db_service.get_quiz(user_id, quiz_id)
+        if not quiz:
             return jsonify({'error': 'Quiz not found'}), 404
             
-        quiz = user_data['quizzes'][quiz_id]
         if quiz['completed']:
             return jsonify({'error': 'Quiz already completed'}), 400
             
+        if not isinstance(question_index, int) or not 0 <= question_index < len(quiz['questions']):
+            return jsonify({'error': 'Invalid question index'}), 400
+            
+        if question_index in quiz['answered']:
+            return jsonify({'error': 'Question already answered'}), 400
+            
         question = quiz['questions'][question_index]
-        is_correct = False
-        points_earned = 0
-        
-        # Evaluate answer based on question type
-        if question['type'] in ['multiple_choice', 'conversation']:
-            is_correct = answer == question['correct_answer']
-            points_earned = question['points'] if is_correct else 0
-        elif question['type'] == 'translation':
-            # Use fuzzy matching for translations
-            similarity = fuzz.ratio(answer.lower(), question['correct_answer'].lower())
-            is_correct = similarity >= 80
-            points_earned = int(question['points'] * (similarity / 100))
-        elif question['type'] == 'fill_blank':
-            # Case-insensitive exact match for fill in the blank
-            is_correct = answer.lower() == question['correct_answer'].lower()
-            points_earned = question['points'] if is_correct else 0
-        elif question['type'] == 'grammar':
-            is_correct = answer == question['correct_answer']
-            points_earned = question['points'] if is_correct else 0
-        
-        # Record answer
-        quiz['answers'].append({
-            'question_index': question_index,
-            'user_answer': answer,
+        is_correct, points_earned = grade_quiz_answer(question, answer)
+        
+        # Record answer as its own row; the last answer completes the quiz
+        try:
+            result = db_service.record_quiz_answer(user_id, quiz_id, question_index, answer, is_correct, points_earned)
+        except QuizAnswerConflict as e:
+            # Lost a race with a concurrent submission after the checks above
+            return jsonify({'error': str(e)}), 400
+        if result is None:
+            return jsonify({'error': 'Failed to record answer'}), 500
+        
+        return jsonify({
             'correct': is_correct,
             'points_earned': points_earned,
-            'timestamp': datetime.now().isoformat()
+            'total_score': result['total_score'],
+            'completed': result['completed'],
+            'explanation': question.get('explanation', '')
         })
         
-        # Update quiz score
-        quiz['score'] += points_earned
+    except DeadlineExceeded as e:
+        logger.warning(f"Quiz answer submission timed out: {e}")
+        return deadline_exceeded_response(e)
+    except Exception as e:
+        logger.error(f"Error submitting quiz answer: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/quiz/<quiz_id>/submit-all', methods=['POST'])
+@rate_limit
+def submit_quiz_answers(quiz_id):
+    """Submit and evaluate answers to several (or all) questions of a quiz at once"""
+    try:
+        data = request.get_json()
+        user_id = data.get('userId')
+        answers = data.get('answers')
         
-        # Check if quiz is completed
-        if len(quiz['answers']) == len(quiz['questions']):
-            quiz['completed'] = True
-            quiz['completed_at'] = datetime.now().isoformat()
+        if not user_id or not isinstance(answers, dict) or not answers:
+            return jsonify({'error': 'Missing required fields'}), 400
             
-            # Update user progress
-            if 'progress' not in user_data:
-                user_data['progress'] = {
-                    'quizzes_completed': 0,
-                    'total_points': 0,
-                    'average_score': 0
-                }
-                
-            progress = user_data['progress']
-            progress['quizzes_completed'] += 1
-            progress['total_points'] += quiz['score']
-            progress['average_score'] = progress['total_points'] / progress['quizzes_completed']
+        quiz = db_service.get_quiz(user_id, quiz_id)
+        if not quiz:
+            return jsonify({'error': 'Quiz not found'}), 404
             
-        save_json_file(user_data_path, user_data)
+        if quiz['completed']:
+            return jsonify({'error': 'Quiz already completed'}), 400
+        
+        # Answers are keyed by question index, as in /api/quiz/submit
+        try:
+            answers = {int(index): answer for index, answer in answers.items()}
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Invalid question index'}), 400
+        if any(not 0 <= index < len(quiz['questions']) for index in answers):
+            return jsonify({'error': 'Invalid question index'}), 400
+        if any(not isinstance(answer, str) or not answer for answer in answers.values()):
+            return jsonify({'error': 'Answers must be non-empty strings'}), 400
+        if set(answers) & set(quiz['answered']):
+            return jsonify({'error': 'Question already answered'}), 400
+        
+        graded = grade_quiz_answers(quiz['questions'], answers)
+        
+        # One transaction for every answer and, if the quiz is now finished, its score
+        try:
+            result = db_service.record_quiz_answers(user_id, quiz_id, graded)
+        except QuizAnswerConflict as e:
+            # Lost a race with a concurrent submission after the checks above
+            return jsonify({'error': str(e)}), 400
+        if result is None:
+            return jsonify({'error': 'Failed to record answers'}), 500
         
         return jsonify({
-            'correct': is_correct,
-            'points_earned': points_earned,
-            'total_score': quiz['score'],
-            'completed': quiz['completed'],
-            'explanation': question.get('explanation', '')
+            'results': [{
+                'question_index': answer['question_index'],
+                'correct': answer['correct'],
+                'points_earned': answer['points_earned'],
+                'explanation': quiz['questions'][answer['question_index']].get('explanation', '')
+            } for answer in graded],
+            'total_score': result['total_score'],
+            'correct_answers': result['correct_answers'],
+            'answered': result['answered'],
+            'total_questions': len(quiz['questions']),
+            'completed': result['completed']
         })
         
+    except DeadlineExceeded as e:
+        logger.warning(f"Quiz answers submission timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
-        logger.error(f"Error submitting quiz answer: {e}")
+        logger.error(f"Error submitting quiz answers: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/api/progress', methods=['GET'])
@@ -2012,6 +3077,9 @@ def get_user_progress():
 
         return jsonify(progress_data)
 
+    except DeadlineExceeded as e:
+        logger.warning(f"Getting user progress timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"Error getting user progress: {e}")
         return jsonify({'error': 'Failed to get progress data'}), 500
@@ -2060,6 +3128,9 @@ def get_progress_summary():
         
         return jsonify(progress_summary)
         
+    except DeadlineExceeded as e:
+        logger.warning(f"Getting progress summary timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"Error getting progress summary: {e}")
         return jsonify({'error': 'Failed to get progress summary'}), 500
@@ -2087,6 +3158,9 @@ def get_word_for_explorer():
         
         return jsonify(word_data)
         
+    except DeadlineExceeded as e:
+        logger.warning(f"Getting word for explorer timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"Error getting word for explorer: {e}")
         return jsonify({'error': 'Failed to get word'}), 500
@@ -2164,6 +3238,9 @@ def get_comprehensive_progress():
         
         return jsonify(progress_data)
         
+    except DeadlineExceeded as e:
+        logger.warning(f"Getting comprehensive progress timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"Error getting comprehensive progress: {e}")
         return jsonify({'error': 'Failed to get comprehensive progress'}), 500
@@ -2197,6 +3274,9 @@ def user_preferences():
             else:
                 return jsonify({'error': 'Failed to save preferences'}), 500
             
+    except DeadlineExceeded as e:
+        logger.warning(f"User preferences timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"User preferences error: {e}")
         return jsonify({'error': 'Failed to handle preferences'}), 500
@@ -2255,36 +3335,10 @@ def internal_error(error):
 def rate_limit_exceeded(error):
     return jsonify({'error': 'Rate limit exceeded', 'retry_after': 60}), 429
 
-# Cleanup function for cache
-def cleanup_caches():
-    """Clean up expired cache entries"""
-    current_time = time.time()
-    
-    # Clean translation cache
-    expired_keys = [
-        key for key, (_, timestamp) in translation_cache.items()
-        if current_time - timestamp > CACHE_DURATION
-    ]
-    for key in expired_keys:
-        del translation_cache[key]
-    
-    # Clean TTS cache
-    expired_keys = [
-        key for key, (_, timestamp) in tts_cache.items()
-        if current_time - timestamp > CACHE_DURATION
-    ]
-    for key in expired_keys:
-        del tts_cache[key]
-    
-    logger.info(f"Cache cleanup completed. Removed {len(expired_keys)} expired entries")
-
-# Schedule cache cleanup every hour
-def schedule_cleanup():
-    cleanup_caches()
-    threading.Timer(3600, schedule_cleanup).start()
-
-# Start cleanup scheduler
-schedule_cleanup()
+@app.errorhandler(DeadlineExceeded)
+def request_deadline_exceeded(error):
+    logger.warning(f"Request deadline exceeded: {error}")
+    return deadline_exceeded_response(error)
 
 # AI Avatar system configuration
 AVATAR_DATA = {
@@ -2574,8 +3628,8 @@ def avatar_conversation():
         
         try:
             # Try to parse the JSON response
-            conversation_data = json.loads(response_text)
-        except json.JSONDecodeError:
+            conversation_data = extract_json_object(response_text, required_keys=['response'])
+        except JSONExtractionError:
             # Fallback response in character
             conversation_data = {
                 "response": avatar['greeting'] if not conversation_history else "I understand. Please continue.",
@@ -2627,6 +3681,12 @@ def avatar_conversation():
         
         return jsonify(conversation_data)
         
+    except (CircuitOpenError, AdmissionRejected) as e:
+        logger.warning(f"Avatar conversation rejected: {e}")
+        return llm_unavailable_response(e)
+    except DeadlineExceeded as e:
+        logger.warning(f"Avatar conversation timed out: {e}")
+        return deadline_exceeded_response(e)
     except Exception as e:
         logger.error(f"Error in avatar conversation: {e}")
         return jsonify({'error': 'Failed to generate avatar conversation response'}), 500
@@ -2696,24 +3756,22 @@ def get_quizzes():
         if not language:
             return jsonify({'error': 'Language parameter required'}), 400
             
-        quizzes_data = load_json_file(QUIZZES_FILE, {'quizzes': {}})
-        
-        if language not in quizzes_data.get('quizzes', {}):
+        if not quiz_catalog.has_language(language):
             return jsonify({'error': f'No quizzes available for language {language}'}), 404
             
-        if difficulty not in quizzes_data['quizzes'][language]:
+        quizzes = quiz_catalog.get_quizzes(language, difficulty)
+        if quizzes is None:
             return jsonify({'error': f'No quizzes available for difficulty {difficulty}'}), 404
-            
-        quizzes = quizzes_data['quizzes'][language][difficulty]
         
         # Add metadata
+        metadata = quiz_catalog.metadata()
         response = {
             'quizzes': quizzes,
             'total_quizzes': len(quizzes),
             'difficulty': difficulty,
             'language': language,
-            'categories': quizzes_data.get('categories', []),
-            'available_difficulties': quizzes_data.get('difficulties', [])
+            'categories': metadata['categories'],
+            'available_difficulties': metadata['difficulties']
         }
         
         return jsonify(response)
@@ -2731,23 +3789,11 @@ def get_quiz(quiz_id):
         if not language:
             return jsonify({'error': 'Language parameter required'}), 400
             
-        quizzes_data = load_json_file(QUIZZES_FILE, {'quizzes': {}})
-        
-        # Search for quiz in all difficulty levels
-        quiz = None
-        if language in quizzes_data.get('quizzes', {}):
-            for difficulty in quizzes_data['quizzes'][language]:
-                for q in quizzes_data['quizzes'][language][difficulty]:
-                    if q['id'] == quiz_id:
-                        quiz = q
-                        break
-                if quiz:
-                    break
-        
-        if not quiz:
+        entry = quiz_catalog.find(quiz_id, language)
+        if not entry:
             return jsonify({'error': f'Quiz {quiz_id} not found'}), 404
             
-        return jsonify(quiz)
+        return jsonify(entry[2])
         
     except Exception as e:
         logger.error(f"Error fetching quiz {quiz_id}: {e}")
@@ -2766,28 +3812,10 @@ def submit_quiz():
         if not all([quiz_id, user_id, answers]):
             return jsonify({'error': 'Missing required parameters'}), 400
             
-        # Get quiz data
-        quizzes_data = load_json_file(QUIZZES_FILE, {'quizzes': {}})
-        quiz = None
-        language = None
-        difficulty = None
-        
-        # Find the quiz
-        for lang in quizzes_data.get('quizzes', {}):
-            for diff in quizzes_data['quizzes'][lang]:
-                for q in quizzes_data['quizzes'][lang][diff]:
-                    if q['id'] == quiz_id:
-                        quiz = q
-                        language = lang
-                        difficulty = diff
-                        break
-                if quiz:
-                    break
-            if quiz:
-                break
-                
-        if not quiz:
+        entry = quiz_catalog.find(quiz_id)
+        if not entry:
             return jsonify({'error': f'Quiz {quiz_id} not found'}), 404
+        language, difficulty, quiz = entry
             
         # Calculate results
         total_questions = len(quiz['questions'])
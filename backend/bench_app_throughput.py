@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark Flask endpoint throughput against the local stub LLM provider.
+
+Forces LLM_PROVIDER=local before importing the app, so every LLM call is
+served in-process with simulated latency and no network. Concurrent
+clients call each endpoint with distinct texts (cache misses) and the
+script reports requests per second and latency percentiles.
+
+Usage:
+    python bench_app_throughput.py [--requests 200] [--concurrency 16] [--latency-ms 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+    parser.add_argument('--latency-ms', type=float, default=200, help='Simulated LLM latency')
+    parser.add_argument('--error-rate', type=float, default=0, help='Simulated LLM error rate')
+    return parser.parse_args()
+
+ENDPOINTS = {
+    'translate': ('/api/translate', lambda i: {'text': f'hello {i}', 'sourceLang': 'en', 'targetLang': 'es'}),
+    'advanced-translate': ('/api/advanced-translate', lambda i: {'text': f'good morning {i}', 'sourceLang': 'en', 'targetLang': 'ja'}),
+    'tutor/explain': ('/api/tutor/explain', lambda i: {'text': f'hola {i}', 'language': 'es'}),
+}
+
+def run_endpoint(client, path, make_body, count, concurrency):
+    """Send ``count`` requests with ``concurrency`` clients; return latencies and errors"""
+    def call(i):
+        start = time.perf_counter()
+        response = client.post(path, json=make_body(i))
+        return (time.perf_counter() - start) * 1000, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(count)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status >= 400)
+    return elapsed, latencies, errors
+
+def main():
+    args = parse_args()
+    os.environ['LLM_PROVIDER'] = 'local'
+    os.environ['LOCAL_LLM_LATENCY_MS'] = str(args.latency_ms)
+    os.environ['LOCAL_LLM_ERROR_RATE'] = str(args.error_rate)
+    import logging
+    logging.disable(logging.WARNING)
+    import app as flask_app
+
+    client = flask_app.app.test_client()
+    # Client requests share one IP; keep the per-IP rate limit out of the measurement
+    flask_app.RATE_LIMIT_REQUESTS = sys.maxsize
+
+    print(f"{args.requests} requests per endpoint, {args.concurrency} clients, "
+          f"{args.latency_ms:.0f}ms simulated LLM latency\n")
+    for name, (path, make_body) in ENDPOINTS.items():
+        elapsed, latencies, errors = run_endpoint(client, path, make_body, args.requests, args.concurrency)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{name:<20} {args.requests / elapsed:8.1f} req/s   median {statistics.median(latencies):7.1f} ms   "
+              f"p95 {p95:7.1f} ms   errors {errors}")
+
+if __name__ == "__main__":
+    main()
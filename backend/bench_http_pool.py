@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call HTTP overhead of requests.post versus the pooled session.
+
+Starts a local stub server that answers like the OpenRouter chat completions
+endpoint, then times sequential calls with a new connection per request and
+with the shared keep-alive session from http_pool.
+
+Usage:
+    python bench_http_pool.py [--calls 500]
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from http_pool import create_http_session
+
+STUB_RESPONSE = json.dumps({
+    'choices': [{'message': {'content': '{"translation": "hola"}'}}]
+}).encode('utf-8')
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """Minimal chat completions stub that supports keep-alive"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(STUB_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(STUB_RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+def run_calls(post, url, calls):
+    """Time ``calls`` sequential POSTs and return per-call latencies in ms"""
+    payload = {'model': 'stub', 'messages': [{'role': 'user', 'content': 'Translate: hello'}]}
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = post(url, json=payload, timeout=(5, 30))
+        response.json()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def report(label, latencies):
+    """Print summary statistics for a run"""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<28} mean {statistics.mean(latencies):7.3f} ms   "
+          f"median {statistics.median(latencies):7.3f} ms   p95 {p95:7.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=500, help='Number of calls per mode')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/v1/chat/completions"
+
+    try:
+        print(f"Benchmarking {args.calls} sequential calls against {url}\n")
+        report('requests.post (no pooling)', run_calls(requests.post, url, args.calls))
+
+        session = create_http_session()
+        report('pooled keep-alive session', run_calls(session.post, url, args.calls))
+        session.close()
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
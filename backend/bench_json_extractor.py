@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared JSON extractor against the old fence-strip + json.loads parsing.
+
+Runs both parsers over a corpus of LLM responses in the shapes seen in the
+logs (bare JSON, code fences, leading and trailing prose, trailing commas,
+responses cut off by the token limit) and reports how many responses each
+one recovers, how many would have needed a fallback LLM round trip, and the
+parse time per response.
+
+Usage:
+    python bench_json_extractor.py [--repeat 2000]
+"""
+
+import argparse
+import json
+import time
+
+from json_extractor import JSONExtractionError, extract_json_object
+
+TRANSLATION = {
+    "main_translation": "こんにちは、元気ですか？",
+    "alternatives": [
+        {"text": "やあ、元気？", "confidence": 85, "explanation": "Casual", "type": "colloquial"},
+        {"text": "ご機嫌いかがですか？", "confidence": 70, "explanation": "Polite {keigo}", "type": "formal"}
+    ],
+    "pronunciation": {"ipa": "koɲɲitɕiwa", "romanization": "konnichiwa, genki desu ka?", "romanization_system": "Hepburn"},
+    "grammar": {"structure": "Greeting + question", "rules": ["か marks a question"]},
+    "additional": {"difficulty": "beginner", "etymology": "From \"今日は\""}
+}
+QUESTION = {
+    "question": "Which particle marks the topic?",
+    "options": ["は", "が", "を", "に"],
+    "correct_answer": "は",
+    "explanation": "は marks the topic of the sentence."
+}
+REPLY = {"response": "¡Hola! ¿Qué tal?", "translation": "Hello! How are you?", "vocabulary": ["hola"]}
+
+def build_corpus():
+    """Malformed-response corpus as (label, text, required keys)"""
+    translation = json.dumps(TRANSLATION, ensure_ascii=False, indent=2)
+    question = json.dumps(QUESTION, ensure_ascii=False)
+    reply = json.dumps(REPLY, ensure_ascii=False)
+    return [
+        ('bare json', translation, ['main_translation']),
+        ('```json fence', f"```json\n{translation}\n```", ['main_translation']),
+        ('``` fence without language', f"```\n{question}\n```", ['question', 'options']),
+        ('leading prose', f"Here is the translation analysis you asked for:\n{translation}", ['main_translation']),
+        ('trailing prose', f"{reply}\n\nI hope this helps with your practice!", ['response']),
+        ('prose and fence', f"Sure! ```json\n{question}\n``` Let me know if you want another.", ['question']),
+        ('prose with braces', f"Use the {{topic}} marker here: {question}", ['question']),
+        ('trailing comma', question[:-1] + ',}', ['question']),
+        ('truncated at token limit', translation[:len(translation) * 3 // 4], ['main_translation']),
+        ('indented fence', f"  ```json\n  {reply}\n  ```  ", ['response']),
+    ]
+
+def legacy_parse(text):
+    """Parsing as previously done at each call site"""
+    text = text.strip()
+    if text.startswith('```json'):
+        text = text[7:]
+    if text.startswith('```'):
+        text = text[3:]
+    if text.endswith('```'):
+        text = text[:-3]
+    return json.loads(text.strip())
+
+def run(label, parse, corpus, repeat):
+    """Parse the corpus ``repeat`` times; return recovered labels and mean time per response"""
+    recovered = []
+    for name, text, required in corpus:
+        try:
+            value = parse(text, required)
+            if all(key in value for key in required):
+                recovered.append(name)
+        except (ValueError, JSONExtractionError):
+            pass
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, text, required in corpus:
+            try:
+                parse(text, required)
+            except (ValueError, JSONExtractionError):
+                pass
+    elapsed = time.perf_counter() - start
+    per_response_us = elapsed / (repeat * len(corpus)) * 1e6
+
+    failed = len(corpus) - len(recovered)
+    print(f"{label:<22} recovered {len(recovered):2}/{len(corpus)}   "
+          f"fallback LLM calls {failed:2}   {per_response_us:7.1f} µs/response")
+    return recovered
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=2000, help='Passes over the corpus for timing')
+    args = parser.parse_args()
+
+    corpus = build_corpus()
+    print(f"Parsing {len(corpus)} responses x {args.repeat}\n")
+    legacy = run('fence strip + loads', lambda text, required: legacy_parse(text), corpus, args.repeat)
+    extracted = run('extract_json_object', extract_json_object, corpus, args.repeat)
+
+    print("\nRecovered only by the extractor:")
+    for name, _, _ in corpus:
+        if name in extracted and name not in legacy:
+            print(f"  - {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded LLM traffic mix and measure the work done around each call.
+
+Loads a recording written with LLM_RECORD_PATH, imports the app with the
+replay provider at zero latency, and pushes every recorded prompt through
+call_llm_api in recorded order. For each call it times the LLM path
+(coalescing, circuit breaker, provider dispatch), JSON extraction, a
+translation cache set + get, and response serialization, then reports the
+mean and p95 per stage for each recorded endpoint.
+
+Make a recording from the local stub with:
+    LLM_PROVIDER=local LLM_RECORD_PATH=/tmp/llm.jsonl python bench_app_throughput.py
+
+Usage:
+    python bench_llm_replay.py /tmp/llm.jsonl [--passes 5]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+STAGES = ('llm', 'parse', 'cache', 'serialize')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('recording', help='JSON Lines recording written with LLM_RECORD_PATH')
+    parser.add_argument('--passes', type=int, default=5, help='Passes over the recording')
+    return parser.parse_args()
+
+def load_calls(path):
+    """Recorded successful calls as (source, prompt, max_tokens) in file order"""
+    calls = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if 'error' in entry or entry.get('stream'):
+                continue
+            if 'prompt' not in entry:
+                sys.exit("Recording has no prompt text; record with LLM_RECORD_PROMPTS=true")
+            calls.append((entry.get('source') or 'unknown', entry['prompt'], entry['max_tokens']))
+    return calls
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(int(len(ordered) * fraction) - 1, 0)]
+
+def main():
+    args = parse_args()
+    calls = load_calls(args.recording)
+    if not calls:
+        sys.exit(f"No replayable calls in {args.recording}")
+
+    os.environ['LLM_PROVIDER'] = 'replay'
+    os.environ['LLM_REPLAY_PATH'] = args.recording
+    os.environ['LLM_REPLAY_LATENCY_SCALE'] = '0'
+    os.environ['LLM_RECORD_PATH'] = ''
+    import logging
+    logging.disable(logging.WARNING)
+    import app as flask_app
+    from json_extractor import JSONExtractionError, extract_json
+
+    timings = defaultdict(lambda: defaultdict(list))
+    parse_failures = defaultdict(int)
+    with flask_app.app.app_context():
+        for _ in range(args.passes):
+            for source, prompt, max_tokens in calls:
+                stage = timings[source]
+                start = time.perf_counter()
+                text = flask_app.call_llm_api(prompt, max_tokens=max_tokens, retries=0)
+                stage['llm'].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                try:
+                    value = extract_json(text, allow_array=True)
+                except JSONExtractionError:
+                    value = {'text': text}
+                    parse_failures[source] += 1
+                stage['parse'].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                key = flask_app.get_cache_key({'prompt': prompt})
+                flask_app.translation_cache.set(key, value)
+                flask_app.translation_cache.get(key)
+                stage['cache'].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                flask_app.jsonify(value).get_data()
+                stage['serialize'].append(time.perf_counter() - start)
+
+    replay_stats = flask_app.llm_provider.stats()
+    print(f"Replayed {len(calls)} recorded calls x {args.passes} passes "
+          f"(replay hits {replay_stats['hits']}, misses {replay_stats['misses']})\n")
+    print(f"{'endpoint':<24}{'calls':>7}" + ''.join(f"{name + ' µs':>22}" for name in STAGES) + f"{'parse failures':>16}")
+    print(f"{'':<31}" + ''.join(f"{'mean':>11}{'p95':>11}" for _ in STAGES))
+    for source, stage in sorted(timings.items()):
+        row = f"{source:<24}{len(stage['llm']):>7}"
+        for name in STAGES:
+            values = stage[name]
+            row += f"{sum(values) / len(values) * 1e6:>11.1f}{percentile(values, 0.95) * 1e6:>11.1f}"
+        print(row + f"{parse_failures[source]:>16}")
+
+if __name__ == "__main__":
+    main()
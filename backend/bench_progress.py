@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark get_comprehensive_progress for heavy users.
+
+Seeds a temporary SQLite database with users that each have thousands of
+flashcard reviews (10k+ by default), quiz scores, conversation sessions
+and analytics events spread over the last 90 days, then times
+get_comprehensive_progress for every time range and counts the SQL
+statements each call issues.
+
+Usage:
+    python bench_progress.py [--users 3] [--reviews 12000] [--flashcards 400] [--repeat 5] [--dump out.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from models import (
+    Base, User, Flashcard, FlashcardReview, QuizScore, PracticeSession, Analytics, UserPreference,
+    create_db_engine
+)
+from db_service import DatabaseService
+
+TIME_RANGES = ('all', 'month', 'week')
+DAYS = 90
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=3, help='Heavy users to seed')
+    parser.add_argument('--reviews', type=int, default=12000, help='Flashcard reviews per user')
+    parser.add_argument('--flashcards', type=int, default=400, help='Flashcards per user')
+    parser.add_argument('--repeat', type=int, default=5, help='Calls per user and time range')
+    parser.add_argument('--dump', help='Write every result to this JSON file (to compare implementations)')
+    return parser.parse_args()
+
+def seed(db, args, rng):
+    now = datetime.now()
+
+    def recent(days=DAYS):
+        return now - timedelta(seconds=rng.randrange(days * 86400))
+
+    for u in range(args.users):
+        user_id = f'heavy-{u}'
+        db.add(User(id=user_id, last_active=now))
+        db.add(UserPreference(user_id=user_id, daily_goal=20))
+        cards = []
+        for f in range(args.flashcards):
+            card_id = f'{user_id}-card-{f}'
+            cards.append(card_id)
+            db.add(Flashcard(
+                id=card_id, user_id=user_id, original_text=f'word {f}', translated_text=f'palabra {f}',
+                source_lang='en', target_lang=rng.choice(['es', 'es', 'fr']),
+                mastery_level=rng.randrange(6), review_count=0,
+                success_rate=rng.choice([0.0, rng.random()]),
+                next_review=now + timedelta(days=rng.randrange(-10, 30)),
+                created_at=recent(), updated_at=now
+            ))
+        db.flush()
+        db.bulk_insert_mappings(FlashcardReview, [
+            {'flashcard_id': rng.choice(cards), 'correct': rng.random() < 0.7,
+             'time_taken': rng.randrange(1, 20), 'timestamp': recent()}
+            for _ in range(args.reviews)
+        ])
+        db.bulk_insert_mappings(QuizScore, [
+            {'user_id': user_id, 'quiz_id': f'{user_id}-quiz-{q}', 'score': rng.randrange(0, 101),
+             'total_questions': 10, 'correct_answers': rng.randrange(11), 'language': rng.choice(['es', 'fr']),
+             'difficulty': 'beginner', 'answers': [], 'timestamp': recent()}
+            for q in range(300)
+        ])
+        db.bulk_insert_mappings(PracticeSession, [
+            {'user_id': user_id, 'session_type': 'avatar_conversation', 'language': rng.choice(['es', 'fr']),
+             'duration': rng.choice([0, rng.randrange(60, 900)]), 'data': {'topic': f'topic {s}'},
+             'timestamp': recent()}
+            for s in range(200)
+        ])
+        # Daily activity for the last 12 days, then scattered events
+        db.bulk_insert_mappings(Analytics, [
+            {'id': f'{user_id}-event-{e}', 'user_id': user_id, 'event_type': 'flashcard_review',
+             'event_data': {}, 'timestamp': now - timedelta(days=e % 12, minutes=e) if e < 600 else recent()}
+            for e in range(3000)
+        ])
+    db.commit()
+
+def main():
+    args = parse_args()
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'progress.db')}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = factory()
+        seed(db, args, rng)
+        db.close()
+
+        statements = []
+        event.listen(engine, 'before_cursor_execute', lambda conn, cursor, statement, *a: statements.append(statement))
+        service = DatabaseService(factory)
+        results = {}
+        print(f"{args.users} users x {args.reviews} reviews, {args.flashcards} flashcards each\n")
+        print(f"{'time range':<12}{'median ms':>11}{'max ms':>9}{'queries':>9}")
+        for time_range in TIME_RANGES:
+            latencies = []
+            queries = 0
+            for u in range(args.users):
+                user_id = f'heavy-{u}'
+                for _ in range(args.repeat):
+                    statements.clear()
+                    start = time.perf_counter()
+                    result = service.get_comprehensive_progress(user_id, time_range, 'es')
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    queries = len(statements)
+                    service.close_session()
+                results[f'{user_id}/{time_range}'] = result
+            print(f"{time_range:<12}{statistics.median(latencies):>11.1f}{max(latencies):>9.1f}{queries:>9}")
+        engine.dispose()
+
+    if args.dump:
+        with open(args.dump, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True, default=str)
+
+if __name__ == "__main__":
+    main()
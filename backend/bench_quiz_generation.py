@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark quiz question generation: one prompt per question versus one prompt per question kind.
+
+Generates the LLM part of a mixed quiz (3 grammar + 3 conversation
+questions) repeatedly in three modes and reports latency, LLM calls,
+prompt and response size, and output quality (valid generated questions,
+replacements, distinct questions):
+
+- sequential: one prompt per question, one call at a time (the original loop)
+- per_question: one prompt per question, calls fanned out concurrently
+- batch: one prompt per question kind returning a JSON array
+
+By default the local stub provider is used, with latency that grows with
+response length; pass --live to measure the configured provider instead
+(quality numbers are only meaningful with a real model).
+
+Usage:
+    python bench_quiz_generation.py [--quizzes 10] [--latency-ms 800] [--ms-per-char 1.5] [--live]
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+MODES = ('sequential', 'per_question', 'batch')
+PLAN = [('grammar', 3), ('conversation', 3)]
+LANGUAGES = ['es', 'fr', 'de', 'it', 'ja']
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--quizzes', type=int, default=10, help='Quizzes per mode')
+    parser.add_argument('--latency-ms', type=float, default=800, help='Stub latency per call')
+    parser.add_argument('--ms-per-char', type=float, default=1.5, help='Stub latency per response character')
+    parser.add_argument('--live', action='store_true', help='Use the configured LLM provider')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    if not args.live:
+        os.environ['LLM_PROVIDER'] = 'local'
+        os.environ['LOCAL_LLM_LATENCY_MS'] = str(args.latency_ms)
+        os.environ['LOCAL_LLM_LATENCY_JITTER_MS'] = '0'
+        os.environ['LOCAL_LLM_MS_PER_OUTPUT_CHAR'] = str(args.ms_per_char)
+    import logging
+    logging.disable(logging.WARNING)
+    import app as flask_app
+
+    traffic = {'prompt_chars': 0, 'response_chars': 0}
+    call_llm_api = flask_app.call_llm_api
+
+    def counting_call_llm_api(prompt, *call_args, **kwargs):
+        response_text = call_llm_api(prompt, *call_args, **kwargs)
+        traffic['prompt_chars'] += len(prompt)
+        traffic['response_chars'] += len(response_text or '')
+        return response_text
+
+    flask_app.call_llm_api = counting_call_llm_api
+    default_workers = flask_app.QUIZ_GENERATION_MAX_WORKERS
+    questions_per_quiz = sum(count for _, count in PLAN)
+
+    print(f"{args.quizzes} quizzes per mode, {questions_per_quiz} LLM questions each"
+          + ('' if args.live else f", stub latency {args.latency_ms:.0f}ms + {args.ms_per_char}ms/char") + "\n")
+    print(f"{'mode':<14}{'median ms':>11}{'p95 ms':>9}{'calls/quiz':>12}{'prompt chars':>14}"
+          f"{'response chars':>16}{'valid':>8}{'replaced':>10}{'distinct':>10}")
+    for mode in MODES:
+        flask_app.QUIZ_GENERATION_MODE = 'batch' if mode == 'batch' else 'per_question'
+        flask_app.QUIZ_GENERATION_MAX_WORKERS = 1 if mode == 'sequential' else default_workers
+        flask_app.recent_quiz_questions.clear()
+        for key in flask_app.quiz_generation_metrics:
+            flask_app.quiz_generation_metrics[key] = 0
+        traffic.update(prompt_chars=0, response_chars=0)
+
+        latencies = []
+        distinct = []
+        for i in range(args.quizzes):
+            language = LANGUAGES[i % len(LANGUAGES)]
+            start = time.perf_counter()
+            questions = flask_app.generate_llm_questions(PLAN, language, 'beginner')
+            latencies.append((time.perf_counter() - start) * 1000)
+            distinct.append(len({flask_app.quiz_question_key(question) for question in questions}))
+
+        metrics = flask_app.quiz_generation_metrics
+        total = args.quizzes * questions_per_quiz
+        replaced = metrics['replaced_from_cache'] + metrics['replaced_with_basic']
+        p95 = sorted(latencies)[max(int(len(latencies) * 0.95) - 1, 0)]
+        print(f"{mode:<14}{statistics.median(latencies):>11.0f}{p95:>9.0f}"
+              f"{metrics['llm_calls'] / args.quizzes:>12.1f}{traffic['prompt_chars'] / args.quizzes:>14.0f}"
+              f"{traffic['response_chars'] / args.quizzes:>16.0f}{metrics['generated'] / total:>8.0%}"
+              f"{replaced / total:>10.0%}{statistics.mean(distinct):>10.1f}")
+    os._exit(0)
+
+if __name__ == "__main__":
+    main()
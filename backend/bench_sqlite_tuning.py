@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark mixed read/write database throughput with default and tuned SQLite pragmas.
+
+Each mode gets a fresh database file seeded with users and flashcards.
+Concurrent workers then run for a fixed time, each operation standing in
+for one request (the session is released afterwards): reads list a
+user's flashcards, writes review a flashcard and track an analytics
+event, the two commits a flashcard review request makes. The script
+reports operations per second and read/write latency percentiles.
+
+- default: SQLite's own settings (rollback journal, synchronous=FULL)
+- tuned: the configured pragmas from config.py (WAL, synchronous=NORMAL, ...)
+
+Usage:
+    python bench_sqlite_tuning.py [--seconds 10] [--threads 8] [--write-ratio 0.3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, SQLITE_PRAGMAS, create_db_engine
+from db_service import DatabaseService
+
+USERS = 20
+FLASHCARDS_PER_USER = 50
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=10, help='Run time per mode')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent workers')
+    parser.add_argument('--write-ratio', type=float, default=0.3, help='Fraction of operations that write')
+    return parser.parse_args()
+
+def seed(service):
+    for u in range(USERS):
+        for f in range(FLASHCARDS_PER_USER):
+            service.save_flashcard(f'user-{u}', {
+                'id': f'card-{u}-{f}',
+                'translation': {'originalText': f'word {f}', 'translatedText': f'palabra {f}',
+                                'sourceLang': 'en', 'targetLang': 'es'}
+            })
+    service.close_session()
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[max(int(len(ordered) * fraction) - 1, 0)] * 1000 if ordered else 0.0
+
+def run_mode(pragmas, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", pragmas=pragmas)
+        Base.metadata.create_all(bind=engine)
+        service = DatabaseService(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+        seed(service)
+
+        reads, writes, errors = [], [], []
+        lock = threading.Lock()
+        stop_at = time.perf_counter() + args.seconds
+
+        def worker(n):
+            rng = random.Random(n)
+            local_reads, local_writes, local_errors = [], [], 0
+            while time.perf_counter() < stop_at:
+                u = rng.randrange(USERS)
+                start = time.perf_counter()
+                if rng.random() < args.write_ratio:
+                    ok = service.review_flashcard(f'user-{u}', f'card-{u}-{rng.randrange(FLASHCARDS_PER_USER)}',
+                                                  correct=rng.random() < 0.7)
+                    ok = service.track_event({'user_id': f'user-{u}', 'event_type': 'flashcard_review'}) and ok
+                    local_writes.append(time.perf_counter() - start)
+                else:
+                    ok = bool(service.get_flashcards(f'user-{u}', 'es'))
+                    local_reads.append(time.perf_counter() - start)
+                service.close_session()
+                local_errors += 0 if ok else 1
+            with lock:
+                reads.extend(local_reads)
+                writes.extend(local_writes)
+                errors.append(local_errors)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        engine.dispose()
+
+        return {
+            'ops_per_sec': (len(reads) + len(writes)) / args.seconds,
+            'reads_per_sec': len(reads) / args.seconds,
+            'writes_per_sec': len(writes) / args.seconds,
+            'read_p50': statistics.median(reads) * 1000 if reads else 0.0,
+            'read_p95': percentile(reads, 0.95),
+            'write_p50': statistics.median(writes) * 1000 if writes else 0.0,
+            'write_p95': percentile(writes, 0.95),
+            'errors': sum(errors)
+        }
+
+def main():
+    args = parse_args()
+    import logging
+    logging.disable(logging.WARNING)
+    print(f"{args.threads} workers, {args.seconds:g}s per mode, {args.write_ratio:.0%} writes")
+    print(f"tuned pragmas: {SQLITE_PRAGMAS}\n")
+    print(f"{'mode':<10}{'ops/s':>9}{'reads/s':>9}{'writes/s':>10}{'read p50':>10}{'read p95':>10}"
+          f"{'write p50':>11}{'write p95':>11}{'errors':>8}")
+    for mode, pragmas in (('default', None), ('tuned', SQLITE_PRAGMAS)):
+        r = run_mode(pragmas, args)
+        print(f"{mode:<10}{r['ops_per_sec']:>9.0f}{r['reads_per_sec']:>9.0f}{r['writes_per_sec']:>10.0f}"
+              f"{r['read_p50']:>10.1f}{r['read_p95']:>10.1f}{r['write_p50']:>11.1f}{r['write_p95']:>11.1f}"
+              f"{r['errors']:>8}")
+
+if __name__ == "__main__":
+    main()
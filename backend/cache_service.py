@@ -0,0 +1,457 @@
+# backend/cache_service.py
+"""
+In-memory response caching for translation and TTS results.
+
+This module provides a size-bounded LRU cache with per-cache TTL expiry.
+Both the number of entries and the estimated payload size are capped, so
+large values such as base64 encoded audio cannot grow the worker's memory
+without limit between requests.
+
+An optional SQLite-backed store can be attached as a second cache level.
+It lives on local disk, is shared by every worker process on the node and
+survives restarts and redeploys.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Cached values are JSON-serializable API responses, so the encoded JSON
+    length is a stable and cheap proxy for their size.
+
+    Args:
+        value: The value to measure
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+    except (TypeError, ValueError):
+        return len(repr(value).encode('utf-8'))
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a fixed time-to-live for every entry.
+
+    Entries are kept in two ordered maps:
+    - ``_entries`` in least-recently-used order, used for capacity eviction
+    - ``_expiry`` in insertion order, used for TTL eviction
+
+    Because every entry in a cache shares the same TTL, insertion order is
+    also expiry order, so expired entries are always at the front of
+    ``_expiry`` and can be dropped in O(1) each without scanning the cache.
+
+    If a ``backing_store`` is given, it acts as a second cache level: misses
+    fall through to it, hits are promoted back into memory, and every write
+    goes to both levels.
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 1000,
+                 max_bytes: int = 16 * 1024 * 1024,
+                 sizeof: Callable[[Any], int] = estimate_size,
+                 backing_store: Optional['SQLiteCacheStore'] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            name (str): Cache name used in logs and statistics
+            ttl (float): Time-to-live of each entry in seconds
+            max_entries (int): Maximum number of entries kept
+            max_bytes (int): Maximum total estimated size of all entries
+            sizeof (callable): Function returning the size of a value in bytes
+            backing_store (SQLiteCacheStore): Optional persistent second-level store
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self.backing_store = backing_store
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._expiry = OrderedDict()   # key -> expires_at
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'evictions': 0,
+            'expirations': 0,
+            'rejected': 0,
+            'l2_hits': 0
+        }
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value if present and not expired.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            The cached value, or ``default`` if missing or expired
+        """
+        with self._lock:
+            self._expire(time.time())
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[0]
+
+        if self.backing_store is not None:
+            value = self.backing_store.get(key)
+            if value is not None:
+                self._store(key, value)
+                with self._lock:
+                    self._stats['l2_hits'] += 1
+                return value
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return default
+
+    def set(self, key: Hashable, value: Any) -> bool:
+        """
+        Store a value, evicting expired and least-recently-used entries as needed.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+
+        Returns:
+            bool: True if the value was stored, False if it exceeds ``max_bytes`` on its own
+        """
+        if self.backing_store is not None:
+            self.backing_store.set(key, value)
+        return self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any) -> bool:
+        """Store a value in memory only"""
+        size = self._sizeof(value)
+        with self._lock:
+            now = time.time()
+            self._expire(now)
+            self._remove(key)
+
+            if size > self.max_bytes:
+                self._stats['rejected'] += 1
+                logger.debug(f"Cache '{self.name}' rejected entry of {size} bytes")
+                return False
+
+            self._entries[key] = (value, size)
+            self._expiry[key] = now + self.ttl
+            self._total_bytes += size
+            self._stats['sets'] += 1
+
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self._stats['evictions'] += 1
+            return True
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove an entry. Returns True if it was present in memory."""
+        if self.backing_store is not None:
+            self.backing_store.delete(key)
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._expiry.clear()
+            self._total_bytes = 0
+
+    def purge_expired(self) -> int:
+        """
+        Drop all expired entries.
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            return self._expire(time.time())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Entry count, size, limits and hit/miss/eviction counters
+        """
+        with self._lock:
+            hits = self._stats['hits'] + self._stats['l2_hits']
+            lookups = hits + self._stats['misses']
+            stats = {
+                'name': self.name,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+                **self._stats
+            }
+        if self.backing_store is not None:
+            stats['l2'] = self.backing_store.stats()
+        return stats
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            self._expire(time.time())
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _remove(self, key: Hashable) -> bool:
+        """Remove an entry without locking. Caller must hold ``_lock``."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._expiry.pop(key, None)
+        self._total_bytes -= entry[1]
+        return True
+
+    def _expire(self, now: float) -> int:
+        """Drop expired entries from the front of the expiry queue. Caller must hold ``_lock``."""
+        removed = 0
+        while self._expiry:
+            key, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                break
+            self._remove(key)
+            removed += 1
+        self._stats['expirations'] += removed
+        return removed
+
+class SQLiteCacheStore:
+    """
+    Persistent key/value cache stored in a local SQLite file.
+
+    The file is opened in WAL mode so that every worker process on the node
+    can read and write it concurrently. Entries carry their own expiry time
+    and last access time; ``compact()`` removes expired rows, trims the
+    least recently accessed rows down to the size limits and returns freed
+    pages to the filesystem. Compaction runs automatically from ``set()``
+    at most once per ``compact_interval`` seconds.
+
+    All failures are logged and treated as cache misses, so a locked or
+    corrupted cache file never fails the request that uses it.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int = 100000,
+                 max_bytes: int = 256 * 1024 * 1024, compact_interval: float = 300,
+                 busy_timeout: float = 2.0):
+        """
+        Initialize the store and create its table if needed.
+
+        Args:
+            path (str): Path of the SQLite database file
+            ttl (float): Time-to-live of each entry in seconds
+            max_entries (int): Maximum number of rows kept after compaction
+            max_bytes (int): Maximum total payload size kept after compaction
+            compact_interval (float): Minimum seconds between automatic compactions
+            busy_timeout (float): Seconds to wait for a lock held by another worker
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compact_interval = compact_interval
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._compact_lock = threading.Lock()
+        self._last_compact = time.time()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'errors': 0,
+            'compactions': 0
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS response_cache ('
+            'key TEXT PRIMARY KEY, '
+            'value TEXT NOT NULL, '
+            'size INTEGER NOT NULL, '
+            'expires_at REAL NOT NULL, '
+            'accessed_at REAL NOT NULL)'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_response_cache_expires ON response_cache (expires_at)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_response_cache_accessed ON response_cache (accessed_at)')
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            # auto_vacuum only takes effect before the first table is created
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        """
+        Get a cached value if present and not expired.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        try:
+            now = time.time()
+            conn = self._connection()
+            row = conn.execute(
+                'SELECT value FROM response_cache WHERE key = ? AND expires_at > ?',
+                (key, now)
+            ).fetchone()
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+            conn.execute('UPDATE response_cache SET accessed_at = ? WHERE key = ?', (now, key))
+            conn.commit()
+            self._stats['hits'] += 1
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            self._stats['errors'] += 1
+            logger.warning(f"Disk cache read failed for {self.path}: {e}")
+            return None
+
+    def set(self, key: str, value: Any) -> bool:
+        """
+        Store a value, replacing any previous entry for the key.
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value to cache
+
+        Returns:
+            bool: True if the value was written
+        """
+        try:
+            payload = json.dumps(value, ensure_ascii=False, default=str)
+            now = time.time()
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO response_cache (key, value, size, expires_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (key, payload, len(payload.encode('utf-8')), now + self.ttl, now)
+            )
+            conn.commit()
+            self._stats['sets'] += 1
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self._stats['errors'] += 1
+            logger.warning(f"Disk cache write failed for {self.path}: {e}")
+            return False
+
+        if now - self._last_compact >= self.compact_interval:
+            self.compact()
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry. Returns True if a row was deleted."""
+        try:
+            conn = self._connection()
+            cursor = conn.execute('DELETE FROM response_cache WHERE key = ?', (key,))
+            conn.commit()
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            self._stats['errors'] += 1
+            logger.warning(f"Disk cache delete failed for {self.path}: {e}")
+            return False
+
+    def compact(self) -> int:
+        """
+        Remove expired rows, trim to the size limits and reclaim free pages.
+
+        Rows are trimmed in least-recently-accessed order until both
+        ``max_entries`` and ``max_bytes`` hold.
+
+        Returns:
+            int: Number of rows removed
+        """
+        if not self._compact_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_compact = time.time()
+            conn = self._connection()
+            removed = conn.execute(
+                'DELETE FROM response_cache WHERE expires_at <= ?', (self._last_compact,)
+            ).rowcount
+            removed += conn.execute(
+                'DELETE FROM response_cache WHERE key IN ('
+                'SELECT key FROM (SELECT key, '
+                'ROW_NUMBER() OVER (ORDER BY accessed_at DESC) AS position, '
+                'SUM(size) OVER (ORDER BY accessed_at DESC ROWS UNBOUNDED PRECEDING) AS running_size '
+                'FROM response_cache) WHERE position > ? OR running_size > ?)',
+                (self.max_entries, self.max_bytes)
+            ).rowcount
+            conn.commit()
+            conn.execute('PRAGMA incremental_vacuum')
+            conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+            self._stats['compactions'] += 1
+            if removed:
+                logger.info(f"Disk cache compaction removed {removed} entries from {self.path}")
+            return removed
+        except sqlite3.Error as e:
+            self._stats['errors'] += 1
+            logger.warning(f"Disk cache compaction failed for {self.path}: {e}")
+            return 0
+        finally:
+            self._compact_lock.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics.
+
+        Returns:
+            dict: Row count, payload size, limits and hit/miss counters
+        """
+        stats = {
+            'path': self.path,
+            'ttl': self.ttl,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            **self._stats
+        }
+        try:
+            entries, total_bytes = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache'
+            ).fetchone()
+            stats['entries'] = entries
+            stats['bytes'] = total_bytes
+        except sqlite3.Error as e:
+            stats['error'] = str(e)
+        return stats
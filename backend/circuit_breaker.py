@@ -0,0 +1,226 @@
+# backend/circuit_breaker.py
+"""
+Circuit breaker and retry backoff for calls to the upstream LLM API.
+
+When the provider is failing, retrying every request with a fixed delay
+keeps request threads busy and adds load to a service that is already
+struggling. The breaker tracks the failure rate over a sliding window and,
+once it is exceeded, rejects calls immediately for a cool-down period
+before letting a limited number of trial calls through.
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt (int): Zero-based number of the attempt that just failed
+        base (float): Delay scale in seconds
+        cap (float): Maximum delay in seconds
+
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker with closed, open and half-open states.
+
+    Args:
+        name (str): Name used in logs and errors
+        failure_rate (float): Failure ratio in the window that opens the circuit
+        window (float): Length of the sliding outcome window in seconds
+        min_calls (int): Minimum calls in the window before the rate is evaluated
+        cooldown (float): Seconds the circuit stays open before a trial call
+        half_open_max_calls (int): Concurrent trial calls allowed when half-open
+    """
+
+    def __init__(self, name: str, failure_rate: float = 0.5, window: float = 60,
+                 min_calls: int = 5, cooldown: float = 30, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._outcomes = deque()  # (timestamp, succeeded)
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._rejected = 0
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the cool-down has passed"""
+        with self._lock:
+            self._refresh_state(time.monotonic())
+            return self._state
+
+    def check(self):
+        """
+        Fail fast without reserving a call.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+            if self._state == OPEN:
+                self._rejected += 1
+                raise CircuitOpenError(self.name, self._retry_after(now))
+
+    def allow(self):
+        """
+        Reserve permission for one call.
+
+        Every allowed call must be followed by record_success or record_failure.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all half-open trial slots are taken
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+            if self._state == OPEN:
+                self._rejected += 1
+                raise CircuitOpenError(self.name, self._retry_after(now))
+            if self._state == HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    self._rejected += 1
+                    raise CircuitOpenError(self.name, 0)
+                self._half_open_calls += 1
+
+    @contextmanager
+    def attempt(self):
+        """
+        Reserve one call and record its outcome when the block exits.
+
+        An exception counts as a failure. A call abandoned without one (a
+        stream closed early with GeneratorExit, an interrupt) releases its
+        reservation without recording an outcome, so a half-open trial slot
+        is never leaked.
+
+        Raises:
+            CircuitOpenError: If the circuit is open or all half-open trial slots are taken
+        """
+        self.allow()
+        try:
+            yield
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+
+    def release(self):
+        """Give back a reserved call without recording an outcome"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self):
+        """Record a successful call"""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                logger.info(f"Circuit '{self.name}' closed after successful trial call")
+                self._state = CLOSED
+                self._half_open_calls = 0
+                self._outcomes.clear()
+            self._add_outcome(time.monotonic(), True)
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if the failure rate is exceeded"""
+        with self._lock:
+            now = time.monotonic()
+            if self._state == HALF_OPEN:
+                logger.warning(f"Circuit '{self.name}' re-opened after failed trial call")
+                self._open(now)
+                return
+            self._add_outcome(now, False)
+            if self._state == CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+                if failures / len(self._outcomes) >= self.failure_rate:
+                    logger.warning(
+                        f"Circuit '{self.name}' opened: {failures}/{len(self._outcomes)} "
+                        f"calls failed in the last {self.window:.0f}s"
+                    )
+                    self._open(now)
+
+    def reset(self):
+        """Close the circuit and forget recorded outcomes"""
+        with self._lock:
+            self._state = CLOSED
+            self._outcomes.clear()
+            self._half_open_calls = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get breaker statistics.
+
+        Returns:
+            dict: State, window counts, rejections and remaining cool-down
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refresh_state(now)
+            self._trim(now)
+            failures = sum(1 for _, succeeded in self._outcomes if not succeeded)
+            return {
+                'name': self.name,
+                'state': self._state,
+                'window_calls': len(self._outcomes),
+                'window_failures': failures,
+                'rejected': self._rejected,
+                'times_opened': self._times_opened,
+                'retry_after': round(self._retry_after(now), 1) if self._state == OPEN else 0
+            }
+
+    def _open(self, now: float):
+        self._state = OPEN
+        self._opened_at = now
+        self._half_open_calls = 0
+        self._times_opened += 1
+
+    def _refresh_state(self, now: float):
+        if self._state == OPEN and now - self._opened_at >= self.cooldown:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+
+    def _retry_after(self, now: float) -> float:
+        return max(0.0, self.cooldown - (now - self._opened_at))
+
+    def _add_outcome(self, now: float, succeeded: bool):
+        self._outcomes.append((now, succeeded))
+        self._trim(now)
+
+    def _trim(self, now: float):
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
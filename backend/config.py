@@ -11,7 +11,9 @@ BASE_DIR = Path(__file__).resolve().parent
 # LLM Model Configuration - SINGLE SOURCE OF TRUTH
 # Change this to switch models throughout the entire application
 LLM_MODEL = "gemini-2.0-flash-exp"  # Direct Google AI Studio model name
-LLM_PROVIDER = "google_ai_studio"  # Changed from openrouter to google_ai_studio
+# Provider (LLM_PROVIDER): google_ai_studio (default), openrouter, local (deterministic stub
+# for load tests, no network) or replay (serves responses recorded to LLM_REPLAY_PATH)
+LLM_PROVIDER = os.getenv('LLM_PROVIDER', "google_ai_studio")
 LLM_MAX_TOKENS = 4000
 LLM_TEMPERATURE = 0.7
 
@@ -23,6 +25,68 @@ GOOGLE_AI_STUDIO_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/mo
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
 
+# Local stub provider (LLM_PROVIDER=local): simulated latency in ms and failure rates (0-1)
+LOCAL_LLM_LATENCY_MS = float(os.getenv('LOCAL_LLM_LATENCY_MS', 200))
+LOCAL_LLM_LATENCY_JITTER_MS = float(os.getenv('LOCAL_LLM_LATENCY_JITTER_MS', 50))
+LOCAL_LLM_ERROR_RATE = float(os.getenv('LOCAL_LLM_ERROR_RATE', 0))
+LOCAL_LLM_TIMEOUT_RATE = float(os.getenv('LOCAL_LLM_TIMEOUT_RATE', 0))
+LOCAL_LLM_MALFORMED_RATE = float(os.getenv('LOCAL_LLM_MALFORMED_RATE', 0))
+LOCAL_LLM_SEED = int(os.getenv('LOCAL_LLM_SEED', 0))
+LOCAL_LLM_MS_PER_OUTPUT_CHAR = float(os.getenv('LOCAL_LLM_MS_PER_OUTPUT_CHAR', 0))
+
+# LLM traffic recording: append every provider call to this JSON Lines file (empty = off)
+LLM_RECORD_PATH = os.getenv('LLM_RECORD_PATH', '')
+LLM_RECORD_PROMPTS = os.getenv('LLM_RECORD_PROMPTS', 'true').lower() == 'true'
+# Replay provider (LLM_PROVIDER=replay): recording to serve, latency multiplier (0 = instant)
+# and what to do with unrecorded prompts ('error' or 'local' for the stub)
+LLM_REPLAY_PATH = os.getenv('LLM_REPLAY_PATH', '')
+LLM_REPLAY_LATENCY_SCALE = float(os.getenv('LLM_REPLAY_LATENCY_SCALE', 1.0))
+LLM_REPLAY_MISS = os.getenv('LLM_REPLAY_MISS', 'error')
+
+# Outbound HTTP settings for LLM API calls (pooled keep-alive session per process)
+LLM_HTTP_POOL_SIZE = int(os.getenv('LLM_HTTP_POOL_SIZE', 20))
+LLM_HTTP_CONNECT_TIMEOUT = float(os.getenv('LLM_HTTP_CONNECT_TIMEOUT', 5))
+LLM_HTTP_READ_TIMEOUT = float(os.getenv('LLM_HTTP_READ_TIMEOUT', 30))
+
+# LLM circuit breaker and retry backoff (seconds)
+LLM_BREAKER_FAILURE_RATE = float(os.getenv('LLM_BREAKER_FAILURE_RATE', 0.5))
+LLM_BREAKER_WINDOW = float(os.getenv('LLM_BREAKER_WINDOW', 60))
+LLM_BREAKER_MIN_CALLS = int(os.getenv('LLM_BREAKER_MIN_CALLS', 5))
+LLM_BREAKER_COOLDOWN = float(os.getenv('LLM_BREAKER_COOLDOWN', 30))
+LLM_BREAKER_HALF_OPEN_CALLS = int(os.getenv('LLM_BREAKER_HALF_OPEN_CALLS', 1))
+LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', 0.5))
+LLM_RETRY_MAX_DELAY = float(os.getenv('LLM_RETRY_MAX_DELAY', 8))
+# Longest backoff slept on the request thread; retries that would wait longer fail fast instead
+LLM_RETRY_INLINE_MAX_DELAY = float(os.getenv('LLM_RETRY_INLINE_MAX_DELAY', 1))
+
+# LLM admission control: concurrent upstream calls and per-priority queues (queue limits in
+# waiting callers, queue timeouts in seconds). Background (quiz generation) calls are also
+# capped in flight so they always leave slots for interactive requests.
+LLM_MAX_IN_FLIGHT = int(os.getenv('LLM_MAX_IN_FLIGHT', 8))
+LLM_BACKGROUND_MAX_IN_FLIGHT = int(os.getenv('LLM_BACKGROUND_MAX_IN_FLIGHT', 4))
+LLM_INTERACTIVE_QUEUE_LIMIT = int(os.getenv('LLM_INTERACTIVE_QUEUE_LIMIT', 64))
+LLM_INTERACTIVE_QUEUE_TIMEOUT = float(os.getenv('LLM_INTERACTIVE_QUEUE_TIMEOUT', 10))
+LLM_BACKGROUND_QUEUE_LIMIT = int(os.getenv('LLM_BACKGROUND_QUEUE_LIMIT', 32))
+LLM_BACKGROUND_QUEUE_TIMEOUT = float(os.getenv('LLM_BACKGROUND_QUEUE_TIMEOUT', 30))
+
+# Quiz question generation: 'batch' asks for all questions of a kind in one prompt,
+# 'per_question' sends one prompt per question
+QUIZ_GENERATION_MODE = os.getenv('QUIZ_GENERATION_MODE', 'batch')
+
+# Persistent quiz question pool (empty path disables it). A background refill of
+# QUIZ_POOL_REFILL_BATCH questions is queued when a user has fewer than
+# QUIZ_POOL_LOW_WATER unseen questions left for a (language, difficulty, type).
+QUIZ_POOL_PATH = os.getenv('QUIZ_POOL_PATH', os.path.join('data', 'quiz_question_pool.db'))
+QUIZ_POOL_LOW_WATER = int(os.getenv('QUIZ_POOL_LOW_WATER', 10))
+QUIZ_POOL_REFILL_BATCH = int(os.getenv('QUIZ_POOL_REFILL_BATCH', 5))
+QUIZ_POOL_MAX_SIZE = int(os.getenv('QUIZ_POOL_MAX_SIZE', 200))
+
+# Request deadline budgets (seconds). Clients may send X-Request-Timeout up to the maximum.
+REQUEST_DEADLINE_DEFAULT = float(os.getenv('REQUEST_DEADLINE_DEFAULT', 30))
+REQUEST_DEADLINE_MAX = float(os.getenv('REQUEST_DEADLINE_MAX', 120))
+# Minimum remaining budget worth starting another LLM attempt (retry or fallback) for
+LLM_MIN_ATTEMPT_BUDGET = float(os.getenv('LLM_MIN_ATTEMPT_BUDGET', 2))
+
 # Google Cloud credentials path (optional - for TTS/STT only)
 GOOGLE_CREDENTIALS_PATH = os.getenv('GOOGLE_APPLICATION_CREDENTIALS', 'path/to/your/credentials.json')
 if GOOGLE_CREDENTIALS_PATH and GOOGLE_CREDENTIALS_PATH != 'path/to/your/credentials.json':
@@ -31,6 +95,42 @@ if GOOGLE_CREDENTIALS_PATH and GOOGLE_CREDENTIALS_PATH != 'path/to/your/credenti
         GOOGLE_CREDENTIALS_PATH = str(BASE_DIR / GOOGLE_CREDENTIALS_PATH)
         os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = GOOGLE_CREDENTIALS_PATH
 
+# Response cache configuration (TTL in seconds, size limits per worker process)
+TRANSLATION_CACHE_TTL = int(os.getenv('TRANSLATION_CACHE_TTL', 300))
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv('TRANSLATION_CACHE_MAX_ENTRIES', 5000))
+TRANSLATION_CACHE_MAX_BYTES = int(os.getenv('TRANSLATION_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+TTS_CACHE_TTL = int(os.getenv('TTS_CACHE_TTL', 300))
+TTS_CACHE_MAX_ENTRIES = int(os.getenv('TTS_CACHE_MAX_ENTRIES', 500))
+TTS_CACHE_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# Optional on-disk translation cache shared by all workers on a node (disabled when path is empty)
+TRANSLATION_DISK_CACHE_PATH = os.getenv('TRANSLATION_DISK_CACHE_PATH', '')
+TRANSLATION_DISK_CACHE_TTL = int(os.getenv('TRANSLATION_DISK_CACHE_TTL', 7 * 24 * 3600))
+TRANSLATION_DISK_CACHE_MAX_ENTRIES = int(os.getenv('TRANSLATION_DISK_CACHE_MAX_ENTRIES', 100000))
+TRANSLATION_DISK_CACHE_MAX_BYTES = int(os.getenv('TRANSLATION_DISK_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Database connection pool (pool size settings are ignored for in-memory SQLite)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 30))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+# Seconds between rebuilds of the in-memory word-of-day id index (picks up words added by other processes)
+WORD_INDEX_REFRESH_INTERVAL = float(os.getenv('WORD_INDEX_REFRESH_INTERVAL', 300))
+
+# IANA time zone whose midnight starts a new word of the day (empty = server local time)
+WORD_OF_DAY_TIMEZONE = os.getenv('WORD_OF_DAY_TIMEZONE', '')
+
+# SQLite tuning applied to every connection (see sqlite_tuning.py)
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))
+SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024))  # negative = KiB
+SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_WAL_CHECKPOINT_INTERVAL = float(os.getenv('SQLITE_WAL_CHECKPOINT_INTERVAL', 300))  # 0 disables
+SQLITE_WAL_CHECKPOINT_MODE = os.getenv('SQLITE_WAL_CHECKPOINT_MODE', 'PASSIVE')
+
 # Flask configuration
 FLASK_ENV = os.getenv('FLASK_ENV', 'development')
 DEBUG = FLASK_ENV == 'development'
@@ -53,6 +153,15 @@ def get_llm_config():
             "api_key": GEMINI_API_KEY,
             "base_url": GOOGLE_AI_STUDIO_BASE_URL
         }
+    elif LLM_PROVIDER in ("local", "replay"):
+        return {
+            "model": "local-stub" if LLM_PROVIDER == "local" else "replay",
+            "provider": LLM_PROVIDER,
+            "max_tokens": LLM_MAX_TOKENS,
+            "temperature": LLM_TEMPERATURE,
+            "api_key": None,
+            "base_url": None
+        }
     else:  # openrouter fallback
         return {
             "model": LLM_MODEL,
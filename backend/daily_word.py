@@ -0,0 +1,161 @@
+# backend/daily_word.py
+"""
+Deterministic word of the day, published once per day per language.
+
+The word for a (date, language) is chosen by hashing the date and the
+language into the language's word ids, so every worker agrees on it and
+it stays the same all day. DailyWordPublisher keeps the serialized
+response for each language with a strong ETag, and a scheduler thread
+materializes the next day's words right after local midnight. Responses
+can be cached by clients and CDNs until the next local midnight.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds after midnight before the scheduler materializes the new day
+MIDNIGHT_GRACE = 1.0
+
+def daily_choice_index(day: date, language: str, count: int) -> int:
+    """Index of the day's word among ``count`` words (ids in ascending order)"""
+    digest = hashlib.sha256(f"{day.isoformat()}:{language}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count
+
+class DailyWordResponse:
+    """A serialized daily word response and its caching metadata"""
+
+    def __init__(self, language: str, day: date, body: bytes, expires_at: float):
+        self.language = language
+        self.day = day
+        self.body = body
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.expires_at = expires_at
+
+    def max_age(self, now: Optional[float] = None) -> int:
+        """Seconds until the response expires at local midnight"""
+        return max(0, int(self.expires_at - (time.time() if now is None else now)))
+
+class DailyWordPublisher:
+    """Serves each language's word of the day from a precomputed response"""
+
+    def __init__(self, load: Callable[[str, date], Optional[Dict[str, Any]]],
+                 languages: Callable[[], Iterable[str]], tz=None,
+                 cleanup: Optional[Callable[[], None]] = None):
+        """
+        Initialize the publisher. Call start() to run the midnight scheduler.
+
+        Args:
+            load (callable): load(language, day) -> word dict, or None if the
+                language has no words
+            languages (callable): Languages to materialize each day
+            tz (tzinfo): Time zone whose midnight starts a new day; None
+                uses the server's local time
+            cleanup (callable): Called after each background run (e.g. to
+                release the thread's database session)
+        """
+        self.load = load
+        self.languages = languages
+        self.tz = tz
+        self.cleanup = cleanup
+        self._lock = threading.Lock()
+        self._responses = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {'hits': 0, 'misses': 0, 'materialized': 0, 'scheduled_runs': 0, 'errors': 0}
+
+    def now(self) -> datetime:
+        return datetime.now(self.tz)
+
+    def next_midnight(self, now: Optional[datetime] = None) -> float:
+        """Timestamp of the next local midnight"""
+        now = now or self.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), tzinfo=now.tzinfo)
+        return midnight.timestamp()
+
+    def materialize(self, language: str, now: Optional[datetime] = None) -> Optional[DailyWordResponse]:
+        """Build (or rebuild) the day's response for a language"""
+        now = now or self.now()
+        day = now.date()
+        word = self.load(language, day)
+        if not word:
+            return None
+        body = json.dumps({**word, 'date': day.isoformat()}, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        response = DailyWordResponse(language, day, body, self.next_midnight(now))
+        with self._lock:
+            self._responses[language] = response
+            self._stats['materialized'] += 1
+        return response
+
+    def get(self, language: str) -> Optional[DailyWordResponse]:
+        """The day's response for a language, materializing it if needed"""
+        now = self.now()
+        with self._lock:
+            response = self._responses.get(language)
+            if response is not None and response.day == now.date():
+                self._stats['hits'] += 1
+                return response
+            self._stats['misses'] += 1
+        return self.materialize(language, now)
+
+    def materialize_all(self) -> int:
+        """Materialize every language's word for today"""
+        count = 0
+        for language in self.languages():
+            try:
+                if self.materialize(language):
+                    count += 1
+            except Exception as e:
+                logger.error(f"Failed to materialize word of the day for {language}: {e}")
+                with self._lock:
+                    self._stats['errors'] += 1
+        return count
+
+    def start(self) -> bool:
+        """
+        Start the scheduler that materializes all languages after each local midnight.
+
+        Returns:
+            bool: False if it was already running
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='daily-word-scheduler', daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop the scheduler and wait for it to exit"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _run(self):
+        while not self._stop.wait(max(0.0, self.next_midnight() - time.time()) + MIDNIGHT_GRACE):
+            try:
+                count = self.materialize_all()
+                logger.info(f"Materialized word of the day for {count} languages")
+            finally:
+                with self._lock:
+                    self._stats['scheduled_runs'] += 1
+                if self.cleanup:
+                    self.cleanup()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the languages currently published"""
+        with self._lock:
+            return {
+                **self._stats,
+                'languages': sorted(self._responses),
+                'running': self._thread is not None
+            }
@@ -4,61 +4,183 @@ Database service layer for SQLite operations
 
 import uuid
 import random
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy import func, desc, and_, or_, case
+from sqlalchemy.exc import IntegrityError
 
+from config import WORD_INDEX_REFRESH_INTERVAL
+from daily_word import daily_choice_index
+from request_deadline import raise_if_refused
 from models import (
-    get_db_session, User, WordOfDay, CommonPhrase, Flashcard, FlashcardReview,
-    QuizScore, Quiz, PracticeSession, UserPreference, Analytics
+    SessionLocal, User, WordOfDay, DailyWord, CommonPhrase, Flashcard, FlashcardReview,
+    QuizScore, Quiz, QuizAnswer, PracticeSession, UserPreference, Analytics
 )
 
+class QuizAnswerConflict(Exception):
+    """Raised when a quiz answer loses a race: the question was answered or the quiz completed concurrently"""
+
+class WordIdIndex:
+    """
+    In-memory index of WordOfDay ids per (language, difficulty).
+    
+    A random pick chooses an id here and loads that one row by primary key
+    instead of loading every word for the language. Words added through
+    add_word_of_day are appended directly; the index is also rebuilt every
+    ``refresh_interval`` seconds to pick up words written by other processes
+    (e.g. populate_multilingual_words.py or another worker).
+    """
+    
+    def __init__(self, refresh_interval: float = 300):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._ids = None
+        self._built_at = 0.0
+    
+    def _build(self, db: Session):
+        ids = {}
+        for word_id, language, difficulty in db.query(WordOfDay.id, WordOfDay.language, WordOfDay.difficulty):
+            ids.setdefault((language, None), []).append(word_id)
+            ids.setdefault((language, difficulty), []).append(word_id)
+        self._ids = ids
+        self._built_at = time.monotonic()
+    
+    def ids(self, db: Session, language: str, difficulty: str = None) -> List[int]:
+        """Word ids for a language, optionally limited to one difficulty"""
+        with self._lock:
+            if self._ids is None or time.monotonic() - self._built_at > self.refresh_interval:
+                self._build(db)
+            return self._ids.get((language, difficulty), [])
+    
+    def add(self, language: str, difficulty: str, word_id: int):
+        """Record a newly inserted word"""
+        with self._lock:
+            if self._ids is not None:
+                self._ids.setdefault((language, None), []).append(word_id)
+                self._ids.setdefault((language, difficulty), []).append(word_id)
+    
+    def invalidate(self):
+        """Rebuild the index on next use"""
+        with self._lock:
+            self._ids = None
+
 class DatabaseService:
     """Service class for database operations"""
     
-    def __init__(self):
-        self.db = None
+    def __init__(self, session_factory: sessionmaker = SessionLocal, word_index_refresh: float = WORD_INDEX_REFRESH_INTERVAL):
+        # One session per thread; the Flask app removes it when each request ends
+        self.Session = scoped_session(session_factory)
+        self.word_index = WordIdIndex(word_index_refresh)
     
     def get_session(self) -> Session:
-        """Get database session"""
-        if not self.db:
-            self.db = get_db_session()
-        return self.db
+        """Get the current thread's database session"""
+        return self.Session()
     
     def close_session(self):
-        """Close database session"""
-        if self.db:
-            self.db.close()
-            self.db = None
+        """Close and discard the current thread's session, returning its connection to the pool"""
+        self.Session.remove()
     
     # Word of Day operations
+    def _random_word(self, db: Session, language: str, difficulty: str = None) -> Optional[WordOfDay]:
+        """Load one random word by primary key, using the word id index"""
+        for _ in range(2):
+            ids = self.word_index.ids(db, language, difficulty)
+            if not ids:
+                return None
+            word = db.get(WordOfDay, random.choice(ids))
+            if word:
+                return word
+            # The word was deleted by another process; rebuild and retry once
+            self.word_index.invalidate()
+        return None
+    
+    def _word_of_day_dict(self, word: WordOfDay) -> Dict:
+        return {
+            'word': word.word,
+            'translation': word.translation,
+            'pronunciation': word.pronunciation,
+            'part_of_speech': word.part_of_speech,
+            'difficulty': word.difficulty,
+            'example_sentence': word.example_sentence,
+            'example_translation': word.example_translation,
+            'etymology': word.etymology,
+            'related_words': word.related_words,
+            'cultural_note': word.cultural_note
+        }
+    
     def get_word_of_day(self, language: str) -> Optional[Dict]:
         """Get a random word of the day for the specified language"""
         try:
             db = self.get_session()
-            words = db.query(WordOfDay).filter(WordOfDay.language == language).all()
+            word = self._random_word(db, language)
             
-            if not words:
+            if not word:
                 return None
             
-            word = random.choice(words)
-            return {
-                'word': word.word,
-                'translation': word.translation,
-                'pronunciation': word.pronunciation,
-                'part_of_speech': word.part_of_speech,
-                'difficulty': word.difficulty,
-                'example_sentence': word.example_sentence,
-                'example_translation': word.example_translation,
-                'etymology': word.etymology,
-                'related_words': word.related_words,
-                'cultural_note': word.cultural_note
-            }
+            return self._word_of_day_dict(word)
         except Exception as e:
             print(f"Error getting word of day: {e}")
+            raise_if_refused()
             return None
     
+    def get_daily_word(self, language: str, day: date) -> Optional[Dict]:
+        """
+        Get the word of the day for a language and date.
+        
+        The first call for a day picks the word deterministically from the
+        date and language and stores the choice, so every worker serves the
+        same word all day even if words are added in the meantime.
+        """
+        try:
+            db = self.get_session()
+            daily = db.get(DailyWord, (day, language))
+            word = db.get(WordOfDay, daily.word_id) if daily else None
+            if word:
+                return self._word_of_day_dict(word)
+            
+            for _ in range(2):
+                ids = sorted(self.word_index.ids(db, language))
+                if not ids:
+                    return None
+                word = db.get(WordOfDay, ids[daily_choice_index(day, language, len(ids))])
+                if word:
+                    break
+                self.word_index.invalidate()
+            if not word:
+                return None
+            
+            if daily:
+                daily.word_id = word.id
+            else:
+                db.add(DailyWord(day=day, language=language, word_id=word.id, created_at=datetime.now()))
+            try:
+                db.commit()
+            except IntegrityError:
+                # Another worker stored the day's word first; serve theirs
+                db.rollback()
+                daily = db.get(DailyWord, (day, language))
+                word = db.get(WordOfDay, daily.word_id) if daily else word
+            return self._word_of_day_dict(word)
+        except Exception as e:
+            print(f"Error getting daily word: {e}")
+            if db:
+                db.rollback()
+            raise_if_refused()
+            return None
+    
+    def get_word_languages(self) -> List[str]:
+        """Languages that have at least one word of the day"""
+        try:
+            db = self.get_session()
+            return [language for (language,) in db.query(WordOfDay.language).distinct().order_by(WordOfDay.language)]
+        except Exception as e:
+            print(f"Error getting word languages: {e}")
+            raise_if_refused()
+            return []
+    
     def add_word_of_day(self, language: str, word_data: Dict) -> bool:
         """Add a new word of the day"""
         try:
@@ -78,6 +200,7 @@ class DatabaseService:
             )
             db.add(word)
             db.commit()
+            self.word_index.add(word.language, word.difficulty, word.id)
             return True
         except Exception as e:
             print(f"Error adding word of day: {e}")
@@ -108,6 +231,7 @@ class DatabaseService:
             } for phrase in phrases]
         except Exception as e:
             print(f"Error getting common phrases: {e}")
+            raise_if_refused()
             return []
     
     def add_common_phrase(self, language: str, phrase_data: Dict) -> bool:
@@ -190,6 +314,7 @@ class DatabaseService:
             } for flashcard in flashcards]
         except Exception as e:
             print(f"Error getting flashcards: {e}")
+            raise_if_refused()
             return []
     
     def save_flashcard(self, user_id: str, flashcard_data: Dict) -> bool:
@@ -278,6 +403,10 @@ class DatabaseService:
                 timestamp=datetime.now()
             )
             db.add(review)
+            # Writing the review takes the write lock; re-read the card under it so
+            # concurrent reviews of the same card never lose an update
+            db.flush()
+            db.refresh(flashcard, with_for_update=True)
             
             # Update flashcard stats
             flashcard.review_count += 1
@@ -293,7 +422,7 @@ class DatabaseService:
             # Update mastery level and next review (spaced repetition)
             if correct:
                 flashcard.mastery_level = min(flashcard.mastery_level + 1, 5)
-                days_to_add = [1, 3, 7, 14, 30][flashcard.mastery_level]
+                days_to_add = [1, 3, 7, 14, 30][min(flashcard.mastery_level, 4)]
             else:
                 flashcard.mastery_level = max(flashcard.mastery_level - 1, 0)
                 days_to_add = 1
@@ -336,6 +465,157 @@ class DatabaseService:
                 db.rollback()
             return False
     
+    def create_quiz(self, user_id: str, quiz_id: str, language: str, difficulty: str,
+                    quiz_type: str, questions: List[Dict]) -> bool:
+        """Store a newly generated quiz"""
+        try:
+            self.ensure_user_exists(user_id)
+            db = self.get_session()
+            
+            db.add(Quiz(
+                id=quiz_id,
+                user_id=user_id,
+                language=language,
+                quiz_type=quiz_type,
+                difficulty=difficulty,
+                questions=questions,
+                started_at=datetime.now(),
+                is_completed=False
+            ))
+            db.commit()
+            return True
+        except Exception as e:
+            print(f"Error creating quiz: {e}")
+            if db:
+                db.rollback()
+            return False
+    
+    def get_quiz(self, user_id: str, quiz_id: str) -> Optional[Dict]:
+        """Get a user's quiz with the indexes of the questions already answered"""
+        try:
+            db = self.get_session()
+            quiz = db.query(Quiz).filter(and_(Quiz.id == quiz_id, Quiz.user_id == user_id)).first()
+            
+            if not quiz:
+                return None
+            
+            answered = db.query(QuizAnswer.question_index).filter(QuizAnswer.quiz_id == quiz_id).all()
+            return {
+                'quiz_id': quiz.id,
+                'language': quiz.language,
+                'difficulty': quiz.difficulty,
+                'quiz_type': quiz.quiz_type,
+                'questions': quiz.questions or [],
+                'answered': sorted(row.question_index for row in answered),
+                'completed': bool(quiz.is_completed),
+                'started_at': quiz.started_at.isoformat() if quiz.started_at else None,
+                'completed_at': quiz.completed_at.isoformat() if quiz.completed_at else None
+            }
+        except Exception as e:
+            print(f"Error getting quiz: {e}")
+            raise_if_refused()
+            return None
+    
+    def record_quiz_answer(self, user_id: str, quiz_id: str, question_index: int, user_answer: str,
+                           correct: bool, points_earned: int) -> Optional[Dict]:
+        """Record one graded answer; see record_quiz_answers"""
+        return self.record_quiz_answers(user_id, quiz_id, [{
+            'question_index': question_index,
+            'user_answer': user_answer,
+            'correct': correct,
+            'points_earned': points_earned
+        }])
+    
+    def record_quiz_answers(self, user_id: str, quiz_id: str, graded_answers: List[Dict]) -> Optional[Dict]:
+        """
+        Record graded answers and complete the quiz once every question is answered.
+        
+        Each answer is its own row, so a submission never rewrites the quiz.
+        All answers, and completing the quiz with its score, are saved in a
+        single transaction.
+        
+        Args:
+            graded_answers (list): Dicts with question_index, user_answer,
+                correct and points_earned
+        
+        Returns:
+            dict: Running total score and whether the quiz is now completed,
+            or None if the quiz is missing or the answers could not be saved
+        
+        Raises:
+            QuizAnswerConflict: If a question was already answered or the quiz
+                already completed, e.g. by a concurrent submission
+        """
+        try:
+            db = self.get_session()
+            quiz = db.query(Quiz).filter(and_(Quiz.id == quiz_id, Quiz.user_id == user_id)).first()
+            
+            if not quiz:
+                return None
+            if quiz.is_completed:
+                db.rollback()
+                raise QuizAnswerConflict('Quiz already completed')
+            
+            now = datetime.now()
+            db.add_all([QuizAnswer(
+                quiz_id=quiz_id,
+                question_index=answer['question_index'],
+                user_answer=answer['user_answer'],
+                correct=answer['correct'],
+                points_earned=answer['points_earned'],
+                answered_at=now
+            ) for answer in graded_answers])
+            db.flush()
+            
+            answered, total_score, correct_answers = db.query(
+                func.count(QuizAnswer.id),
+                func.coalesce(func.sum(QuizAnswer.points_earned), 0),
+                func.coalesce(func.sum(case((QuizAnswer.correct == True, 1), else_=0)), 0)
+            ).filter(QuizAnswer.quiz_id == quiz_id).one()
+            
+            completed = answered >= len(quiz.questions or [])
+            # Conditional update so concurrent final answers save the score once
+            if completed and db.query(Quiz).filter(and_(Quiz.id == quiz_id, Quiz.is_completed == False)).update(
+                {Quiz.is_completed: True, Quiz.completed_at: datetime.now()}, synchronize_session=False
+            ):
+                answers = db.query(QuizAnswer).filter(QuizAnswer.quiz_id == quiz_id).order_by(QuizAnswer.question_index).all()
+                db.add(QuizScore(
+                    user_id=user_id,
+                    quiz_id=quiz_id,
+                    score=total_score,
+                    total_questions=len(quiz.questions or []),
+                    correct_answers=correct_answers,
+                    language=quiz.language,
+                    difficulty=quiz.difficulty or 'beginner',
+                    answers=[{
+                        'question_index': answer.question_index,
+                        'user_answer': answer.user_answer,
+                        'correct': answer.correct,
+                        'points_earned': answer.points_earned,
+                        'timestamp': answer.answered_at.isoformat()
+                    } for answer in answers],
+                    timestamp=datetime.now()
+                ))
+            
+            db.commit()
+            return {
+                'total_score': total_score,
+                'correct_answers': correct_answers,
+                'answered': answered,
+                'completed': completed
+            }
+        except QuizAnswerConflict:
+            raise
+        except IntegrityError:
+            # uq_quiz_answers_question: another request answered one of these questions first
+            db.rollback()
+            raise QuizAnswerConflict('Question already answered')
+        except Exception as e:
+            print(f"Error recording quiz answers: {e}")
+            if db:
+                db.rollback()
+            return None
+    
     def get_quiz_scores(self, user_id: str, language: str = None) -> List[Dict]:
         """Get user's quiz scores"""
         try:
@@ -359,6 +639,7 @@ class DatabaseService:
             } for score in scores]
         except Exception as e:
             print(f"Error getting quiz scores: {e}")
+            raise_if_refused()
             return []
     
     # User preferences operations
@@ -392,6 +673,7 @@ class DatabaseService:
             }
         except Exception as e:
             print(f"Error getting user preferences: {e}")
+            raise_if_refused()
             return {}
     
     def save_user_preferences(self, user_id: str, preferences: Dict) -> bool:
@@ -482,6 +764,7 @@ class DatabaseService:
             }
         except Exception as e:
             print(f"Error getting user progress: {e}")
+            raise_if_refused()
             return {}
     
     def get_user_progress_summary(self, user_id: str, time_range: str = 'all') -> Dict:
@@ -609,6 +892,7 @@ class DatabaseService:
             
         except Exception as e:
             print(f"Error getting user progress summary: {e}")
+            raise_if_refused()
             return {}
     
     def get_detailed_word(self, language: str, difficulty: str = None, category: str = None, search_term: str = None) -> Optional[Dict]:
@@ -641,11 +925,7 @@ class DatabaseService:
                 word = query.first()
             else:
                 # Get random word
-                words = query.all()
-                if words:
-                    word = random.choice(words)
-                else:
-                    word = None
+                word = self._random_word(db, language, difficulty if difficulty and difficulty != 'all' else None)
             
             if not word:
                 return None
@@ -675,143 +955,110 @@ class DatabaseService:
             
         except Exception as e:
             print(f"Error getting detailed word: {e}")
+            raise_if_refused()
             return None
     
     def get_comprehensive_progress(self, user_id: str, time_range: str = 'all', language: str = None) -> Dict:
         """Get comprehensive progress data for ProgressTracker component with enhanced calculations"""
         try:
             import math
-            from collections import defaultdict
-            self.ensure_user_exists(user_id)
             db = self.get_session()
+            self.ensure_user_exists(user_id)
+            now = datetime.now()
             
             # Calculate time filter based on time_range
             time_filter = None
             if time_range == 'week':
-                time_filter = datetime.now() - timedelta(days=7)
+                time_filter = now - timedelta(days=7)
             elif time_range == 'month':
-                time_filter = datetime.now() - timedelta(days=30)
+                time_filter = now - timedelta(days=30)
             
             # Get user preferences
             prefs = db.query(UserPreference).filter(UserPreference.user_id == user_id).first()
             daily_goal = prefs.daily_goal if prefs else 10
             
             # === Enhanced XP Calculation ===
-            
-            # 1. XP from Quiz Scores
-            quiz_xp_query = db.query(func.sum(QuizScore.score)).filter(QuizScore.user_id == user_id)
+            # Every figure below comes from a handful of aggregate queries; no
+            # per-row data is loaded into Python.
+            
+            # 1. XP from Quiz Scores, plus quiz stats (language-filtered)
+            in_language = QuizScore.language == language if language else True
+            quiz_query = db.query(
+                func.sum(QuizScore.score),
+                func.count(case((in_language, QuizScore.id))),
+                func.avg(case((in_language, QuizScore.score)))
+            ).filter(QuizScore.user_id == user_id)
             if time_filter:
-                quiz_xp_query = quiz_xp_query.filter(QuizScore.timestamp >= time_filter)
-            quiz_xp = quiz_xp_query.scalar() or 0
-            
-            # 2. XP from Flashcard Reviews (more sophisticated calculation)
-            flashcard_reviews_query = db.query(FlashcardReview).join(Flashcard).filter(
+                quiz_query = quiz_query.filter(QuizScore.timestamp >= time_filter)
+            quiz_xp, quizzes_completed, avg_quiz_score = quiz_query.one()
+            quiz_xp = quiz_xp or 0
+            avg_quiz_score = float(avg_quiz_score) if avg_quiz_score is not None else 0.0
+            
+            # 2. XP from Flashcard Reviews: 1 per review, 2 if correct, plus a
+            # bonus of twice the card's current mastery level for correct answers
+            review_xp = case(
+                (FlashcardReview.correct == True,
+                 2 + case((Flashcard.mastery_level >= 1, Flashcard.mastery_level * 2), else_=0)),
+                else_=1
+            )
+            flashcard_xp_query = db.query(func.sum(review_xp)).select_from(FlashcardReview).join(Flashcard).filter(
                 Flashcard.user_id == user_id
             )
             if time_filter:
-                flashcard_reviews_query = flashcard_reviews_query.filter(FlashcardReview.timestamp >= time_filter)
-            
-            flashcard_reviews = flashcard_reviews_query.all()
-            flashcard_xp = 0
-            for review in flashcard_reviews:
-                # Base XP for any review
-                base_xp = 2 if review.correct else 1
-                # Bonus XP for mastery progression (check if this review increased mastery level)
-                flashcard = review.flashcard
-                if review.correct and flashcard.mastery_level >= 1:
-                    # Additional XP based on current mastery level
-                    mastery_bonus = flashcard.mastery_level * 2
-                    base_xp += mastery_bonus
-                flashcard_xp += base_xp
-            
-            # 3. XP from Practice Sessions (conversations)
-            practice_xp_query = db.query(func.count(PracticeSession.id)).filter(
+                flashcard_xp_query = flashcard_xp_query.filter(FlashcardReview.timestamp >= time_filter)
+            flashcard_xp = flashcard_xp_query.scalar() or 0
+            
+            # 3. XP from Practice Sessions (conversations), plus conversation stats
+            in_language = PracticeSession.language == language if language else True
+            conversation_query = db.query(
+                func.count(PracticeSession.id),
+                func.count(case((in_language, PracticeSession.id))),
+                func.sum(case((in_language, PracticeSession.duration)))
+            ).filter(
                 and_(
                     PracticeSession.user_id == user_id,
                     PracticeSession.session_type == 'avatar_conversation'
                 )
             )
             if time_filter:
-                practice_xp_query = practice_xp_query.filter(PracticeSession.timestamp >= time_filter)
+                conversation_query = conversation_query.filter(PracticeSession.timestamp >= time_filter)
             
-            practice_sessions = practice_xp_query.scalar() or 0
+            practice_sessions, conversation_count, total_duration = conversation_query.one()
             practice_xp = practice_sessions * 15  # 15 XP per conversation session
+            avg_conversation_duration = total_duration / conversation_count if total_duration else 0
             
-            # 4. Bonus XP for streaks
+            # 4. Bonus XP for streaks within the period; the reported streak is the full one
+            period_streak, current_streak = self._calculate_streaks(user_id, time_filter)
             streak_bonus = 0
-            current_streak = self._calculate_streak(user_id, time_filter)
-            if current_streak >= 7:
-                streak_bonus = (current_streak // 7) * 50  # 50 XP per week of streak
+            if period_streak >= 7:
+                streak_bonus = (period_streak // 7) * 50  # 50 XP per week of streak
             
             total_xp = int(quiz_xp + flashcard_xp + practice_xp + streak_bonus)
             
             # === Level Calculation ===
             level = max(1, int(math.log2(total_xp/1000 + 1)) + 1)
             
-            # === Enhanced Streak Calculation ===
-            current_streak = self._calculate_streak(user_id, None)  # Calculate full streak, not filtered
-            
-            # === Words Learned (Enhanced) ===
-            words_learned_query = db.query(func.count(Flashcard.id)).filter(
-                and_(Flashcard.user_id == user_id, Flashcard.mastery_level >= 3)
-            )
-            if language:
-                words_learned_query = words_learned_query.filter(Flashcard.target_lang == language)
-            words_learned = words_learned_query.scalar() or 0
-            
-            # === Flashcard Stats (Enhanced) ===
-            flashcard_query = db.query(Flashcard).filter(Flashcard.user_id == user_id)
+            # === Words Learned and Flashcard Stats ===
+            # Words learned ignores the time range; the stats only cover cards created in it
+            in_range = Flashcard.created_at >= time_filter if time_filter else True
+            has_rate = and_(in_range, Flashcard.success_rate != 0)
+            flashcard_query = db.query(
+                func.count(case((Flashcard.mastery_level >= 3, Flashcard.id))),
+                func.count(case((in_range, Flashcard.id))),
+                func.count(case((and_(in_range, Flashcard.next_review <= now), Flashcard.id))),
+                func.count(case((and_(in_range, Flashcard.mastery_level >= 5), Flashcard.id))),
+                func.sum(case((has_rate, Flashcard.success_rate))),
+                func.count(case((has_rate, Flashcard.id)))
+            ).filter(Flashcard.user_id == user_id)
             if language:
                 flashcard_query = flashcard_query.filter(Flashcard.target_lang == language)
-            if time_filter:
-                flashcard_query = flashcard_query.filter(Flashcard.created_at >= time_filter)
-            
-            all_flashcards = flashcard_query.all()
-            total_flashcards = len(all_flashcards)
-            
-            due_for_review = len([f for f in all_flashcards if f.next_review and f.next_review <= datetime.now()])
-            mastered_flashcards = len([f for f in all_flashcards if f.mastery_level >= 5])
-            
-            avg_success_rate = 0.0
-            if all_flashcards:
-                total_rate = sum(f.success_rate for f in all_flashcards if f.success_rate)
-                avg_success_rate = total_rate / len([f for f in all_flashcards if f.success_rate])
-            
-            # === Quiz Stats (Enhanced) ===
-            quiz_query = db.query(QuizScore).filter(QuizScore.user_id == user_id)
-            if language:
-                quiz_query = quiz_query.filter(QuizScore.language == language)
-            if time_filter:
-                quiz_query = quiz_query.filter(QuizScore.timestamp >= time_filter)
-            
-            quiz_scores = quiz_query.all()
-            quizzes_completed = len(quiz_scores)
-            avg_quiz_score = 0.0
-            if quiz_scores:
-                avg_quiz_score = sum(q.score for q in quiz_scores) / len(quiz_scores)
-            
-            # === Conversation Stats (Enhanced) ===
-            conversation_query = db.query(PracticeSession).filter(
-                and_(
-                    PracticeSession.user_id == user_id,
-                    PracticeSession.session_type == 'avatar_conversation'
-                )
-            )
-            if language:
-                conversation_query = conversation_query.filter(PracticeSession.language == language)
-            if time_filter:
-                conversation_query = conversation_query.filter(PracticeSession.timestamp >= time_filter)
             
-            conversations = conversation_query.all()
-            conversation_count = len(conversations)
-            
-            avg_conversation_duration = 0
-            if conversations:
-                total_duration = sum(c.duration for c in conversations if c.duration)
-                avg_conversation_duration = total_duration / len(conversations) if total_duration else 0
+            (words_learned, total_flashcards, due_for_review, mastered_flashcards,
+             total_rate, rated_flashcards) = flashcard_query.one()
+            avg_success_rate = total_rate / rated_flashcards if rated_flashcards else 0.0
             
             # Get last conversation topic
-            last_conversation = db.query(PracticeSession).filter(
+            last_conversation = db.query(PracticeSession.data).filter(
                 and_(
                     PracticeSession.user_id == user_id,
                     PracticeSession.session_type == 'avatar_conversation'
@@ -824,7 +1071,7 @@ class DatabaseService:
             elif last_conversation:
                 last_topic = 'General Conversation'
             
-            # === Activity Data for Graphs (Placeholder) ===
+            # === Activity Data for Graphs ===
             activity_data = self._get_activity_data(user_id, time_filter)
             
             return {
@@ -859,15 +1106,50 @@ class DatabaseService:
             
         except Exception as e:
             print(f"Error getting comprehensive progress: {e}")
+            if db:
+                db.rollback()
+            raise_if_refused()
             return {}
     
-    def _calculate_streak(self, user_id: str, time_filter: datetime = None) -> int:
-        """Calculate current streak based on Analytics events and recent activity"""
+    @staticmethod
+    def _as_date(value) -> date:
+        """Normalize a SQL DATE() result (a string on SQLite) to a date"""
+        return date.fromisoformat(str(value))
+    
+    @staticmethod
+    def _consecutive_days(active_days, limit: int) -> int:
+        """Count consecutive active days from today backwards"""
+        current_date = datetime.now().date()
+        streak = 0
+        
+        while current_date in active_days:
+            streak += 1
+            current_date -= timedelta(days=1)
+            if streak > limit:  # Safety limit
+                break
+        
+        return streak
+    
+    def _calculate_streaks(self, user_id: str, time_filter: datetime = None) -> tuple:
+        """
+        Calculate the streak within a period and the full current streak.
+        
+        Both come from one query of active days (with each day's latest event)
+        based on Analytics events, falling back to recent flashcard reviews and
+        quiz activity when there are no events.
+        
+        Args:
+            user_id (str): User ID
+            time_filter (datetime): Start of the period, or None for all time
+            
+        Returns:
+            tuple: (period_streak, current_streak)
+        """
         try:
             db = self.get_session()
             
-            # Get analytics events for streak calculation
-            analytics_query = db.query(Analytics).filter(
+            event_day = func.date(Analytics.timestamp)
+            rows = db.query(event_day, func.max(Analytics.timestamp)).filter(
                 and_(
                     Analytics.user_id == user_id,
                     Analytics.event_type.in_([
@@ -877,86 +1159,55 @@ class DatabaseService:
                         'quiz_completed'
                     ])
                 )
-            ).order_by(desc(Analytics.timestamp))
-            
-            if time_filter:
-                analytics_query = analytics_query.filter(Analytics.timestamp >= time_filter)
-            
-            analytics_events = analytics_query.all()
-            
-            if not analytics_events:
-                # Fallback: calculate based on recent flashcard reviews and quiz activity
-                return self._calculate_streak_fallback(user_id)
+            ).group_by(event_day).all()
             
-            # Group events by date
-            daily_activity = defaultdict(bool)
-            for event in analytics_events:
-                date_key = event.timestamp.date()
-                daily_activity[date_key] = True
-            
-            # Calculate consecutive days from today backwards
-            current_date = datetime.now().date()
-            streak = 0
+            daily_activity = {self._as_date(day): latest for day, latest in rows}
+            period_activity = {
+                day for day, latest in daily_activity.items()
+                if time_filter is None or latest >= time_filter
+            }
             
-            while current_date in daily_activity:
-                streak += 1
-                current_date -= timedelta(days=1)
-                if streak > 365:  # Safety limit
-                    break
+            fallback = None
+            if not period_activity or not daily_activity:
+                fallback = self._calculate_streak_fallback(user_id)
             
-            return streak
+            period_streak = self._consecutive_days(period_activity, 365) if period_activity else fallback
+            current_streak = self._consecutive_days(daily_activity, 365) if daily_activity else fallback
+            return period_streak, current_streak
             
         except Exception as e:
             print(f"Error calculating streak: {e}")
-            return self._calculate_streak_fallback(user_id)
+            raise_if_refused()
+            streak = self._calculate_streak_fallback(user_id)
+            return streak, streak
     
     def _calculate_streak_fallback(self, user_id: str) -> int:
         """Fallback streak calculation based on flashcard reviews and quiz activity"""
         try:
             db = self.get_session()
+            since = datetime.now() - timedelta(days=30)
             
-            # Get recent activity dates from flashcard reviews
+            # Recent activity dates from flashcard reviews and quizzes, in one query
             recent_reviews = db.query(func.date(FlashcardReview.timestamp)).join(Flashcard).filter(
-                Flashcard.user_id == user_id
-            ).filter(
-                FlashcardReview.timestamp >= datetime.now() - timedelta(days=30)
-            ).distinct().all()
-            
-            # Get recent quiz dates
+                and_(Flashcard.user_id == user_id, FlashcardReview.timestamp >= since)
+            )
             recent_quizzes = db.query(func.date(QuizScore.timestamp)).filter(
-                QuizScore.user_id == user_id
-            ).filter(
-                QuizScore.timestamp >= datetime.now() - timedelta(days=30)
-            ).distinct().all()
-            
-            # Combine all activity dates
-            activity_dates = set()
-            for date_tuple in recent_reviews:
-                activity_dates.add(date_tuple[0])
-            for date_tuple in recent_quizzes:
-                activity_dates.add(date_tuple[0])
+                and_(QuizScore.user_id == user_id, QuizScore.timestamp >= since)
+            )
+            activity_dates = {self._as_date(day) for (day,) in recent_reviews.union(recent_quizzes).all()}
             
             if not activity_dates:
                 return 0
             
-            # Calculate streak from today backwards
-            current_date = datetime.now().date()
-            streak = 0
-            
-            while current_date in activity_dates:
-                streak += 1
-                current_date -= timedelta(days=1)
-                if streak > 30:  # Reasonable limit for fallback
-                    break
-            
-            return streak
+            return self._consecutive_days(activity_dates, 30)  # Reasonable limit for fallback
             
         except Exception as e:
             print(f"Error in streak fallback calculation: {e}")
+            raise_if_refused()
             return 0
     
     def _get_activity_data(self, user_id: str, time_filter: datetime = None) -> List[Dict]:
-        """Get activity data for graph visualization (placeholder implementation)"""
+        """Get daily review and quiz counts for graph visualization"""
         try:
             db = self.get_session()
             
@@ -965,33 +1216,37 @@ class DatabaseService:
             if time_filter is None:
                 time_filter = datetime.now() - timedelta(days=days_back)
             
-            activity_data = []
             current_date = time_filter.date()
             end_date = datetime.now().date()
+            range_start = datetime.combine(current_date, datetime.min.time())
+            range_end = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+            
+            # Count flashcard reviews per day
+            review_day = func.date(FlashcardReview.timestamp)
+            review_counts = db.query(review_day, func.count(FlashcardReview.id)).join(Flashcard).filter(
+                and_(
+                    Flashcard.user_id == user_id,
+                    FlashcardReview.timestamp >= range_start,
+                    FlashcardReview.timestamp < range_end
+                )
+            ).group_by(review_day).all()
+            reviews = {self._as_date(day): count for day, count in review_counts}
             
+            # Count quizzes per day
+            quiz_day = func.date(QuizScore.timestamp)
+            quiz_counts = db.query(quiz_day, func.count(QuizScore.id)).filter(
+                and_(
+                    QuizScore.user_id == user_id,
+                    QuizScore.timestamp >= range_start,
+                    QuizScore.timestamp < range_end
+                )
+            ).group_by(quiz_day).all()
+            quizzes = {self._as_date(day): count for day, count in quiz_counts}
+            
+            activity_data = []
             while current_date <= end_date:
-                # Count activities for this date
-                date_start = datetime.combine(current_date, datetime.min.time())
-                date_end = date_start + timedelta(days=1)
-                
-                # Count flashcard reviews
-                review_count = db.query(FlashcardReview).join(Flashcard).filter(
-                    and_(
-                        Flashcard.user_id == user_id,
-                        FlashcardReview.timestamp >= date_start,
-                        FlashcardReview.timestamp < date_end
-                    )
-                ).count()
-                
-                # Count quizzes
-                quiz_count = db.query(QuizScore).filter(
-                    and_(
-                        QuizScore.user_id == user_id,
-                        QuizScore.timestamp >= date_start,
-                        QuizScore.timestamp < date_end
-                    )
-                ).count()
-                
+                review_count = reviews.get(current_date, 0)
+                quiz_count = quizzes.get(current_date, 0)
                 activity_data.append({
                     'date': current_date.isoformat(),
                     'reviews': review_count,
@@ -1005,6 +1260,7 @@ class DatabaseService:
             
         except Exception as e:
             print(f"Error getting activity data: {e}")
+            raise_if_refused()
             return []
 
 # Global service instance
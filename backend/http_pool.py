@@ -0,0 +1,83 @@
+# backend/http_pool.py
+"""
+Pooled keep-alive HTTP sessions for outbound LLM API calls.
+
+Calling ``requests.post`` directly opens a new TCP (and TLS) connection for
+every request. This module keeps one ``requests.Session`` per process with
+a sized connection pool, so consecutive calls to the same host reuse an
+established connection.
+"""
+
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import LLM_HTTP_POOL_SIZE, LLM_HTTP_CONNECT_TIMEOUT, LLM_HTTP_READ_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+def create_http_session(pool_size: int = LLM_HTTP_POOL_SIZE) -> requests.Session:
+    """
+    Create a session with a keep-alive connection pool.
+
+    Args:
+        pool_size (int): Maximum number of connections kept open per host
+
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=False)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+def get_http_session() -> requests.Session:
+    """
+    Get the shared session for this process.
+
+    A new session is created after a fork so that worker processes never
+    share pooled sockets with their parent.
+
+    Returns:
+        requests.Session: The process-wide pooled session
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = create_http_session()
+                _session_pid = pid
+                logger.info(f"Created pooled HTTP session (pool size {LLM_HTTP_POOL_SIZE})")
+    return _session
+
+def get_http_timeout(read_timeout: Optional[float] = None) -> Tuple[float, float]:
+    """
+    Get the (connect, read) timeout tuple for LLM requests.
+
+    Args:
+        read_timeout (float): Optional override for the read timeout
+
+    Returns:
+        tuple: Connect and read timeouts in seconds
+    """
+    return (LLM_HTTP_CONNECT_TIMEOUT, read_timeout if read_timeout is not None else LLM_HTTP_READ_TIMEOUT)
+
+def close_http_session():
+    """Close the shared session and its pooled connections"""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _session_pid = None
@@ -0,0 +1,294 @@
+# backend/json_extractor.py
+"""
+Extraction of JSON generated by the LLM.
+
+The model returns one JSON object whose top-level keys are independent
+sections (e.g. "main_translation", "pronunciation", "grammar"), but often
+wraps it in a markdown code fence or in prose, adds trailing commas, or is
+cut off by the token limit. ``extract_json`` finds the outermost JSON value
+in one pass over the text and salvages the complete members of a damaged
+object (or the complete items of a damaged array), so callers do not need a
+second LLM call to recover.
+
+When the response is streamed, ``IncrementalObjectParser`` makes each
+section usable as soon as its value is complete instead of waiting for the
+whole object.
+"""
+
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+class JSONExtractionError(ValueError):
+    """Raised when no usable JSON value can be found in a response"""
+    pass
+
+_stats_lock = threading.Lock()
+_stats = {
+    'parsed': 0,     # outermost value parsed as-is
+    'salvaged': 0,   # object or array rebuilt from its complete members
+    'failed': 0
+}
+
+def _record(outcome: str):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+def extraction_stats() -> Dict[str, int]:
+    """
+    Get counts of extraction outcomes since startup.
+
+    Returns:
+        dict: parsed, salvaged and failed counts
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+class IncrementalObjectParser:
+    """
+    Parses the top-level members of a JSON object from a stream of text chunks.
+
+    Text before the opening ``{`` (such as a markdown code fence) is skipped.
+    The parser tracks string and nesting state across chunks, so every
+    character is scanned exactly once no matter how the text is split.
+    """
+
+    def __init__(self):
+        self._text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+        self.started = False
+        self.finished = False
+        self.members = {}
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of generated text.
+
+        Args:
+            chunk (str): Next piece of the model output
+
+        Returns:
+            list: (key, value) pairs for top-level members completed by this chunk
+        """
+        if self.finished or not chunk:
+            return []
+
+        self._text += chunk
+        completed = []
+        text = self._text
+        i = self._pos
+        while i < len(text):
+            char = text[i]
+            if not self.started:
+                if char == '{':
+                    self.started = True
+                    self._depth = 1
+                    self._member_start = i + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_member(text[self._member_start:i], completed)
+                    self.finished = True
+                    i += 1
+                    break
+            elif char == ',' and self._depth == 1:
+                self._complete_member(text[self._member_start:i], completed)
+                self._member_start = i + 1
+            i += 1
+        self._pos = i
+        return completed
+
+    def _complete_member(self, member_text: str, completed: List[Tuple[str, Any]]):
+        """Parse one ``"key": value`` member and record it"""
+        if not member_text.strip():
+            return
+        try:
+            member = json.loads('{' + member_text + '}')
+        except json.JSONDecodeError as e:
+            logger.debug(f"Skipping unparseable JSON member: {e}")
+            return
+        for key, value in member.items():
+            self.members[key] = value
+            completed.append((key, value))
+
+    @property
+    def text(self) -> str:
+        """All text fed so far"""
+        return self._text
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Get every member parsed so far.
+
+        Returns:
+            dict: Parsed top-level members
+        """
+        return dict(self.members)
+
+    def has_keys(self, keys: Iterable[str]) -> bool:
+        """Whether every key in ``keys`` has been parsed"""
+        return all(key in self.members for key in keys)
+
+# JSON strings (skipped whole) and brackets, matched in C rather than char by char
+_TOKEN_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+
+def _find_closing(text: str, start: int) -> int:
+    """
+    Find the end of the JSON value opening at ``start``.
+
+    Returns:
+        int: Index just past the matching bracket, or -1 if the text ends first
+    """
+    depth = 0
+    for match in _TOKEN_PATTERN.finditer(text, start):
+        token = match.group()
+        if token in '{[':
+            depth += 1
+        elif token in '}]':
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return -1
+
+def _salvage_array(candidate: str) -> List[Any]:
+    """Complete items of a damaged or truncated JSON array, in order"""
+    decoder = json.JSONDecoder()
+    items = []
+    pos = 1
+    while True:
+        while pos < len(candidate) and candidate[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(candidate) or candidate[pos] == ']':
+            return items
+        try:
+            value, pos = decoder.raw_decode(candidate, pos)
+        except json.JSONDecodeError:
+            return items
+        items.append(value)
+
+def _next_opening(text: str, start: int, openers: str) -> int:
+    """Index of the next character in ``openers`` at or after ``start``, or -1"""
+    positions = [p for p in (text.find(opener, start) for opener in openers) if p != -1]
+    return min(positions) if positions else -1
+
+def extract_json(text: str, required_keys: Iterable[str] = (), allow_array: bool = False) -> Any:
+    """
+    Extract the outermost JSON value from an LLM response.
+
+    Code fences and prose before or after the value are ignored. Candidate
+    values are tried in order; one that does not parse is rebuilt from its
+    complete top-level members (which also recovers truncated responses and
+    trailing commas). Scanning resumes after a rejected candidate, so the
+    text is read once.
+
+    Args:
+        text (str): Raw model output
+        required_keys: Keys an object must contain to be accepted
+        allow_array (bool): Also accept a top-level JSON array
+
+    Returns:
+        dict or list: The extracted value
+
+    Raises:
+        JSONExtractionError: If no candidate parses with the required keys
+    """
+    if not text:
+        _record('failed')
+        raise JSONExtractionError("Empty response")
+
+    required_keys = list(required_keys)
+    openers = '{[' if allow_array else '{'
+    start = _next_opening(text, 0, openers)
+    if start == -1:
+        _record('failed')
+        raise JSONExtractionError(f"No JSON value found in response: {text[:100]!r}")
+
+    # Fast path: one value between the first opening and last closing bracket
+    end = text.rfind('}' if text[start] == '{' else ']') + 1
+    if end > start:
+        try:
+            value = json.loads(text[start:end])
+        except json.JSONDecodeError:
+            value = None
+        if isinstance(value, list) or (isinstance(value, dict) and all(key in value for key in required_keys)):
+            _record('parsed')
+            return value
+
+    while start != -1:
+        end = _find_closing(text, start)
+        candidate = text[start:end] if end != -1 else text[start:]
+
+        if end != -1:
+            try:
+                value = json.loads(candidate)
+            except json.JSONDecodeError:
+                value = None
+            if isinstance(value, list) or (isinstance(value, dict) and all(key in value for key in required_keys)):
+                _record('parsed')
+                return value
+
+        if candidate.startswith('{'):
+            parser = IncrementalObjectParser()
+            parser.feed(candidate)
+            if parser.members and parser.has_keys(required_keys):
+                logger.debug(f"Salvaged {len(parser.members)} members from malformed JSON response")
+                _record('salvaged')
+                return parser.result()
+        elif allow_array and candidate.startswith('['):
+            items = _salvage_array(candidate)
+            if items:
+                logger.debug(f"Salvaged {len(items)} items from malformed JSON array")
+                _record('salvaged')
+                return items
+
+        if end == -1:
+            break
+        start = _next_opening(text, end, openers)
+
+    _record('failed')
+    missing = f" with keys {', '.join(required_keys)}" if required_keys else ""
+    raise JSONExtractionError(f"No JSON value found{missing} in response: {text[:100]!r}")
+
+def extract_json_object(text: str, required_keys: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Extract the outermost JSON object from an LLM response.
+
+    Args:
+        text (str): Raw model output
+        required_keys: Keys the object must contain
+
+    Returns:
+        dict: The extracted object
+
+    Raises:
+        JSONExtractionError: If no object with the required keys is found
+    """
+    return extract_json(text, required_keys)
+
+def strip_code_fence(text: str) -> str:
+    """Remove a surrounding markdown code fence from a plain-text response"""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else text[3:]
+    if text.endswith('```'):
+        text = text[:-3]
+    return text.strip()
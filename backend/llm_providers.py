@@ -0,0 +1,453 @@
+# backend/llm_providers.py
+"""
+LLM provider backends used by call_llm_api.
+
+Each provider turns a prompt into generated text, either in one piece or as
+a stream of chunks. Retries, coalescing, the circuit breaker and deadlines
+stay in app.py; providers only talk to their backend.
+
+- GeminiProvider: Google AI Studio through google-generativeai
+- OpenRouterProvider: OpenAI-compatible chat completions over the pooled HTTP session
+- LocalStubProvider: deterministic, schema-valid responses with simulated
+  latency and failures, for load tests without network access
+- ReplayProvider (llm_recording.py): responses recorded from real traffic
+
+The provider is chosen by the LLM_PROVIDER environment variable.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+
+from http_pool import get_http_session, get_http_timeout
+
+logger = logging.getLogger(__name__)
+
+class LLMProvider:
+    """
+    Base class for LLM backends.
+
+    Subclasses implement generate(); stream() defaults to yielding the
+    whole response as a single chunk.
+    """
+    name = 'base'
+
+    def check_connection(self) -> bool:
+        """
+        Verify that the backend is reachable at startup.
+
+        Returns:
+            bool: True if the provider can be used
+        """
+        return True
+
+    def generate(self, prompt: str, model: str, max_tokens: int, temperature: float,
+                 timeout: Optional[float] = None) -> str:
+        """
+        Generate a complete response.
+
+        Args:
+            prompt (str): Prompt text
+            model (str): Model name
+            max_tokens (int): Maximum output tokens
+            temperature (float): Sampling temperature
+            timeout (float): Read timeout in seconds
+
+        Returns:
+            str: Generated text
+        """
+        raise NotImplementedError
+
+    def stream(self, prompt: str, model: str, max_tokens: int, temperature: float,
+               timeout: Optional[float] = None) -> Iterator[str]:
+        """Generate a response as a stream of text chunks"""
+        yield self.generate(prompt, model, max_tokens, temperature, timeout)
+
+class GeminiProvider(LLMProvider):
+    """Google AI Studio (Gemini) provider"""
+    name = 'google_ai_studio'
+
+    def __init__(self, api_key: str, model_name: str):
+        import google.generativeai as genai
+        self._genai = genai
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def check_connection(self) -> bool:
+        self.model.generate_content("Test connection")
+        logger.info("Gemini connection test successful")
+        return True
+
+    def _generation_config(self, max_tokens, temperature):
+        return self._genai.types.GenerationConfig(
+            max_output_tokens=max_tokens,
+            temperature=temperature
+        )
+
+    def generate(self, prompt, model, max_tokens, temperature, timeout=None):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._generation_config(max_tokens, temperature),
+            request_options={'timeout': timeout} if timeout else None
+        )
+        if response.text:
+            return response.text.strip()
+        raise Exception("Empty response from Gemini API")
+
+    def stream(self, prompt, model, max_tokens, temperature, timeout=None):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._generation_config(max_tokens, temperature),
+            stream=True,
+            request_options={'timeout': timeout} if timeout else None
+        )
+        for chunk in response:
+            try:
+                chunk_text = chunk.text
+            except ValueError:
+                # Chunk without text parts (e.g. finish metadata)
+                continue
+            if chunk_text:
+                yield chunk_text
+
+class OpenRouterProvider(LLMProvider):
+    """OpenRouter (OpenAI-compatible chat completions) provider"""
+    name = 'openrouter'
+
+    def __init__(self, api_key: str, base_url: str, model_name: str):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.model_name = model_name
+
+    def _headers(self):
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def check_connection(self) -> bool:
+        test_data = {
+            "model": self.model_name,
+            "messages": [{"role": "user", "content": "Test connection"}]
+        }
+        response = get_http_session().post(
+            self.base_url,
+            headers=self._headers(),
+            json=test_data,
+            timeout=get_http_timeout(10)
+        )
+        if response.status_code == 200:
+            logger.info(f"OpenRouter connection test successful for {self.model_name}")
+            return True
+        logger.error(f"OpenRouter connection test failed: {response.status_code}")
+        return False
+
+    def generate(self, prompt, model, max_tokens, temperature, timeout=None):
+        data = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        response = get_http_session().post(
+            self.base_url,
+            headers=self._headers(),
+            json=data,
+            timeout=get_http_timeout(timeout)
+        )
+        if response.status_code == 200:
+            result = response.json()
+            return result['choices'][0]['message']['content']
+        error_msg = f"OpenRouter API error: {response.status_code}"
+        if response.text:
+            error_msg += f" - {response.text}"
+        raise Exception(error_msg)
+
+    def stream(self, prompt, model, max_tokens, temperature, timeout=None):
+        data = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True
+        }
+        with get_http_session().post(
+            self.base_url,
+            headers=self._headers(),
+            json=data,
+            timeout=get_http_timeout(timeout),
+            stream=True
+        ) as response:
+            if response.status_code != 200:
+                raise Exception(f"OpenRouter API error: {response.status_code} - {response.text}")
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                payload = line[5:].strip()
+                if payload == '[DONE]':
+                    break
+                delta = json.loads(payload)['choices'][0].get('delta', {}).get('content')
+                if delta:
+                    yield delta
+
+class LocalStubProvider(LLMProvider):
+    """
+    Deterministic local provider for load tests and offline development.
+
+    The response content depends only on the prompt: the prompt family
+    (basic, batch or advanced translation, tutor, avatar, quiz) is detected
+    from its wording and a JSON object matching that family's schema is
+    returned. Latency and failures are drawn from a seeded generator.
+
+    Args:
+        latency_ms (float): Mean simulated latency per call
+        latency_jitter_ms (float): Standard deviation of the latency
+        error_rate (float): Fraction of calls that raise an error
+        timeout_rate (float): Fraction of calls that block until the timeout and raise requests.Timeout
+        malformed_rate (float): Fraction of responses wrapped in prose and a code fence
+        seed (int): Seed for latency and failure draws
+        output_ms_per_char (float): Extra latency per response character, to
+            model generation time growing with output length
+    """
+    name = 'local'
+    STREAM_CHUNK_SIZE = 24
+
+    def __init__(self, latency_ms: float = 200, latency_jitter_ms: float = 50, error_rate: float = 0,
+                 timeout_rate: float = 0, malformed_rate: float = 0, seed: int = 0,
+                 output_ms_per_char: float = 0):
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.malformed_rate = malformed_rate
+        self.output_ms_per_char = output_ms_per_char
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self):
+        """Draw (latency in seconds, outcome) for one call"""
+        with self._lock:
+            latency = max(0.0, self._random.gauss(self.latency_ms, self.latency_jitter_ms)) / 1000
+            roll = self._random.random()
+        if roll < self.error_rate:
+            return latency, 'error'
+        if roll < self.error_rate + self.timeout_rate:
+            return latency, 'timeout'
+        if roll < self.error_rate + self.timeout_rate + self.malformed_rate:
+            return latency, 'malformed'
+        return latency, 'ok'
+
+    def _respond(self, prompt, timeout):
+        """Simulate latency and failures, then build the response text"""
+        latency, outcome = self._draw()
+        text = build_stub_response(prompt)
+        latency += len(text) * self.output_ms_per_char / 1000
+        if outcome == 'timeout':
+            time.sleep(timeout if timeout is not None else latency)
+            raise requests.exceptions.Timeout("Simulated local provider timeout")
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise requests.exceptions.Timeout("Simulated local provider timeout")
+        time.sleep(latency)
+        if outcome == 'error':
+            raise Exception("Simulated local provider error")
+
+        if outcome == 'malformed':
+            text = f"Here is the response you asked for:\n```json\n{text}\n```\nLet me know if you need anything else."
+        return text
+
+    def generate(self, prompt, model, max_tokens, temperature, timeout=None):
+        return self._respond(prompt, timeout)
+
+    def stream(self, prompt, model, max_tokens, temperature, timeout=None):
+        text = self._respond(prompt, timeout)
+        for i in range(0, len(text), self.STREAM_CHUNK_SIZE):
+            yield text[i:i + self.STREAM_CHUNK_SIZE]
+
+def _stub_question(kind: str, tag: str) -> Dict[str, Any]:
+    """One grammar or conversation quiz question"""
+    if kind == 'conversation':
+        options = [f"Response {i} ({tag})" for i in range(1, 5)]
+        return {
+            'scenario': f"Stub scenario {tag}",
+            'question': 'How do you respond?',
+            'options': options,
+            'correct_answer': options[0],
+            'explanation': 'Stub explanation'
+        }
+    options = [f"Option {i} ({tag})" for i in range(1, 5)]
+    return {
+        'question': f"Stub grammar question {tag}?",
+        'options': options,
+        'correct_answer': options[0],
+        'explanation': 'Stub explanation'
+    }
+
+def _quoted_after(prompt: str, label: str, default: str = '') -> str:
+    """Text inside the double quotes following ``label`` in the prompt"""
+    match = re.search(re.escape(label) + r'\s*"(.*?)"', prompt, re.DOTALL)
+    return match.group(1) if match else default
+
+def _languages(prompt: str):
+    """(source, target) language codes from a 'from X to Y' instruction"""
+    match = re.search(r'from (\S+) to (\S+?)[.\s:]', prompt)
+    return (match.group(1), match.group(2)) if match else ('auto', 'en')
+
+def _stub_translation(text: str, target_lang: str) -> str:
+    return f"[{target_lang}] {text}"
+
+def build_stub_response(prompt: str) -> str:
+    """
+    Build a deterministic, schema-valid response for a prompt.
+
+    Args:
+        prompt (str): Prompt text from one of the app's prompt builders
+
+    Returns:
+        str: JSON text (or plain text for plain-text prompts)
+    """
+    tag = hashlib.sha1(prompt.encode('utf-8')).hexdigest()[:8]
+    source_lang, target_lang = _languages(prompt)
+    romanize = '"romanization"' in prompt
+
+    if 'Return ONLY the translation' in prompt:
+        match = re.search(r": '(.*)'\. Return ONLY", prompt, re.DOTALL)
+        return _stub_translation(match.group(1) if match else tag, target_lang)
+
+    if 'Texts to translate:' in prompt:
+        match = re.search(r'Texts to translate:\s*(\[.*?\])\s*\n\s*\nReturn', prompt, re.DOTALL)
+        items = json.loads(match.group(1)) if match else []
+        results = []
+        for item in items:
+            entry = {
+                'index': item['index'],
+                'translation': _stub_translation(item['text'], target_lang),
+                'source_lang': source_lang,
+                'target_lang': target_lang
+            }
+            if romanize:
+                entry['romanization'] = f"romanized {item['text']}"
+                entry['romanization_system'] = 'Stub'
+            results.append(entry)
+        return json.dumps(results, ensure_ascii=False)
+
+    if 'Text to translate:' in prompt:
+        text = _quoted_after(prompt, 'Text to translate:')
+        data: Dict[str, Any] = {'translation': _stub_translation(text, target_lang)}
+        if romanize:
+            data['romanization'] = f"romanized {text}"
+            data['romanization_system'] = 'Stub'
+        data['source_lang'] = source_lang
+        data['target_lang'] = target_lang
+        return json.dumps(data, ensure_ascii=False)
+
+    if 'comprehensive translation analysis' in prompt:
+        text = _quoted_after(prompt, 'Text to analyze:')
+        sections = {
+            'main_translation': _stub_translation(text, target_lang),
+            'alternatives': [
+                {'text': f"{text} ({kind})", 'confidence': confidence, 'explanation': f"Stub {kind} alternative", 'type': kind}
+                for kind, confidence in (('literal', 90), ('colloquial', 80), ('formal', 70))
+            ],
+            'pronunciation': {
+                'ipa': f"/{tag}/", 'syllables': '-'.join(text.split()), 'stress': 'first syllable',
+                'phonetic': text, 'romanization': text if romanize else '', 'romanization_system': 'Stub' if romanize else ''
+            },
+            'grammar': {
+                'parts_of_speech': [{'word': word, 'pos': 'noun'} for word in text.split()[:3]],
+                'structure': 'Subject-verb-object', 'rules': ['Stub grammar rule'], 'differences': 'None'
+            },
+            'context': {
+                'usage_contexts': ['greeting', 'conversation', 'writing'],
+                'examples': [f"{text}!", f"{text}?", f"{text}."],
+                'cultural_notes': 'Stub cultural note', 'appropriate_situations': ['informal', 'formal']
+            },
+            'additional': {
+                'difficulty': 'beginner', 'common_mistakes': ['Stub mistake'],
+                'related_phrases': [f"{text} {tag}"], 'etymology': 'Stub etymology'
+            }
+        }
+        return json.dumps(
+            {key: value for key, value in sections.items() if f'"{key}":' in prompt},
+            ensure_ascii=False
+        )
+
+    if 'Language Learning Tutor' in prompt:
+        phrase = _quoted_after(prompt, 'understand the phrase', tag)
+        return json.dumps({
+            'meaning': f"Stub explanation of '{phrase}'.",
+            'examples': [
+                {'sentence': f"{phrase} ({i})", 'translation': f"Example {i} for {phrase}"} for i in (1, 2)
+            ],
+            'grammar_tip': 'Stub grammar tip.',
+            'cultural_insight': 'Stub cultural insight.'
+        }, ensure_ascii=False)
+
+    if 'Respond in character' in prompt:
+        said = _quoted_after(prompt, 'User just said:', tag)
+        return json.dumps({
+            'response': f"Stub reply to: {said}",
+            'translation': f"Stub reply to: {said}",
+            'vocabulary': said.split()[:5] or ['hello'],
+            'grammar_notes': 'Stub grammar note',
+            'cultural_note': 'Stub cultural note',
+            'suggested_responses': ['Yes', 'Tell me more', 'Thank you'],
+            'avatar_emotion': 'encouraging',
+            'teaching_tip': 'Stub teaching tip'
+        }, ensure_ascii=False)
+
+    question_set = re.search(r'Generate (\d+) different \S+ level (grammar|conversation) questions', prompt)
+    if question_set:
+        count, kind = int(question_set.group(1)), question_set.group(2)
+        return json.dumps([_stub_question(kind, f"{tag}-{i}") for i in range(1, count + 1)])
+
+    if 'conversation question' in prompt:
+        return json.dumps(_stub_question('conversation', tag))
+
+    if 'grammar question' in prompt:
+        return json.dumps(_stub_question('grammar', tag))
+
+    return f"Stub response {tag}"
+
+def create_llm_provider(llm_config: Dict[str, Any], local_settings: Optional[Dict[str, Any]] = None,
+                        replay_settings: Optional[Dict[str, Any]] = None) -> LLMProvider:
+    """
+    Create the provider selected by the LLM configuration.
+
+    Args:
+        llm_config (dict): Result of config.get_llm_config()
+        local_settings (dict): Keyword arguments for LocalStubProvider
+        replay_settings (dict): ``path``, ``latency_scale`` and ``miss_fallback``
+            ('local' to answer unrecorded prompts with the stub) for ReplayProvider
+
+    Returns:
+        LLMProvider: Configured provider
+
+    Raises:
+        ValueError: If a remote provider has no API key, or replay has no recording
+    """
+    provider = llm_config['provider']
+    if provider == 'local':
+        return LocalStubProvider(**(local_settings or {}))
+    if provider == 'replay':
+        from llm_recording import ReplayProvider
+        replay_settings = replay_settings or {}
+        if not replay_settings.get('path'):
+            raise ValueError("LLM_REPLAY_PATH must be set for the replay provider")
+        fallback = None
+        if replay_settings.get('miss_fallback') == 'local':
+            fallback = LocalStubProvider(**(local_settings or {}))
+        return ReplayProvider(replay_settings['path'], replay_settings.get('latency_scale', 1.0), fallback)
+    if not llm_config.get('api_key'):
+        raise ValueError(f"No API key configured for LLM provider '{provider}'")
+    if provider == 'google_ai_studio':
+        return GeminiProvider(llm_config['api_key'], llm_config['model'])
+    return OpenRouterProvider(llm_config['api_key'], llm_config['base_url'], llm_config['model'])
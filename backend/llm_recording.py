@@ -0,0 +1,254 @@
+# backend/llm_recording.py
+"""
+Record and replay LLM traffic.
+
+With LLM_RECORD_PATH set, every provider call made by call_llm_api is
+appended to a JSON Lines file: prompt hash, prompt, generation parameters,
+response (or error) and latency. The replay provider (LLM_PROVIDER=replay)
+serves those responses back by prompt hash, so realistic traffic can be
+pushed through the whole app with no network to measure the cache, parsing
+and serialization work around the LLM.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+
+from llm_providers import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+def prompt_hash(prompt: str) -> str:
+    """Stable key for a prompt"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:32]
+
+class LLMRecorder:
+    """
+    Append-only writer for recorded LLM calls.
+
+    Each call is one compact JSON line, written and flushed under a lock so
+    concurrent worker threads never interleave records.
+
+    Args:
+        path (str): File to append records to
+        include_prompts (bool): Store prompt text alongside its hash
+    """
+
+    def __init__(self, path: str, include_prompts: bool = True):
+        self.path = path
+        self.include_prompts = include_prompts
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self.records = 0
+
+    def record(self, provider: str, prompt: str, model: str, max_tokens: int, temperature: float,
+               latency_ms: float, response: Optional[str] = None, error: Optional[str] = None,
+               stream: bool = False, first_chunk_ms: Optional[float] = None, source: Optional[str] = None):
+        """Append one call to the recording"""
+        entry = {
+            'h': prompt_hash(prompt),
+            'ts': round(time.time(), 3),
+            'provider': provider,
+            'model': model,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'ms': round(latency_ms, 1)
+        }
+        if source:
+            entry['source'] = source
+        if self.include_prompts:
+            entry['prompt'] = prompt
+        if stream:
+            entry['stream'] = True
+            entry['first_ms'] = round(first_chunk_ms, 1) if first_chunk_ms is not None else None
+        if error is not None:
+            entry['error'] = error
+        else:
+            entry['response'] = response
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            self.records += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class RecordingProvider(LLMProvider):
+    """
+    Wraps a provider and records every call it serves.
+
+    Failed calls are recorded with their error so replays reproduce the
+    same failure mix.
+
+    Args:
+        provider (LLMProvider): Provider that serves the calls
+        recorder (LLMRecorder): Destination for the records
+        source (callable): Returns a label for the caller (e.g. the Flask
+            endpoint), stored with each record
+    """
+
+    def __init__(self, provider: LLMProvider, recorder: LLMRecorder,
+                 source: Optional[Callable[[], Optional[str]]] = None):
+        self.provider = provider
+        self.recorder = recorder
+        self.source = source or (lambda: None)
+        self.name = provider.name
+
+    def check_connection(self) -> bool:
+        return self.provider.check_connection()
+
+    def stats(self) -> Dict[str, Any]:
+        """Recording destination and record count"""
+        return {'path': self.recorder.path, 'records': self.recorder.records}
+
+    def generate(self, prompt, model, max_tokens, temperature, timeout=None):
+        source = self.source()
+        start = time.perf_counter()
+        try:
+            response = self.provider.generate(prompt, model, max_tokens, temperature, timeout)
+        except Exception as e:
+            self.recorder.record(self.name, prompt, model, max_tokens, temperature,
+                                 (time.perf_counter() - start) * 1000, error=_error_name(e), source=source)
+            raise
+        self.recorder.record(self.name, prompt, model, max_tokens, temperature,
+                             (time.perf_counter() - start) * 1000, response=response, source=source)
+        return response
+
+    def stream(self, prompt, model, max_tokens, temperature, timeout=None):
+        source = self.source()
+        start = time.perf_counter()
+        first_chunk_ms = None
+        chunks = []
+        try:
+            for chunk in self.provider.stream(prompt, model, max_tokens, temperature, timeout):
+                if first_chunk_ms is None:
+                    first_chunk_ms = (time.perf_counter() - start) * 1000
+                chunks.append(chunk)
+                yield chunk
+        except Exception as e:
+            self.recorder.record(self.name, prompt, model, max_tokens, temperature,
+                                 (time.perf_counter() - start) * 1000, error=_error_name(e),
+                                 stream=True, first_chunk_ms=first_chunk_ms, source=source)
+            raise
+        self.recorder.record(self.name, prompt, model, max_tokens, temperature,
+                             (time.perf_counter() - start) * 1000, response=''.join(chunks),
+                             stream=True, first_chunk_ms=first_chunk_ms, source=source)
+
+def _error_name(error: Exception) -> str:
+    """Error kind stored in recordings (timeouts are replayed as timeouts)"""
+    if isinstance(error, requests.exceptions.Timeout):
+        return 'timeout'
+    return f"{type(error).__name__}: {error}"
+
+def load_recording(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Load recorded calls grouped by prompt hash.
+
+    Lines that fail to parse (e.g. a partial last line) are skipped.
+
+    Returns:
+        dict: Prompt hash to recorded entries in file order
+    """
+    entries = defaultdict(list)
+    skipped = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                skipped += 1
+                continue
+            entries[entry['h']].append(entry)
+    if skipped:
+        logger.warning(f"Skipped {skipped} unreadable lines in {path}")
+    return dict(entries)
+
+class ReplayProvider(LLMProvider):
+    """
+    Serves recorded responses keyed by prompt hash.
+
+    A prompt recorded several times cycles through its responses in order.
+    Recorded errors are raised again, and recorded latency is slept
+    (scaled by ``latency_scale``; 0 replays instantly).
+
+    Args:
+        path (str): Recording to replay
+        latency_scale (float): Multiplier for recorded latencies
+        fallback (LLMProvider): Provider for prompts missing from the
+            recording; without one a miss raises an error
+    """
+    name = 'replay'
+    STREAM_CHUNK_SIZE = 24
+
+    def __init__(self, path: str, latency_scale: float = 1.0, fallback: Optional[LLMProvider] = None):
+        self.entries = load_recording(path)
+        self.latency_scale = latency_scale
+        self.fallback = fallback
+        self._positions = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        logger.info(f"Loaded {sum(len(e) for e in self.entries.values())} recorded LLM calls "
+                    f"for {len(self.entries)} prompts from {path}")
+
+    def _next_entry(self, prompt: str) -> Optional[Dict[str, Any]]:
+        key = prompt_hash(prompt)
+        with self._lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry = recorded[self._positions[key] % len(recorded)]
+            self._positions[key] += 1
+            return entry
+
+    def _replay(self, entry: Dict[str, Any], timeout: Optional[float]) -> str:
+        latency = entry.get('ms', 0) / 1000 * self.latency_scale
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise requests.exceptions.Timeout("Replayed call exceeded the timeout")
+        if latency > 0:
+            time.sleep(latency)
+        error = entry.get('error')
+        if error == 'timeout':
+            raise requests.exceptions.Timeout("Replayed LLM timeout")
+        if error is not None:
+            raise Exception(f"Replayed LLM error: {error}")
+        return entry['response']
+
+    def generate(self, prompt, model, max_tokens, temperature, timeout=None):
+        entry = self._next_entry(prompt)
+        if entry is None:
+            if self.fallback is not None:
+                return self.fallback.generate(prompt, model, max_tokens, temperature, timeout)
+            raise Exception(f"No recorded response for prompt {prompt_hash(prompt)}")
+        return self._replay(entry, timeout)
+
+    def stream(self, prompt, model, max_tokens, temperature, timeout=None):
+        entry = self._next_entry(prompt)
+        if entry is None:
+            if self.fallback is not None:
+                yield from self.fallback.stream(prompt, model, max_tokens, temperature, timeout)
+                return
+            raise Exception(f"No recorded response for prompt {prompt_hash(prompt)}")
+        text = self._replay(entry, timeout)
+        for i in range(0, len(text), self.STREAM_CHUNK_SIZE):
+            yield text[i:i + self.STREAM_CHUNK_SIZE]
+
+    def stats(self) -> Dict[str, Any]:
+        """Replay hit and miss counts"""
+        with self._lock:
+            return {'prompts': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -10,7 +10,7 @@ from datetime import datetime
 from models import (
     create_tables, get_db_session, 
     WordOfDay, CommonPhrase, User, Flashcard, FlashcardReview,
-    QuizScore, PracticeSession, UserPreference, Analytics
+    Quiz, QuizAnswer, QuizScore, PracticeSession, UserPreference, Analytics
 )
 
 def load_json_safe(file_path):
@@ -181,6 +181,69 @@ def migrate_user_progress():
     finally:
         db.close()
 
+def migrate_quiz_state():
+    """Migrate in-progress quiz state (quizzes and their answers)"""
+    print("Migrating quiz state...")
+    sources = [load_json_safe('data/user_progress.json').get('users', {})]
+    users_dir = os.path.join('data', 'users')
+    if os.path.isdir(users_dir):
+        for file_name in sorted(os.listdir(users_dir)):
+            if file_name.endswith('.json'):
+                sources.append({file_name[:-len('.json')]: load_json_safe(os.path.join(users_dir, file_name))})
+    
+    db = get_db_session()
+    try:
+        migrated = 0
+        for users_data in sources:
+            for user_id, user_data in users_data.items():
+                quizzes_data = user_data.get('quizzes', {}) if isinstance(user_data, dict) else {}
+                for quiz_id, quiz_data in quizzes_data.items():
+                    # Skip quizzes imported by an earlier run
+                    if db.query(Quiz.id).filter(Quiz.id == quiz_id).first():
+                        continue
+                    
+                    if not db.query(User.id).filter(User.id == user_id).first():
+                        db.add(User(id=user_id))
+                        db.flush()
+                    
+                    completed_at = quiz_data.get('completed_at')
+                    db.add(Quiz(
+                        id=quiz_id,
+                        user_id=user_id,
+                        language=quiz_data.get('language', 'en'),
+                        quiz_type=quiz_data.get('type', 'mixed'),
+                        difficulty=quiz_data.get('difficulty', 'beginner'),
+                        questions=quiz_data.get('questions', []),
+                        started_at=datetime.fromisoformat(quiz_data.get('started_at', datetime.now().isoformat())),
+                        completed_at=datetime.fromisoformat(completed_at) if completed_at else None,
+                        is_completed=quiz_data.get('completed', False)
+                    ))
+                    
+                    answered = set()
+                    for answer_data in quiz_data.get('answers', []):
+                        question_index = answer_data.get('question_index')
+                        if question_index is None or question_index in answered:
+                            continue
+                        answered.add(question_index)
+                        db.add(QuizAnswer(
+                            quiz_id=quiz_id,
+                            question_index=question_index,
+                            user_answer=answer_data.get('user_answer', ''),
+                            correct=answer_data.get('correct', False),
+                            points_earned=answer_data.get('points_earned', 0),
+                            answered_at=datetime.fromisoformat(answer_data.get('timestamp', datetime.now().isoformat()))
+                        ))
+                    migrated += 1
+        
+        db.commit()
+        print(f"Migrated {migrated} quizzes")
+    
+    except Exception as e:
+        print(f"Error migrating quiz state: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
 def migrate_user_preferences():
     """Migrate user preferences data"""
     print("Migrating user preferences data...")
@@ -268,6 +331,7 @@ def main():
     migrate_word_of_day()
     migrate_common_phrases()
     migrate_user_progress()
+    migrate_quiz_state()
     migrate_user_preferences()
     migrate_analytics()
     
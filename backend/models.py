@@ -1,10 +1,18 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, Boolean, Float, DateTime, ForeignKey, JSON, Index
+from sqlalchemy import create_engine, event, Column, Integer, String, Text, Boolean, Float, Date, DateTime, ForeignKey, JSON, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
 import os
 import pathlib
 
+from config import (
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_PRE_PING,
+    SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS, SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE,
+    SQLITE_TEMP_STORE, SQLITE_BUSY_TIMEOUT_MS
+)
+from request_deadline import get_deadline
+from sqlite_tuning import sqlite_pragmas, apply_sqlite_pragmas
+
 Base = declarative_base()
 
 class WordOfDay(Base):
@@ -25,6 +33,14 @@ class WordOfDay(Base):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
+class DailyWord(Base):
+    __tablename__ = 'daily_words'
+    
+    day = Column(Date, primary_key=True)
+    language = Column(String(10), primary_key=True)
+    word_id = Column(Integer, ForeignKey('words_of_day.id'), nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
 class CommonPhrase(Base):
     __tablename__ = 'common_phrases'
     
@@ -112,6 +128,22 @@ class Quiz(Base):
     # Relationships
     user = relationship("User")
     scores = relationship("QuizScore", back_populates="quiz")
+    answers = relationship("QuizAnswer", back_populates="quiz", cascade="all, delete-orphan")
+
+class QuizAnswer(Base):
+    __tablename__ = 'quiz_answers'
+    __table_args__ = (UniqueConstraint('quiz_id', 'question_index', name='uq_quiz_answers_question'),)
+    
+    id = Column(Integer, primary_key=True)
+    quiz_id = Column(String(50), ForeignKey('quizzes.id'), nullable=False)
+    question_index = Column(Integer, nullable=False)
+    user_answer = Column(Text)
+    correct = Column(Boolean, nullable=False)
+    points_earned = Column(Integer, default=0)
+    answered_at = Column(DateTime, default=datetime.now)
+    
+    # Relationships
+    quiz = relationship("Quiz", back_populates="answers")
 
 class QuizScore(Base):
     __tablename__ = 'quiz_scores'
@@ -184,6 +216,7 @@ class Analytics(Base):
 # Create indexes for better performance
 Index('idx_flashcards_user_lang', Flashcard.user_id, Flashcard.target_lang)
 Index('idx_quiz_scores_user_lang', QuizScore.user_id, QuizScore.language)
+Index('idx_quizzes_user', Quiz.user_id, Quiz.started_at)
 Index('idx_practice_sessions_user', PracticeSession.user_id, PracticeSession.timestamp)
 Index('idx_analytics_user_event', Analytics.user_id, Analytics.event_type)
 
@@ -198,12 +231,64 @@ if DATABASE_URL.startswith('sqlite:///'):
         pathlib.Path(db_dir).mkdir(parents=True, exist_ok=True)
         print(f"Created database directory: {db_dir}")
 
-engine = create_engine(DATABASE_URL, echo=False)
+SQLITE_PRAGMAS = sqlite_pragmas(
+    journal_mode=SQLITE_JOURNAL_MODE,
+    synchronous=SQLITE_SYNCHRONOUS,
+    mmap_size=SQLITE_MMAP_SIZE,
+    cache_size=SQLITE_CACHE_SIZE,
+    temp_store=SQLITE_TEMP_STORE,
+    busy_timeout_ms=SQLITE_BUSY_TIMEOUT_MS
+)
+
+def create_db_engine(url: str, pragmas: dict = SQLITE_PRAGMAS):
+    """Create an engine with the configured connection pool settings and, for SQLite, pragmas"""
+    options = {'echo': False, 'pool_pre_ping': DB_POOL_PRE_PING}
+    # In-memory SQLite uses a single connection per thread, not a sized pool
+    if not (url.startswith('sqlite') and (':memory:' in url or url.rstrip('/') == 'sqlite:')):
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    db_engine = create_engine(url, **options)
+    if db_engine.dialect.name == 'sqlite' and pragmas:
+        apply_sqlite_pragmas(db_engine, pragmas)
+    return db_engine
+
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# SQLite VM instructions between deadline checks while a statement runs
+DEADLINE_CHECK_INTERVAL = 1000
+
+@event.listens_for(engine, 'before_cursor_execute')
+def apply_request_deadline(conn, cursor, statement, parameters, context, executemany):
+    """Refuse statements once the request deadline has passed and interrupt long SQLite queries at it"""
+    deadline = get_deadline()
+    if deadline is not None:
+        deadline.check('database query')
+    if engine.dialect.name == 'sqlite':
+        dbapi_connection = conn.connection.dbapi_connection
+        if deadline is None:
+            dbapi_connection.set_progress_handler(None, 0)
+        else:
+            dbapi_connection.set_progress_handler(lambda: 1 if deadline.refuses('database query') else 0, DEADLINE_CHECK_INTERVAL)
+
+@event.listens_for(engine, 'after_cursor_execute')
+def clear_request_deadline(conn, cursor, statement, parameters, context, executemany):
+    """Remove the deadline check so it never interrupts a later commit or rollback"""
+    if engine.dialect.name == 'sqlite':
+        conn.connection.dbapi_connection.set_progress_handler(None, 0)
+
+@event.listens_for(engine, 'handle_error')
+def clear_request_deadline_on_error(exception_context):
+    if engine.dialect.name == 'sqlite' and exception_context.connection is not None:
+        exception_context.connection.connection.dbapi_connection.set_progress_handler(None, 0)
+
 def create_tables():
     """Create all database tables"""
     Base.metadata.create_all(bind=engine)
+    # create_all only builds indexes together with new tables; add ones
+    # defined later for tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
 def get_db():
     """Get database session"""
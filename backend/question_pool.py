@@ -0,0 +1,300 @@
+# backend/question_pool.py
+"""
+Persistent pool of pre-generated quiz questions.
+
+Questions are stored in a local SQLite file keyed by (language, difficulty,
+question type) and shared by all users. Each draw records which questions
+the user has been given, so a user never sees the same pooled question
+twice; when the pool cannot cover a draw the caller generates the rest live.
+
+A background worker keeps the pool ahead of demand: after a draw leaves a
+user fewer than ``low_water`` unseen questions for that key, the key is
+queued for a refill of ``refill_batch`` questions (up to ``max_size``
+questions per key).
+"""
+
+import json
+import logging
+import os
+import queue
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES = 1000
+REFILL_RATE_WINDOW = 600  # seconds of refill history used for the refill rate
+
+# generate(question_type, language, difficulty, count) -> valid questions (may be fewer than count)
+QuestionGenerator = Callable[[str, str, str, int], List[Dict[str, Any]]]
+
+def content_key(question: Dict[str, Any]) -> str:
+    """Identity of a question's content, so the same question is pooled once"""
+    return json.dumps([question.get('scenario'), question.get('text')], ensure_ascii=False)
+
+class QuestionPool:
+    """
+    SQLite-backed question pool with per-user draw history and background refill.
+
+    All database failures are logged and treated as an empty pool, so a
+    locked or corrupted pool file never fails quiz generation.
+    """
+
+    def __init__(self, path: str, generate: Optional[QuestionGenerator] = None, low_water: int = 10,
+                 refill_batch: int = 5, max_size: int = 200, busy_timeout: float = 2.0):
+        """
+        Initialize the pool and create its tables if needed.
+
+        Args:
+            path (str): Path of the SQLite database file
+            generate (callable): Question generator used by background refills;
+                without one the pool is only filled through add()
+            low_water (int): Unseen questions per user and key below which a refill is queued
+            refill_batch (int): Questions requested per refill
+            max_size (int): Maximum pooled questions per key
+            busy_timeout (float): Seconds to wait for a lock held by another worker
+        """
+        self.path = path
+        self.generate = generate
+        self.low_water = low_water
+        self.refill_batch = refill_batch
+        self.max_size = max_size
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._refill_queue = queue.Queue()
+        self._pending_refills = set()
+        self._worker = None
+        self._draw_latencies = deque(maxlen=LATENCY_SAMPLES)
+        self._refill_history = deque()
+        self._stats = {
+            'draws': 0,
+            'questions_drawn': 0,
+            'shortfalls': 0,
+            'refills': 0,
+            'refill_errors': 0,
+            'questions_added': 0,
+            'errors': 0
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS quiz_question_pool ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+            'language TEXT NOT NULL, '
+            'difficulty TEXT NOT NULL, '
+            'question_type TEXT NOT NULL, '
+            'content_key TEXT NOT NULL, '
+            'question TEXT NOT NULL, '
+            'created_at REAL NOT NULL, '
+            'UNIQUE (language, difficulty, question_type, content_key))'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS quiz_question_draws ('
+            'user_id TEXT NOT NULL, '
+            'question_id INTEGER NOT NULL, '
+            'drawn_at REAL NOT NULL, '
+            'PRIMARY KEY (user_id, question_id)) WITHOUT ROWID'
+        )
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the calling thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def add(self, language: str, difficulty: str, question_type: str,
+            questions: List[Dict[str, Any]]) -> int:
+        """
+        Add questions to the pool, skipping ones already pooled for the key.
+
+        Returns:
+            int: Number of questions added
+        """
+        now = time.time()
+        rows = [
+            (language, difficulty, question_type, content_key(question),
+             json.dumps(question, ensure_ascii=False), now)
+            for question in questions
+        ]
+        try:
+            conn = self._connection()
+            before = conn.total_changes
+            conn.executemany(
+                'INSERT OR IGNORE INTO quiz_question_pool '
+                '(language, difficulty, question_type, content_key, question, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            conn.commit()
+            added = conn.total_changes - before
+        except sqlite3.Error as e:
+            logger.error(f"Question pool add failed: {e}")
+            self._stats['errors'] += 1
+            return 0
+        with self._lock:
+            self._stats['questions_added'] += added
+        return added
+
+    def draw(self, user_id: str, language: str, difficulty: str, question_type: str,
+             count: int) -> List[Dict[str, Any]]:
+        """
+        Draw up to ``count`` questions the user has not been given before.
+
+        Drawn questions are recorded for the user and returned with fresh
+        ids. A refill is queued when the user's unseen supply for the key
+        drops below the low-water mark.
+
+        Returns:
+            list: Between 0 and ``count`` questions
+        """
+        start = time.perf_counter()
+        questions = []
+        unseen_left = 0
+        try:
+            conn = self._connection()
+            unseen = [row[0] for row in conn.execute(
+                'SELECT id FROM quiz_question_pool '
+                'WHERE language = ? AND difficulty = ? AND question_type = ? '
+                'AND id NOT IN (SELECT question_id FROM quiz_question_draws WHERE user_id = ?)',
+                (language, difficulty, question_type, user_id)
+            )]
+            chosen = random.sample(unseen, min(count, len(unseen)))
+            unseen_left = len(unseen) - len(chosen)
+            if chosen:
+                placeholders = ','.join('?' * len(chosen))
+                rows = dict(conn.execute(
+                    f'SELECT id, question FROM quiz_question_pool WHERE id IN ({placeholders})', chosen
+                ).fetchall())
+                now = time.time()
+                conn.executemany(
+                    'INSERT OR IGNORE INTO quiz_question_draws (user_id, question_id, drawn_at) VALUES (?, ?, ?)',
+                    [(user_id, question_id, now) for question_id in chosen]
+                )
+                conn.commit()
+                for question_id in chosen:
+                    question = json.loads(rows[question_id])
+                    question['id'] = str(uuid.uuid4())
+                    questions.append(question)
+        except (sqlite3.Error, ValueError) as e:
+            logger.error(f"Question pool draw failed: {e}")
+            self._stats['errors'] += 1
+            questions = []
+
+        with self._lock:
+            self._stats['draws'] += 1
+            self._stats['questions_drawn'] += len(questions)
+            if len(questions) < count:
+                self._stats['shortfalls'] += 1
+            self._draw_latencies.append(time.perf_counter() - start)
+
+        if unseen_left < self.low_water:
+            self.request_refill(language, difficulty, question_type)
+        return questions
+
+    def depth(self, language: str, difficulty: str, question_type: str) -> int:
+        """Number of pooled questions for a key"""
+        try:
+            return self._connection().execute(
+                'SELECT COUNT(*) FROM quiz_question_pool WHERE language = ? AND difficulty = ? AND question_type = ?',
+                (language, difficulty, question_type)
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Question pool depth query failed: {e}")
+            return 0
+
+    def request_refill(self, language: str, difficulty: str, question_type: str) -> bool:
+        """
+        Queue a background refill for a key.
+
+        Returns:
+            bool: True if a refill was queued (False without a generator or
+            when one is already pending for the key)
+        """
+        if self.generate is None:
+            return False
+        key = (language, difficulty, question_type)
+        with self._lock:
+            if key in self._pending_refills:
+                return False
+            self._pending_refills.add(key)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run_refills, name='question-pool-refill', daemon=True)
+                self._worker.start()
+        self._refill_queue.put(key)
+        return True
+
+    def refill(self, language: str, difficulty: str, question_type: str) -> int:
+        """
+        Generate and add one batch of questions for a key now.
+
+        Returns:
+            int: Number of questions added
+        """
+        depth = self.depth(language, difficulty, question_type)
+        count = min(self.refill_batch, self.max_size - depth)
+        if count <= 0:
+            return 0
+        questions = self.generate(question_type, language, difficulty, count)
+        added = self.add(language, difficulty, question_type, questions)
+        with self._lock:
+            self._stats['refills'] += 1
+            self._refill_history.append((time.time(), added))
+        logger.info(f"Refilled question pool {language}/{difficulty}/{question_type}: "
+                    f"+{added} (depth {depth + added})")
+        return added
+
+    def _run_refills(self):
+        """Background worker: refill queued keys one at a time"""
+        while True:
+            key = self._refill_queue.get()
+            try:
+                self.refill(*key)
+            except Exception as e:
+                logger.error(f"Question pool refill failed for {key}: {e}")
+                with self._lock:
+                    self._stats['refill_errors'] += 1
+            finally:
+                with self._lock:
+                    self._pending_refills.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool depth per key, refill rate and draw latency"""
+        try:
+            rows = self._connection().execute(
+                'SELECT language, difficulty, question_type, COUNT(*) FROM quiz_question_pool '
+                'GROUP BY language, difficulty, question_type'
+            ).fetchall()
+            depth = {f"{language}/{difficulty}/{question_type}": count for language, difficulty, question_type, count in rows}
+        except sqlite3.Error as e:
+            logger.error(f"Question pool stats query failed: {e}")
+            depth = {}
+
+        with self._lock:
+            cutoff = time.time() - REFILL_RATE_WINDOW
+            while self._refill_history and self._refill_history[0][0] < cutoff:
+                self._refill_history.popleft()
+            added_recently = sum(added for _, added in self._refill_history)
+            latencies = sorted(self._draw_latencies)
+            return {
+                **self._stats,
+                'depth': depth,
+                'pending_refills': len(self._pending_refills),
+                'refill_rate_per_min': round(added_recently / (REFILL_RATE_WINDOW / 60), 2),
+                'draw_ms_avg': round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+                'draw_ms_p95': round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 2) if latencies else 0.0
+            }
@@ -0,0 +1,157 @@
+# backend/quiz_catalog.py
+"""
+In-memory catalog of the static quizzes in quizzes.json.
+
+The file is parsed once into a quiz_id index and per-(language, difficulty)
+lists, so looking up a quiz is a dict access instead of a nested scan of
+the whole file. Every access stats the file and rebuilds the catalog only
+when its modification time or size has changed, so edits to quizzes.json
+are picked up without a restart.
+
+Quizzes are returned as the cached objects; callers must not modify them.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+def _read_json(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def read_quizzes_file(path: str, save: Optional[Callable[[str, Dict[str, Any]], Any]] = None) -> Dict[str, Any]:
+    """
+    Read a quizzes file, creating an empty one if it does not exist.
+
+    Parse errors are raised rather than replaced with an empty catalog, so a
+    bad edit leaves the file in place and QuizCatalog keeps serving the
+    previous version.
+
+    Args:
+        path (str): Path of the quizzes JSON file
+        save (callable): save(path, data) used to create a missing file
+
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    if not os.path.exists(path):
+        data = {'quizzes': {}}
+        if save:
+            save(path, data)
+        return data
+    return _read_json(path)
+
+class QuizCatalog:
+    """Indexed view of a quizzes.json file, reloaded when the file changes"""
+
+    def __init__(self, path: str, load: Optional[Callable[[str], Dict[str, Any]]] = None):
+        """
+        Initialize the catalog. The file is read on first use.
+
+        Args:
+            path (str): Path of the quizzes JSON file
+            load (callable): Function reading the file into a dict; defaults
+                to plain json.load
+        """
+        self.path = path
+        self.load = load or _read_json
+        self._lock = threading.Lock()
+        self._signature = None
+        self._loaded = False
+        self._data = {}
+        self._by_id = {}
+        self._by_level = {}
+        self._stats = {'loads': 0, 'load_errors': 0, 'lookups': 0}
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        """Rebuild the indexes if the file changed since the last load"""
+        signature = self._file_signature()
+        if self._loaded and signature == self._signature:
+            return
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                return
+            try:
+                data = self.load(self.path) or {}
+            except Exception as e:
+                # Keep serving the previous catalog; retry on the next change
+                logger.error(f"Error loading quiz catalog {self.path}: {e}")
+                self._stats['load_errors'] += 1
+                self._signature = signature
+                self._loaded = True
+                return
+
+            by_id = {}
+            by_level = {}
+            for language, levels in data.get('quizzes', {}).items():
+                for difficulty, quizzes in levels.items():
+                    by_level[(language, difficulty)] = quizzes
+                    for quiz in quizzes:
+                        # First occurrence wins, matching the order of the old nested scan
+                        by_id.setdefault(quiz['id'], []).append((language, difficulty, quiz))
+
+            self._data = data
+            self._by_id = by_id
+            self._by_level = by_level
+            # The loader may have created the file, so take the signature afterwards
+            self._signature = self._file_signature()
+            self._loaded = True
+            self._stats['loads'] += 1
+            logger.info(f"Loaded quiz catalog: {sum(len(q) for q in by_level.values())} quizzes "
+                        f"in {len(by_level)} language/difficulty groups")
+
+    def has_language(self, language: str) -> bool:
+        """Whether any quizzes exist for a language"""
+        self._refresh()
+        return language in self._data.get('quizzes', {})
+
+    def get_quizzes(self, language: str, difficulty: str) -> Optional[List[Dict[str, Any]]]:
+        """Quizzes for a language and difficulty, or None if there is no such group"""
+        self._refresh()
+        self._stats['lookups'] += 1
+        return self._by_level.get((language, difficulty))
+
+    def find(self, quiz_id: str, language: Optional[str] = None) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+        """
+        Look up a quiz by id.
+
+        Args:
+            quiz_id (str): Quiz id
+            language (str): Only match a quiz in this language
+
+        Returns:
+            tuple: (language, difficulty, quiz), or None if not found
+        """
+        self._refresh()
+        self._stats['lookups'] += 1
+        for entry in self._by_id.get(quiz_id, ()):
+            if language is None or entry[0] == language:
+                return entry
+        return None
+
+    def metadata(self) -> Dict[str, Any]:
+        """Top-level categories and difficulties listed in the file"""
+        self._refresh()
+        return {
+            'categories': self._data.get('categories', []),
+            'difficulties': self._data.get('difficulties', [])
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Load and lookup counters"""
+        return {
+            **self._stats,
+            'quizzes': sum(len(quizzes) for quizzes in self._by_level.values()),
+            'groups': len(self._by_level)
+        }
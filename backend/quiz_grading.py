@@ -0,0 +1,121 @@
+# backend/quiz_grading.py
+"""
+Grading for generated quiz questions.
+
+Translation answers are scored by fuzzy similarity, with the same values
+as fuzzywuzzy's ``fuzz.ratio`` (backed by python-Levenshtein): the Indel
+distance normalized by the combined length, as a rounded percentage. An
+answer is correct at ``similarity >= 80`` and earns
+``int(points * similarity / 100)``.
+
+For a whole quiz the Indel distances of all translation items are
+computed in one batch (rapidfuzz ``cpdist`` when numpy is available, a
+plain loop over the C distance function otherwise), skipping the
+per-call wrapper overhead of ``fuzz.ratio``.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from rapidfuzz.distance import Indel
+
+try:
+    import numpy
+    from rapidfuzz.process import cpdist
+except ImportError:
+    cpdist = None
+
+TRANSLATION_PASS_SIMILARITY = 80
+
+def _similarity(s1: str, s2: str, distance: int) -> int:
+    """fuzz.ratio from a precomputed Indel distance"""
+    if s1 == s2:
+        return 100
+    if not s1 or not s2:
+        return 0
+    return int(round(100 * (1.0 - distance / (len(s1) + len(s2)))))
+
+def translation_similarities(pairs: Sequence[Tuple[str, str]]) -> List[int]:
+    """
+    Fuzzy similarity (0-100) of each (answer, correct_answer) pair, case-insensitive.
+
+    Args:
+        pairs (sequence): (answer, correct_answer) string pairs
+
+    Returns:
+        list: One integer similarity per pair, equal to
+        ``fuzz.ratio(answer.lower(), correct_answer.lower())``
+    """
+    answers = [answer.lower() for answer, _ in pairs]
+    expected = [correct.lower() for _, correct in pairs]
+    if cpdist is not None and len(pairs) > 1:
+        distances = cpdist(answers, expected, scorer=Indel.distance, dtype=numpy.int32).tolist()
+    else:
+        distances = [Indel.distance(answer, correct) for answer, correct in zip(answers, expected)]
+    return [_similarity(answer, correct, distance)
+            for answer, correct, distance in zip(answers, expected, distances)]
+
+def grade_quiz_answer(question: Dict[str, Any], answer: str,
+                      similarity: Optional[int] = None) -> Tuple[bool, int]:
+    """
+    Grade one answer to a generated quiz question.
+
+    Args:
+        question (dict): Question with type, correct_answer and points
+        answer (str): The user's answer
+        similarity (int): Precomputed translation similarity, if batched
+
+    Returns:
+        tuple: (is_correct, points_earned)
+    """
+    is_correct = False
+    points_earned = 0
+
+    # Evaluate answer based on question type
+    if question['type'] in ['multiple_choice', 'conversation']:
+        is_correct = answer == question['correct_answer']
+        points_earned = question['points'] if is_correct else 0
+    elif question['type'] == 'translation':
+        # Use fuzzy matching for translations
+        if similarity is None:
+            similarity = translation_similarities([(answer, question['correct_answer'])])[0]
+        is_correct = similarity >= TRANSLATION_PASS_SIMILARITY
+        points_earned = int(question['points'] * (similarity / 100))
+    elif question['type'] == 'fill_blank':
+        # Case-insensitive exact match for fill in the blank
+        is_correct = answer.lower() == question['correct_answer'].lower()
+        points_earned = question['points'] if is_correct else 0
+    elif question['type'] == 'grammar':
+        is_correct = answer == question['correct_answer']
+        points_earned = question['points'] if is_correct else 0
+
+    return is_correct, points_earned
+
+def grade_quiz_answers(questions: Sequence[Dict[str, Any]],
+                       answers: Dict[int, str]) -> List[Dict[str, Any]]:
+    """
+    Grade a set of answers to one quiz in a single pass.
+
+    Args:
+        questions (sequence): The quiz's questions
+        answers (dict): Answer per question index
+
+    Returns:
+        list: For each answered question, in index order, a dict with
+        question_index, user_answer, correct and points_earned
+    """
+    indexes = sorted(answers)
+    translation_indexes = [i for i in indexes if questions[i]['type'] == 'translation']
+    similarities = dict(zip(translation_indexes, translation_similarities(
+        [(answers[i], questions[i]['correct_answer']) for i in translation_indexes]
+    )))
+
+    results = []
+    for i in indexes:
+        is_correct, points_earned = grade_quiz_answer(questions[i], answers[i], similarities.get(i))
+        results.append({
+            'question_index': i,
+            'user_answer': answers[i],
+            'correct': is_correct,
+            'points_earned': points_earned
+        })
+    return results
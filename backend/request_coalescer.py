@@ -0,0 +1,136 @@
+# backend/request_coalescer.py
+"""
+Single-flight request coalescing.
+
+When several threads ask for the same expensive result at the same time,
+only the first caller (the leader) does the work. The others wait for the
+leader to finish and receive the same result or the same exception. A
+follower with a deadline stops waiting when its own budget runs out,
+while the leader's call carries on for the others.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from request_deadline import Deadline, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+def make_key(*parts: Any) -> str:
+    """
+    Build a stable coalescing key from JSON-serializable parts.
+
+    Returns:
+        str: SHA-256 hex digest of the serialized parts
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class _Call:
+    """An in-flight call that followers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.followers = 0
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share the same key into one execution.
+
+    Counters:
+    - ``misses``: calls that executed the function (leaders)
+    - ``hits``: calls that shared a leader's result instead of executing
+    - ``follower_timeouts``: followers whose deadline ran out while waiting
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the coalescer.
+
+        Args:
+            name (str): Name used in logs and statistics
+        """
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'errors': 0,
+            'follower_timeouts': 0
+        }
+
+    def do(self, key: str, fn: Callable[..., Any], *args, deadline: Optional[Deadline] = None, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` unless an identical call is already in flight.
+
+        Args:
+            key (str): Coalescing key identifying identical calls
+            fn (callable): Function to execute
+            deadline (Deadline): Caller's budget, bounding how long it waits as
+                a follower (not passed to ``fn``)
+
+        Returns:
+            The function result, shared with any concurrent callers
+
+        Raises:
+            DeadlineExceeded: If the caller's deadline runs out while waiting for the leader
+            Exception: The exception raised by the leader's call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                self._stats['hits'] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._stats['misses'] += 1
+                leader = True
+
+        if not leader:
+            if not call.done.wait(deadline.remaining() if deadline else None):
+                with self._lock:
+                    self._stats['follower_timeouts'] += 1
+                raise DeadlineExceeded(f"{self.name} call")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._stats['errors'] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            if call.followers:
+                logger.debug(f"{self.name}: shared one call with {call.followers} waiting requests")
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            dict: Hit/miss/error counters and the number of calls in flight
+        """
+        with self._lock:
+            total = self._stats['hits'] + self._stats['misses']
+            return {
+                'name': self.name,
+                'in_flight': len(self._calls),
+                'calls_saved': self._stats['hits'],
+                'hit_rate': round(self._stats['hits'] / total, 4) if total else 0.0,
+                **self._stats
+            }
@@ -0,0 +1,155 @@
+# backend/request_deadline.py
+"""
+Per-request deadline budgets.
+
+Each request gets one deadline, taken from the X-Request-Timeout header or
+an endpoint default. The LLM, vector search and database layers read the
+remaining budget from it, so their timeouts add up to what the client will
+actually wait instead of each layer applying its own fixed timeout. Retries
+and fallbacks that cannot finish in the remaining budget are skipped.
+"""
+
+import contextvars
+import logging
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = 'X-Request-Timeout'
+
+class DeadlineExceeded(Exception):
+    """Raised when the request deadline has passed or cannot cover an operation"""
+
+    def __init__(self, operation: str = 'request'):
+        super().__init__(f"Deadline exceeded before {operation}")
+        self.operation = operation
+
+class Deadline:
+    """
+    A point in time by which the current request must finish.
+
+    Args:
+        budget (float): Seconds from now until the deadline
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        # First operation refused because the deadline had passed
+        self.refused = None
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline (never negative)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed"""
+        return self.remaining() <= 0
+
+    def can_afford(self, seconds: float) -> bool:
+        """Whether an operation taking ``seconds`` can finish before the deadline"""
+        return self.remaining() >= seconds
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """
+        Timeout to use for a blocking call.
+
+        Args:
+            cap (float): The layer's own timeout, used when it is shorter
+
+        Returns:
+            float: Seconds the call may block
+        """
+        remaining = self.remaining()
+        return remaining if cap is None else min(cap, remaining)
+
+    def refuses(self, operation: str = 'request') -> bool:
+        """Whether ``operation`` must be refused because the deadline has passed; records the refusal"""
+        if not self.expired:
+            return False
+        if self.refused is None:
+            self.refused = operation
+        return True
+
+    def check(self, operation: str = 'request'):
+        """
+        Raises:
+            DeadlineExceeded: If the deadline has passed
+        """
+        if self.refuses(operation):
+            raise DeadlineExceeded(operation)
+
+_current_deadline = contextvars.ContextVar('request_deadline', default=None)
+
+def parse_budget(header_value: Optional[str], default: float, maximum: float) -> float:
+    """
+    Get the budget for a request from the header value.
+
+    Args:
+        header_value (str): Raw X-Request-Timeout value in seconds, or None
+        default (float): Budget used when the header is missing or invalid
+        maximum (float): Upper bound for client-supplied budgets
+
+    Returns:
+        float: Budget in seconds
+    """
+    if not header_value:
+        return default
+    try:
+        budget = float(header_value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid {DEADLINE_HEADER} header: {header_value!r}")
+        return default
+    if budget <= 0:
+        return default
+    return min(budget, maximum)
+
+def start_deadline(budget: float) -> Deadline:
+    """Start the deadline for the current request"""
+    deadline = Deadline(budget)
+    _current_deadline.set(deadline)
+    return deadline
+
+def get_deadline() -> Optional[Deadline]:
+    """Deadline of the current request, or None outside a request"""
+    return _current_deadline.get()
+
+def clear_deadline():
+    """Forget the current request's deadline"""
+    _current_deadline.set(None)
+
+def raise_if_refused():
+    """
+    Re-raise a failure caused by the current request's deadline.
+
+    Catch-all handlers call this so that a statement refused at the deadline
+    (or a SQLite query interrupted at it) surfaces as DeadlineExceeded
+    instead of an empty result.
+
+    Raises:
+        DeadlineExceeded: If the current deadline refused an operation
+    """
+    deadline = get_deadline()
+    if deadline is not None and deadline.refused:
+        raise DeadlineExceeded(deadline.refused)
+
+def deadline_failure(status_code: int) -> Optional[DeadlineExceeded]:
+    """
+    Get the deadline error behind a failed response.
+
+    Only server errors count (503 and 504 already describe the failure):
+    a response that succeeded is kept even if a best-effort write was
+    refused after the work was done.
+
+    Args:
+        status_code (int): Status of the response the endpoint produced
+
+    Returns:
+        DeadlineExceeded: The refusal that failed the request, or None
+    """
+    deadline = get_deadline()
+    if deadline is None or not deadline.refused or status_code < 500 or status_code in (503, 504):
+        return None
+    return DeadlineExceeded(deadline.refused)
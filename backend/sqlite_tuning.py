@@ -0,0 +1,178 @@
+# backend/sqlite_tuning.py
+"""
+SQLite performance settings applied to every new connection.
+
+By default SQLite uses a rollback journal (readers block behind a
+writer) and fsyncs on every commit. The pragmas here switch the database
+to write-ahead logging with synchronous=NORMAL, so readers run alongside
+a writer and commits no longer wait for an fsync (durability is kept
+across application crashes; only a power loss can drop the most recent
+commits). mmap_size, cache_size and temp_store keep hot pages and
+temporary tables in memory, and busy_timeout makes a writer wait for the
+lock instead of failing with "database is locked".
+
+In WAL mode the log is folded back into the database file by automatic
+checkpoints, which readers can starve; WalCheckpointer runs an explicit
+checkpoint periodically from a background thread so the log stays small.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+TEMP_STORE_MODES = ('DEFAULT', 'FILE', 'MEMORY')
+CHECKPOINT_MODES = ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE')
+
+def sqlite_pragmas(journal_mode: str = 'WAL', synchronous: str = 'NORMAL', mmap_size: int = 0,
+                   cache_size: int = -2000, temp_store: str = 'DEFAULT',
+                   busy_timeout_ms: int = 5000) -> Dict[str, Any]:
+    """
+    Validate settings and return them as an ordered pragma -> value mapping.
+
+    Args:
+        journal_mode (str): Journal mode, e.g. WAL
+        synchronous (str): OFF, NORMAL, FULL or EXTRA
+        mmap_size (int): Bytes of the database file to memory-map (0 disables)
+        cache_size (int): Page cache size; negative values are KiB, positive values pages
+        temp_store (str): DEFAULT, FILE or MEMORY
+        busy_timeout_ms (int): Milliseconds to wait for a lock
+
+    Raises:
+        ValueError: If a mode is not one SQLite accepts
+    """
+    settings = {
+        'journal_mode': (journal_mode.upper(), JOURNAL_MODES),
+        'synchronous': (synchronous.upper(), SYNCHRONOUS_MODES),
+        'temp_store': (temp_store.upper(), TEMP_STORE_MODES)
+    }
+    for name, (value, allowed) in settings.items():
+        if value not in allowed:
+            raise ValueError(f"Invalid SQLite {name} {value!r}; expected one of {', '.join(allowed)}")
+    # busy_timeout first so the journal_mode switch can wait for other connections
+    return {
+        'busy_timeout': int(busy_timeout_ms),
+        'journal_mode': settings['journal_mode'][0],
+        'synchronous': settings['synchronous'][0],
+        'mmap_size': int(mmap_size),
+        'cache_size': int(cache_size),
+        'temp_store': settings['temp_store'][0]
+    }
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]):
+    """Run the pragmas on every connection the engine opens"""
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+class WalCheckpointer:
+    """Periodically checkpoints a SQLite database's write-ahead log"""
+
+    def __init__(self, engine: Engine, interval: float = 300, mode: str = 'PASSIVE'):
+        """
+        Initialize the checkpointer. Call start() to begin the background job.
+
+        Args:
+            engine (Engine): SQLite engine in WAL mode
+            interval (float): Seconds between checkpoints
+            mode (str): PASSIVE, FULL, RESTART or TRUNCATE
+
+        Raises:
+            ValueError: If mode is not a checkpoint mode
+        """
+        mode = mode.upper()
+        if mode not in CHECKPOINT_MODES:
+            raise ValueError(f"Invalid WAL checkpoint mode {mode!r}; expected one of {', '.join(CHECKPOINT_MODES)}")
+        self.engine = engine
+        self.interval = interval
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {
+            'checkpoints': 0,
+            'busy': 0,
+            'errors': 0,
+            'last_log_frames': None,
+            'last_checkpointed_frames': None,
+            'last_duration_ms': None,
+            'last_run': None
+        }
+
+    def checkpoint(self) -> Optional[Dict[str, int]]:
+        """
+        Run one checkpoint now.
+
+        Returns:
+            dict: busy flag, frames in the log and frames checkpointed,
+            or None if the checkpoint failed
+        """
+        start = time.perf_counter()
+        try:
+            with self.engine.connect() as conn:
+                busy, log_frames, checkpointed = conn.execute(text(f'PRAGMA wal_checkpoint({self.mode})')).one()
+        except Exception as e:
+            logger.error(f"WAL checkpoint failed: {e}")
+            with self._lock:
+                self._stats['errors'] += 1
+            return None
+
+        with self._lock:
+            self._stats['checkpoints'] += 1
+            self._stats['busy'] += 1 if busy else 0
+            self._stats['last_log_frames'] = log_frames
+            self._stats['last_checkpointed_frames'] = checkpointed
+            self._stats['last_duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            self._stats['last_run'] = time.time()
+        return {'busy': busy, 'log_frames': log_frames, 'checkpointed_frames': checkpointed}
+
+    def start(self) -> bool:
+        """
+        Start the background checkpoint job.
+
+        Returns:
+            bool: False if it was already running
+        """
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='sqlite-wal-checkpoint', daemon=True)
+            self._thread.start()
+        logger.info(f"WAL checkpoint job started ({self.mode} every {self.interval:g}s)")
+        return True
+
+    def stop(self):
+        """Stop the background job and wait for it to exit"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.checkpoint()
+
+    def stats(self) -> Dict[str, Any]:
+        """Checkpoint counters and the outcome of the last run"""
+        with self._lock:
+            return {
+                **self._stats,
+                'mode': self.mode,
+                'interval': self.interval,
+                'running': self._thread is not None
+            }
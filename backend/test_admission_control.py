@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the priority admission controller
+"""
+
+import threading
+import time
+
+from admission_control import (
+    AdmissionController, AdmissionRejected, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+)
+
+def make_controller(max_in_flight=1, queue_limit=5, queue_timeout=2.0, background_limit=None):
+    return AdmissionController(
+        'test',
+        max_in_flight=max_in_flight,
+        priorities=(PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND),
+        queue_limits={PRIORITY_INTERACTIVE: queue_limit, PRIORITY_BACKGROUND: queue_limit},
+        queue_timeouts={PRIORITY_INTERACTIVE: queue_timeout, PRIORITY_BACKGROUND: queue_timeout},
+        class_limits={PRIORITY_BACKGROUND: background_limit} if background_limit else None
+    )
+
+def wait_for_depth(controller, priority, depth):
+    while controller.stats()['classes'][priority]['queue_depth'] < depth:
+        time.sleep(0.001)
+
+def test_in_flight_limit():
+    """Test that no more than max_in_flight calls run at once"""
+    controller = make_controller(max_in_flight=3, queue_limit=50)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with controller.slot(PRIORITY_INTERACTIVE):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(peak) == 3
+    stats = controller.stats()
+    assert stats['in_flight'] == 0
+    assert stats['classes'][PRIORITY_INTERACTIVE]['admitted'] == 20
+    assert stats['classes'][PRIORITY_INTERACTIVE]['queued'] > 0
+    print(f"✅ Peak concurrency held at {max(peak)}")
+
+def test_interactive_served_before_background():
+    """Test that a freed slot goes to interactive waiters first"""
+    controller = make_controller()
+    order = []
+    controller.acquire(PRIORITY_INTERACTIVE)
+
+    def waiter(priority, label):
+        with controller.slot(priority):
+            order.append(label)
+
+    background = threading.Thread(target=waiter, args=(PRIORITY_BACKGROUND, 'background'))
+    background.start()
+    wait_for_depth(controller, PRIORITY_BACKGROUND, 1)
+    interactive = threading.Thread(target=waiter, args=(PRIORITY_INTERACTIVE, 'interactive'))
+    interactive.start()
+    wait_for_depth(controller, PRIORITY_INTERACTIVE, 1)
+
+    controller.release(PRIORITY_INTERACTIVE)
+    background.join()
+    interactive.join()
+    assert order == ['interactive', 'background']
+    print("✅ Interactive waiters are admitted before background waiters")
+
+def test_background_class_limit():
+    """Test that background calls cannot take every slot"""
+    controller = make_controller(max_in_flight=2, queue_timeout=0.05, background_limit=1)
+    controller.acquire(PRIORITY_BACKGROUND)
+    try:
+        controller.acquire(PRIORITY_BACKGROUND)
+        assert False, "Expected background call to wait and time out"
+    except AdmissionRejected as e:
+        assert e.reason == 'queue timeout'
+    controller.acquire(PRIORITY_INTERACTIVE, timeout=0)
+    assert controller.stats()['in_flight'] == 2
+    print("✅ Background calls leave slots for interactive calls")
+
+def test_bounded_queue_and_timeouts():
+    """Test rejection on a full queue and after the queue-time limit"""
+    controller = make_controller(queue_limit=1, queue_timeout=0.2)
+    controller.acquire(PRIORITY_INTERACTIVE)
+
+    def queue_background():
+        try:
+            controller.acquire(PRIORITY_BACKGROUND)
+        except AdmissionRejected:
+            pass
+
+    queued = threading.Thread(target=queue_background)
+    queued.start()
+    wait_for_depth(controller, PRIORITY_BACKGROUND, 1)
+    try:
+        controller.acquire(PRIORITY_BACKGROUND)
+        assert False, "Expected queue-full rejection"
+    except AdmissionRejected as e:
+        assert e.reason == 'queue full' and e.retry_after > 0
+
+    start = time.monotonic()
+    try:
+        controller.acquire(PRIORITY_INTERACTIVE, timeout=0.05)
+        assert False, "Expected queue timeout"
+    except AdmissionRejected as e:
+        assert e.reason == 'queue timeout'
+    assert time.monotonic() - start < 0.15
+    queued.join()
+
+    stats = controller.stats()['classes']
+    assert stats[PRIORITY_BACKGROUND]['rejected_queue_full'] == 1
+    assert stats[PRIORITY_BACKGROUND]['rejected_timeout'] == 1
+    assert stats[PRIORITY_INTERACTIVE]['rejected_timeout'] == 1
+    assert stats[PRIORITY_BACKGROUND]['max_queue_depth'] == 1
+    assert stats[PRIORITY_INTERACTIVE]['wait_ms_max'] >= 50
+    assert stats[PRIORITY_INTERACTIVE]['queue_depth'] == 0
+    print("✅ Queues are bounded and waits are limited")
+
+if __name__ == "__main__":
+    test_in_flight_limit()
+    test_interactive_served_before_background()
+    test_background_class_limit()
+    test_bounded_queue_and_timeouts()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the in-memory and on-disk response caches
+"""
+
+import os
+import tempfile
+import time
+
+from cache_service import TTLCache, SQLiteCacheStore, estimate_size
+
+def test_get_and_set():
+    """Test basic hit/miss behaviour"""
+    cache = TTLCache('test', ttl=60)
+    assert cache.get('missing') is None
+    cache.set('a', {'translation': 'hola'})
+    assert cache.get('a') == {'translation': 'hola'}
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    print("✅ Basic get/set works")
+
+def test_ttl_expiry():
+    """Test that entries expire after the cache TTL"""
+    cache = TTLCache('test', ttl=0.05)
+    cache.set('a', 'value')
+    assert 'a' in cache
+    time.sleep(0.1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+    assert cache.stats()['expirations'] == 1
+    print("✅ Entries expire after TTL")
+
+def test_entry_limit_evicts_least_recently_used():
+    """Test LRU eviction when the entry limit is reached"""
+    cache = TTLCache('test', ttl=60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')  # 'b' is now least recently used
+    cache.set('c', 3)
+
+    assert 'a' in cache
+    assert 'b' not in cache
+    assert 'c' in cache
+    assert cache.stats()['evictions'] == 1
+    print("✅ Entry limit evicts least recently used entry")
+
+def test_byte_limit():
+    """Test that the total size limit is enforced"""
+    payload = 'x' * 100
+    cache = TTLCache('test', ttl=60, max_bytes=estimate_size(payload) * 2)
+    cache.set('a', payload)
+    cache.set('b', payload)
+    cache.set('c', payload)
+
+    assert len(cache) == 2
+    assert 'a' not in cache
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+    # A single value larger than the whole cache is rejected
+    assert cache.set('huge', 'x' * 1000) is False
+    assert 'huge' not in cache
+    print("✅ Byte limit is enforced")
+
+def test_overwrite_updates_size():
+    """Test that overwriting a key replaces its accounted size"""
+    cache = TTLCache('test', ttl=60)
+    cache.set('a', 'x' * 10)
+    cache.set('a', 'x' * 20)
+    assert len(cache) == 1
+    assert cache.stats()['bytes'] == estimate_size('x' * 20)
+    print("✅ Overwrite updates accounted size")
+
+def test_disk_store_persists_across_instances():
+    """Test that a new store instance (e.g. after a restart) sees existing entries"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'cache.db')
+        SQLiteCacheStore(path, ttl=60).set('key', {'translation': 'hola'})
+
+        store = SQLiteCacheStore(path, ttl=60)
+        assert store.get('key') == {'translation': 'hola'}
+        assert store.get('other') is None
+    print("✅ Disk store persists across instances")
+
+def test_disk_store_compaction():
+    """Test that compaction removes expired rows and trims to the entry limit"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = SQLiteCacheStore(os.path.join(tmp_dir, 'cache.db'), ttl=60, max_entries=2)
+        for key in ['a', 'b', 'c']:
+            store.set(key, key)
+            time.sleep(0.01)
+        store.get('a')  # 'b' is now least recently accessed
+
+        assert store.compact() == 1
+        assert store.get('b') is None
+        assert store.get('a') == 'a'
+        assert store.get('c') == 'c'
+
+        store.ttl = 0
+        store.set('d', 'd')
+        assert store.get('d') is None
+        store.compact()
+        assert store.stats()['entries'] == 2
+    print("✅ Disk store compaction works")
+
+def test_memory_cache_falls_through_to_disk():
+    """Test that a memory miss is answered by the backing store and promoted"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'cache.db')
+        TTLCache('first', ttl=60, backing_store=SQLiteCacheStore(path, ttl=60)).set('k', 'v')
+
+        cache = TTLCache('second', ttl=60, backing_store=SQLiteCacheStore(path, ttl=60))
+        assert cache.get('k') == 'v'
+        assert cache.get('k') == 'v'
+
+        stats = cache.stats()
+        assert stats['l2_hits'] == 1
+        assert stats['hits'] == 1
+    print("✅ Memory cache falls through to disk store")
+
+if __name__ == "__main__":
+    test_get_and_set()
+    test_ttl_expiry()
+    test_entry_limit_evicts_least_recently_used()
+    test_byte_limit()
+    test_overwrite_updates_size()
+    test_disk_store_persists_across_instances()
+    test_disk_store_compaction()
+    test_memory_cache_falls_through_to_disk()
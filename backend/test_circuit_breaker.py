@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM circuit breaker and retry backoff
+"""
+
+import time
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError, backoff_delay
+
+def _fail(breaker, count):
+    """Record ``count`` allowed calls that failed"""
+    for _ in range(count):
+        breaker.allow()
+        breaker.record_failure()
+
+def test_opens_when_failure_rate_exceeded():
+    """Test that the circuit opens once enough calls in the window fail"""
+    breaker = CircuitBreaker('test', failure_rate=0.5, window=60, min_calls=4, cooldown=30)
+    breaker.allow()
+    breaker.record_success()
+    _fail(breaker, 2)
+    assert breaker.state == 'closed'  # 3 calls, below min_calls
+    _fail(breaker, 1)
+    assert breaker.state == 'open'
+
+    try:
+        breaker.allow()
+        assert False, "Expected CircuitOpenError"
+    except CircuitOpenError as e:
+        assert 0 < e.retry_after <= 30
+    stats = breaker.stats()
+    assert stats['rejected'] == 1
+    assert stats['times_opened'] == 1
+    print("✅ Circuit opens at the failure rate and rejects calls")
+
+def test_stays_closed_below_failure_rate():
+    """Test that occasional failures do not open the circuit"""
+    breaker = CircuitBreaker('test', failure_rate=0.5, min_calls=4)
+    for _ in range(6):
+        breaker.allow()
+        breaker.record_success()
+    _fail(breaker, 2)
+    assert breaker.state == 'closed'
+    print("✅ Circuit stays closed below the failure rate")
+
+def test_half_open_trial_closes_circuit():
+    """Test that a successful trial call after the cool-down closes the circuit"""
+    breaker = CircuitBreaker('test', min_calls=2, cooldown=0.1, half_open_max_calls=1)
+    _fail(breaker, 2)
+    assert breaker.state == 'open'
+    time.sleep(0.15)
+    assert breaker.state == 'half_open'
+
+    breaker.allow()
+    try:
+        breaker.allow()  # only one trial call at a time
+        assert False, "Expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    print("✅ Successful trial call closes the circuit")
+
+def test_half_open_failure_reopens_circuit():
+    """Test that a failed trial call re-opens the circuit for another cool-down"""
+    breaker = CircuitBreaker('test', min_calls=2, cooldown=0.1)
+    _fail(breaker, 2)
+    time.sleep(0.15)
+    _fail(breaker, 1)
+    assert breaker.state == 'open'
+    assert breaker.stats()['times_opened'] == 2
+    print("✅ Failed trial call re-opens the circuit")
+
+def test_check_does_not_reserve_trial_call():
+    """Test that check() fails fast only while the circuit is open"""
+    breaker = CircuitBreaker('test', min_calls=2, cooldown=0.1)
+    breaker.check()
+    _fail(breaker, 2)
+    try:
+        breaker.check()
+        assert False, "Expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+    time.sleep(0.15)
+    breaker.check()
+    breaker.allow()
+    print("✅ check() fails fast without taking a trial slot")
+
+def test_abandoned_stream_releases_trial_call():
+    """Test that a half-open stream closed before finishing frees its trial slot"""
+    breaker = CircuitBreaker('test', min_calls=2, cooldown=0.1, half_open_max_calls=1)
+    _fail(breaker, 2)
+    time.sleep(0.15)
+
+    def stream():
+        with breaker.attempt():
+            yield 'first chunk'
+            yield 'second chunk'
+
+    chunks = stream()
+    assert next(chunks) == 'first chunk'
+    chunks.close()  # client disconnected mid-stream
+    assert breaker.state == 'half_open'
+
+    with breaker.attempt():
+        pass
+    assert breaker.state == 'closed'
+
+    _fail(breaker, 1)  # 1 of 2 calls failed
+    time.sleep(0.15)
+    try:
+        with breaker.attempt():
+            raise ValueError('upstream error')
+    except ValueError:
+        pass
+    assert breaker.state == 'open'
+    print("✅ Abandoned streams release their trial call")
+
+def test_backoff_delay_is_bounded_and_jittered():
+    """Test exponential backoff with full jitter"""
+    delays = [backoff_delay(3, base=0.5, cap=8) for _ in range(200)]
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(set(delays)) > 1
+    assert all(backoff_delay(10, base=0.5, cap=2) <= 2 for _ in range(50))
+    print("✅ Backoff delays are jittered and capped")
+
+if __name__ == "__main__":
+    test_opens_when_failure_rate_exceeded()
+    test_stays_closed_below_failure_rate()
+    test_half_open_trial_closes_circuit()
+    test_half_open_failure_reopens_circuit()
+    test_check_does_not_reserve_trial_call()
+    test_abandoned_stream_releases_trial_call()
+    test_backoff_delay_is_bounded_and_jittered()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test script for the deterministic, precomputed word of the day
+"""
+
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy.orm import sessionmaker
+
+from daily_word import DailyWordPublisher, daily_choice_index
+from models import Base, create_db_engine
+from db_service import DatabaseService
+
+class FixedClockPublisher(DailyWordPublisher):
+    """Publisher whose clock the test controls"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.clock = datetime(2025, 3, 14, 23, 0, tzinfo=timezone.utc)
+
+    def now(self):
+        return self.clock
+
+def test_choice_is_deterministic():
+    """Test that the pick depends only on the date and language"""
+    day = date(2025, 3, 14)
+    assert daily_choice_index(day, 'es', 100) == daily_choice_index(day, 'es', 100)
+    picks = {daily_choice_index(day + timedelta(days=i), 'es', 100) for i in range(60)}
+    assert len(picks) > 30
+    assert all(0 <= daily_choice_index(day, language, 7) < 7 for language in ('es', 'fr', 'ja'))
+    print("✅ Daily pick is deterministic per date and language")
+
+def test_publisher_caches_until_midnight():
+    """Test that the response is built once per day and expires at midnight"""
+    loads = []
+
+    def load(language, day):
+        loads.append((language, day))
+        return {'word': f'{language}-{day.isoformat()}'} if language != 'xx' else None
+
+    publisher = FixedClockPublisher(load, languages=lambda: ['es', 'fr', 'xx'], tz=timezone.utc)
+    first = publisher.get('es')
+    assert publisher.get('es') is first and len(loads) == 1
+    assert json.loads(first.body) == {'word': 'es-2025-03-14', 'date': '2025-03-14'}
+    assert first.max_age(publisher.clock.timestamp()) == 3600
+    assert publisher.get('xx') is None
+
+    publisher.clock += timedelta(hours=1, seconds=1)
+    second = publisher.get('es')
+    assert second.day == date(2025, 3, 15) and second.etag != first.etag
+    assert publisher.materialize_all() == 2
+    stats = publisher.stats()
+    assert stats['languages'] == ['es', 'fr'] and stats['hits'] == 1
+    print("✅ Publisher serves one response per language per day")
+
+def test_daily_word_is_stored():
+    """Test that the day's word is chosen once and kept when words are added"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'daily.db')}")
+        Base.metadata.create_all(bind=engine)
+        service = DatabaseService(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+        for i in range(20):
+            service.add_word_of_day('es', {'word': f'palabra{i}'})
+        service.add_word_of_day('fr', {'word': 'mot'})
+        day = date(2025, 3, 14)
+
+        word = service.get_daily_word('es', day)['word']
+        assert word == f'palabra{daily_choice_index(day, "es", 20)}'
+        for i in range(20, 40):
+            service.add_word_of_day('es', {'word': f'palabra{i}'})
+        assert service.get_daily_word('es', day)['word'] == word
+        assert service.get_daily_word('de', day) is None
+        assert service.get_word_languages() == ['es', 'fr']
+
+        other = DatabaseService(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+        assert other.get_daily_word('es', day)['word'] == word
+        service.close_session()
+        other.close_session()
+        engine.dispose()
+    print("✅ The day's word is stored and shared")
+
+if __name__ == "__main__":
+    test_choice_is_deterministic()
+    test_publisher_caches_until_midnight()
+    test_daily_word_is_stored()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for thread-safe database sessions under concurrent flashcard reviews
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, Flashcard, FlashcardReview, create_db_engine
+from db_service import DatabaseService, QuizAnswerConflict
+
+THREADS = 12
+REVIEWS_PER_THREAD = 25
+FLASHCARDS = 4
+
+def make_service(path):
+    engine = create_db_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(bind=engine)
+    return DatabaseService(sessionmaker(autocommit=False, autoflush=False, bind=engine)), engine
+
+def test_sessions_are_per_thread():
+    """Test that each thread gets its own session and close_session discards it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service, engine = make_service(os.path.join(tmp, 'sessions.db'))
+        sessions = []
+
+        def grab():
+            sessions.append(service.get_session())
+            assert service.get_session() is sessions[-1]
+            service.close_session()
+
+        threads = [threading.Thread(target=grab) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(session) for session in sessions}) == 4
+
+        first = service.get_session()
+        service.close_session()
+        assert service.get_session() is not first
+        service.close_session()
+        engine.dispose()
+    print("✅ Sessions are scoped to the calling thread")
+
+def test_concurrent_flashcard_reviews():
+    """Test that reviews from many threads are all counted"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service, engine = make_service(os.path.join(tmp, 'reviews.db'))
+        card_ids = [f'card-{i}' for i in range(FLASHCARDS)]
+        for card_id in card_ids:
+            assert service.save_flashcard('alice', {
+                'id': card_id,
+                'translation': {'originalText': card_id, 'translatedText': card_id, 'sourceLang': 'en', 'targetLang': 'es'}
+            })
+        service.close_session()
+
+        failures = []
+
+        def review(worker):
+            for i in range(REVIEWS_PER_THREAD):
+                card_id = card_ids[(worker + i) % FLASHCARDS]
+                # Each iteration stands in for one request: review, then release the session
+                if not service.review_flashcard('alice', card_id, correct=(i % 3 != 0)):
+                    failures.append((worker, i))
+                service.close_session()
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=review, args=(worker,)) for worker in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        total = THREADS * REVIEWS_PER_THREAD
+        assert failures == []
+        db = service.get_session()
+        assert db.query(FlashcardReview).count() == total
+        cards = db.query(Flashcard).all()
+        assert sum(card.review_count for card in cards) == total
+        for card in cards:
+            reviews = db.query(FlashcardReview).filter(FlashcardReview.flashcard_id == card.id).all()
+            assert card.review_count == len(reviews)
+            assert abs(card.success_rate - sum(r.correct for r in reviews) / len(reviews)) < 1e-9
+        service.close_session()
+        engine.dispose()
+    print(f"✅ {total} concurrent reviews from {THREADS} threads all recorded ({total / elapsed:.0f} reviews/s)")
+
+def test_concurrent_answers_to_one_question():
+    """Test that only one of two racing submissions for a question is recorded"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service, engine = make_service(os.path.join(tmp, 'quiz.db'))
+        questions = [{'text': f'q{i}', 'correct_answer': 'a', 'points': 10} for i in range(3)]
+        assert service.create_quiz('alice', 'quiz-1', 'es', 'beginner', 'mixed', questions)
+        service.close_session()
+
+        barrier = threading.Barrier(2)
+        outcomes = []
+
+        def submit(answer):
+            # Both requests passed the "already answered" check before either wrote
+            barrier.wait()
+            try:
+                result = service.record_quiz_answer('alice', 'quiz-1', 0, answer, answer == 'a', 10 if answer == 'a' else 0)
+                outcomes.append('recorded' if result else 'failed')
+            except QuizAnswerConflict as e:
+                outcomes.append(str(e))
+            finally:
+                service.close_session()
+
+        threads = [threading.Thread(target=submit, args=(answer,)) for answer in ('a', 'b')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(outcomes) == ['Question already answered', 'recorded']
+        assert service.get_quiz('alice', 'quiz-1')['answered'] == [0]
+
+        assert service.record_quiz_answers('alice', 'quiz-1', [
+            {'question_index': i, 'user_answer': 'a', 'correct': True, 'points_earned': 10} for i in (1, 2)
+        ])['completed']
+        try:
+            service.record_quiz_answer('alice', 'quiz-1', 2, 'a', True, 10)
+            assert False, "Expected QuizAnswerConflict"
+        except QuizAnswerConflict as e:
+            assert str(e) == 'Quiz already completed'
+        assert service.record_quiz_answer('alice', 'missing', 0, 'a', True, 10) is None
+        service.close_session()
+        engine.dispose()
+    print("✅ Racing answers to one question record it once and report a conflict")
+
+if __name__ == "__main__":
+    test_sessions_are_per_thread()
+    test_concurrent_flashcard_reviews()
+    test_concurrent_answers_to_one_question()
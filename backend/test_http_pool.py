@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled LLM HTTP session
+"""
+
+from config import LLM_HTTP_CONNECT_TIMEOUT, LLM_HTTP_POOL_SIZE, LLM_HTTP_READ_TIMEOUT
+from http_pool import close_http_session, get_http_session, get_http_timeout
+
+def test_session_is_shared():
+    """Test that every call site gets the same pooled session"""
+    close_http_session()
+    session = get_http_session()
+    assert get_http_session() is session
+
+    adapter = session.get_adapter('https://openrouter.ai/api/v1/chat/completions')
+    assert adapter._pool_maxsize == LLM_HTTP_POOL_SIZE
+    close_http_session()
+    assert get_http_session() is not session
+    print("✅ Pooled session is shared and recreated after close")
+
+def test_timeouts():
+    """Test connect/read timeout configuration"""
+    assert get_http_timeout() == (LLM_HTTP_CONNECT_TIMEOUT, LLM_HTTP_READ_TIMEOUT)
+    assert get_http_timeout(10) == (LLM_HTTP_CONNECT_TIMEOUT, 10)
+    print("✅ Timeouts use configured connect and read values")
+
+if __name__ == "__main__":
+    test_session_is_shared()
+    test_timeouts()
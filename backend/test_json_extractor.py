@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental parsing of LLM JSON responses
+"""
+
+import json
+
+from json_extractor import (
+    IncrementalObjectParser, JSONExtractionError, extract_json, extract_json_object
+)
+
+SAMPLE = {
+    "main_translation": "hola, amigo",
+    "pronunciation": {"ipa": "ˈo.la", "syllables": "ho-la"},
+    "alternatives": [{"text": "buenas {tardes}", "confidence": 80}],
+    "additional": {"etymology": "quote \" and brace }"}
+}
+
+def test_sections_complete_in_order():
+    """Test that members are emitted as soon as they are complete"""
+    text = '```json\n' + json.dumps(SAMPLE, ensure_ascii=False) + '\n```'
+    parser = IncrementalObjectParser()
+    seen = []
+    for i in range(0, len(text), 5):
+        for key, value in parser.feed(text[i:i + 5]):
+            seen.append(key)
+            assert value == SAMPLE[key]
+
+    assert seen == list(SAMPLE.keys())
+    assert parser.finished
+    assert parser.result() == SAMPLE
+    print("✅ Sections are emitted in order as they complete")
+
+def test_first_section_available_before_end():
+    """Test that the first member is available before the object is closed"""
+    parser = IncrementalObjectParser()
+    completed = parser.feed('{"main_translation": "hola", "grammar": {"rules": [')
+    assert completed == [("main_translation", "hola")]
+    assert not parser.finished
+    print("✅ First section is available from a partial stream")
+
+def test_extract_ignores_fences_and_prose():
+    """Test extraction from fenced JSON surrounded by prose containing braces"""
+    text = ('Sure! Here is the {requested} analysis:\n```json\n'
+            + json.dumps(SAMPLE, ensure_ascii=False)
+            + '\n```\nLet me know if you need {anything} else.')
+    assert extract_json_object(text, ['main_translation']) == SAMPLE
+    print("✅ Fences and surrounding prose are ignored")
+
+def test_extract_salvages_damaged_objects():
+    """Test recovery of trailing commas and truncated responses"""
+    assert extract_json_object('{"translation": "hola", "romanization": "",}') == {
+        "translation": "hola", "romanization": ""
+    }
+    truncated = '{"main_translation": "hola", "grammar": {"rules": ["a", "b'
+    assert extract_json_object(truncated, ['main_translation']) == {"main_translation": "hola"}
+    print("✅ Complete members are salvaged from damaged objects")
+
+def test_extract_required_keys():
+    """Test that objects missing required keys are skipped or rejected"""
+    text = 'Example: {"question": "?"} Answer: {"question": "Q", "options": ["a"]}'
+    assert extract_json_object(text, ['options']) == {"question": "Q", "options": ["a"]}
+    try:
+        extract_json_object('no json here', ['translation'])
+        assert False, "Expected JSONExtractionError"
+    except JSONExtractionError:
+        pass
+    try:
+        extract_json_object('{"response": "hi"}', ['translation'])
+        assert False, "Expected JSONExtractionError"
+    except JSONExtractionError:
+        pass
+    print("✅ Required keys are enforced")
+
+def test_extract_arrays():
+    """Test array extraction for batch responses"""
+    text = '```json\n[{"index": 0, "translation": "hola"}]\n```'
+    assert extract_json(text, allow_array=True) == [{"index": 0, "translation": "hola"}]
+
+    truncated = 'Here you go: [{"q": "one"}, {"q": "two"},, {"q": "thr'
+    assert extract_json(truncated, allow_array=True) == [{"q": "one"}, {"q": "two"}]
+    print("✅ Top-level arrays are extracted when allowed, keeping complete items")
+
+if __name__ == "__main__":
+    test_sections_complete_in_order()
+    test_first_section_available_before_end()
+    test_extract_ignores_fences_and_prose()
+    test_extract_salvages_damaged_objects()
+    test_extract_required_keys()
+    test_extract_arrays()
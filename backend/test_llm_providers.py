@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test script for the local stub LLM provider
+"""
+
+import json
+import time
+
+import requests
+
+from json_extractor import extract_json, extract_json_object
+from llm_providers import LocalStubProvider, build_stub_response, create_llm_provider
+
+BASIC_PROMPT = '''Translate the following text from en to ja. Return only a clean translation without any formatting. Also provide romanization for non-Latin scripts.
+
+Text to translate: "good morning"
+
+Return your response as a JSON object with this exact structure:
+{
+    "translation": "the translated text",
+    "romanization": "romanized version using standard system",
+    "source_lang": "en",
+    "target_lang": "ja"
+}'''
+
+BATCH_PROMPT = '''Translate each of the following texts from en to es. Translate every text independently.
+
+Texts to translate:
+[
+  {"index": 0, "text": "hello"},
+  {"index": 3, "text": "thanks"}
+]
+
+Return your response as a JSON array with exactly one object per text'''
+
+ADVANCED_PROMPT = '''Provide a comprehensive translation analysis with the following components:
+
+1. Main Translation:
+   - Translate from en to es
+
+Text to analyze: "good night"
+
+Return ONLY a valid JSON response with these exact keys:
+{
+    "main_translation": "",
+    "grammar": {}
+}'''
+
+def test_prompt_families_are_schema_valid():
+    """Test that each prompt family gets JSON with that family's keys"""
+    basic = json.loads(build_stub_response(BASIC_PROMPT))
+    assert basic['translation'] == '[ja] good morning'
+    assert basic['romanization']
+
+    batch = json.loads(build_stub_response(BATCH_PROMPT))
+    assert [item['index'] for item in batch] == [0, 3]
+    assert batch[1]['translation'] == '[es] thanks'
+
+    advanced = json.loads(build_stub_response(ADVANCED_PROMPT))
+    assert set(advanced) == {'main_translation', 'grammar'}
+
+    tutor = json.loads(build_stub_response(
+        'You are an expert and friendly Language Learning Tutor. Your student wants to understand the phrase "hola" in the es language.'
+    ))
+    assert set(tutor) == {'meaning', 'examples', 'grammar_tip', 'cultural_insight'}
+
+    avatar = json.loads(build_stub_response('User just said: "hi"\n Respond in character as Emma'))
+    assert avatar['response'] and avatar['suggested_responses']
+
+    question = json.loads(build_stub_response('Generate a beginner level grammar question for es language learning.'))
+    assert question['correct_answer'] in question['options']
+
+    question_set = json.loads(build_stub_response('Generate 3 different beginner level conversation questions for es language learning.'))
+    assert len(question_set) == 3 and len({item['scenario'] for item in question_set}) == 3
+    print("✅ Every prompt family gets a schema-valid response")
+
+def test_responses_are_deterministic():
+    """Test that the same prompt always gives the same response"""
+    assert build_stub_response(ADVANCED_PROMPT) == build_stub_response(ADVANCED_PROMPT)
+    print("✅ Responses depend only on the prompt")
+
+def test_latency_and_failures():
+    """Test simulated latency, errors, timeouts and malformed responses"""
+    provider = LocalStubProvider(latency_ms=50, latency_jitter_ms=0)
+    start = time.perf_counter()
+    provider.generate(BASIC_PROMPT, 'local-stub', 100, 0.7)
+    assert time.perf_counter() - start >= 0.05
+
+    failing = LocalStubProvider(latency_ms=0, latency_jitter_ms=0, error_rate=1)
+    try:
+        failing.generate(BASIC_PROMPT, 'local-stub', 100, 0.7)
+        assert False, "Expected simulated error"
+    except Exception as e:
+        assert 'Simulated' in str(e)
+
+    timing_out = LocalStubProvider(latency_ms=0, latency_jitter_ms=0, timeout_rate=1)
+    try:
+        timing_out.generate(BASIC_PROMPT, 'local-stub', 100, 0.7, timeout=0.01)
+        assert False, "Expected simulated timeout"
+    except requests.exceptions.Timeout:
+        pass
+
+    malformed = LocalStubProvider(latency_ms=0, latency_jitter_ms=0, malformed_rate=1)
+    text = malformed.generate(BASIC_PROMPT, 'local-stub', 100, 0.7)
+    assert text.startswith('Here is')
+    assert extract_json_object(text, ['translation'])['translation'] == '[ja] good morning'
+    print("✅ Latency and failure distributions are simulated")
+
+def test_stream_reassembles_response():
+    """Test that streamed chunks join to the full response"""
+    provider = LocalStubProvider(latency_ms=0, latency_jitter_ms=0)
+    chunks = list(provider.stream(BATCH_PROMPT, 'local-stub', 100, 0.7))
+    assert len(chunks) > 1
+    assert extract_json(''.join(chunks), allow_array=True) == json.loads(build_stub_response(BATCH_PROMPT))
+    print(f"✅ Stream of {len(chunks)} chunks reassembles the response")
+
+def test_factory_selects_local_without_api_key():
+    """Test that the local provider needs no API key"""
+    provider = create_llm_provider({'provider': 'local', 'api_key': None}, {'latency_ms': 0})
+    assert isinstance(provider, LocalStubProvider)
+    try:
+        create_llm_provider({'provider': 'openrouter', 'api_key': None, 'base_url': '', 'model': 'm'})
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    print("✅ Provider factory selects the local stub")
+
+if __name__ == "__main__":
+    test_prompt_families_are_schema_valid()
+    test_responses_are_deterministic()
+    test_latency_and_failures()
+    test_stream_reassembles_response()
+    test_factory_selects_local_without_api_key()
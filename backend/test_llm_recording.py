@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for LLM traffic recording and replay
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import requests
+
+from llm_providers import LLMProvider, LocalStubProvider, build_stub_response, create_llm_provider
+from llm_recording import LLMRecorder, RecordingProvider, ReplayProvider, load_recording, prompt_hash
+
+PROMPT = 'Generate a beginner level grammar question for es language learning.'
+
+class FlakyProvider(LLMProvider):
+    """Answers from the stub, failing every other call"""
+    name = 'flaky'
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, model, max_tokens, temperature, timeout=None):
+        self.calls += 1
+        if self.calls % 2 == 0:
+            raise requests.exceptions.Timeout("slow upstream")
+        return build_stub_response(prompt)
+
+def record_calls(path, provider, prompts, source=None):
+    recording = RecordingProvider(provider, LLMRecorder(path), source=lambda: source)
+    for prompt in prompts:
+        try:
+            recording.generate(prompt, 'm', 100, 0.7)
+        except requests.exceptions.Timeout:
+            pass
+    recording.recorder.close()
+
+def test_recorder_appends_compact_lines():
+    """Test that each call becomes one compact JSON line with params and latency"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'llm.jsonl')
+        record_calls(path, FlakyProvider(), [PROMPT, PROMPT], source='generate_quiz')
+        record_calls(path, FlakyProvider(), [PROMPT])
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 3
+        assert ', ' not in lines[0].split('"prompt"')[0]
+        first, second, third = (json.loads(line) for line in lines)
+        assert first['h'] == prompt_hash(PROMPT)
+        assert first['max_tokens'] == 100 and first['temperature'] == 0.7 and first['ms'] >= 0
+        assert first['source'] == 'generate_quiz'
+        assert first['response'] == build_stub_response(PROMPT)
+        assert second['error'] == 'timeout' and 'response' not in second
+        assert 'source' not in third
+    print("✅ Calls are appended as compact JSON lines")
+
+def test_replay_serves_by_prompt_hash():
+    """Test that replay cycles through recorded responses and errors"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'llm.jsonl')
+        record_calls(path, FlakyProvider(), [PROMPT, PROMPT])
+        with open(path, 'a') as f:
+            f.write('{"h": "truncated')
+
+        assert len(load_recording(path)[prompt_hash(PROMPT)]) == 2
+        replay = ReplayProvider(path, latency_scale=0)
+        assert replay.generate(PROMPT, 'm', 100, 0.7) == build_stub_response(PROMPT)
+        try:
+            replay.generate(PROMPT, 'm', 100, 0.7)
+            assert False, "Expected replayed timeout"
+        except requests.exceptions.Timeout:
+            pass
+        assert ''.join(replay.stream(PROMPT, 'm', 100, 0.7)) == build_stub_response(PROMPT)
+
+        try:
+            replay.generate('unrecorded prompt', 'm', 100, 0.7)
+            assert False, "Expected miss error"
+        except Exception as e:
+            assert 'No recorded response' in str(e)
+        assert replay.stats() == {'prompts': 1, 'hits': 3, 'misses': 1}
+    print("✅ Replay serves recorded responses by prompt hash")
+
+def test_replay_latency_and_fallback():
+    """Test scaled latency, timeouts and the stub fallback for misses"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'llm.jsonl')
+        record_calls(path, LocalStubProvider(latency_ms=40, latency_jitter_ms=0), [PROMPT])
+
+        replay = ReplayProvider(path, latency_scale=1.0)
+        start = time.perf_counter()
+        replay.generate(PROMPT, 'm', 100, 0.7)
+        assert time.perf_counter() - start >= 0.04
+        try:
+            replay.generate(PROMPT, 'm', 100, 0.7, timeout=0.01)
+            assert False, "Expected timeout"
+        except requests.exceptions.Timeout:
+            pass
+
+        replay = create_llm_provider(
+            {'provider': 'replay', 'api_key': None},
+            {'latency_ms': 0, 'latency_jitter_ms': 0},
+            {'path': path, 'latency_scale': 0, 'miss_fallback': 'local'}
+        )
+        assert replay.generate('Translate this', 'm', 100, 0.7) == build_stub_response('Translate this')
+    print("✅ Replay honours recorded latency and falls back to the stub")
+
+if __name__ == "__main__":
+    test_recorder_appends_compact_lines()
+    test_replay_serves_by_prompt_hash()
+    test_replay_latency_and_fallback()
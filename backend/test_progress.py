@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the aggregate progress queries
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from models import (
+    Base, User, Flashcard, FlashcardReview, QuizScore, PracticeSession, Analytics, UserPreference,
+    create_db_engine
+)
+from db_service import DatabaseService
+
+def make_service(path):
+    engine = create_db_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(bind=engine)
+    return DatabaseService(sessionmaker(autocommit=False, autoflush=False, bind=engine)), engine
+
+def seed(db, now):
+    db.add(User(id='u1', last_active=now))
+    db.add(UserPreference(user_id='u1', daily_goal=15))
+    cards = {
+        'a': ('es', 3, 0.5, now - timedelta(days=1)),
+        'b': ('es', 5, 0.0, now + timedelta(days=3)),
+        'c': ('fr', 4, 1.0, now - timedelta(days=1)),
+    }
+    for card_id, (lang, mastery, rate, next_review) in cards.items():
+        db.add(Flashcard(id=card_id, user_id='u1', original_text=card_id, translated_text=card_id,
+                         source_lang='en', target_lang=lang, mastery_level=mastery, success_rate=rate,
+                         next_review=next_review, created_at=now - timedelta(days=20)))
+    db.flush()
+    # XP: a correct 2+6, a wrong 1, b correct 2+10, c correct 2+8 -> 31
+    for card_id, correct in (('a', True), ('a', False), ('b', True), ('c', True)):
+        db.add(FlashcardReview(flashcard_id=card_id, correct=correct, time_taken=3, timestamp=now))
+    db.add(QuizScore(user_id='u1', quiz_id='q1', score=80, total_questions=10, correct_answers=8,
+                     language='es', difficulty='beginner', answers=[], timestamp=now))
+    db.add(QuizScore(user_id='u1', quiz_id='q2', score=60, total_questions=10, correct_answers=6,
+                     language='fr', difficulty='beginner', answers=[], timestamp=now - timedelta(days=10)))
+    db.add(PracticeSession(user_id='u1', session_type='avatar_conversation', language='es', duration=100,
+                           data={'topic': 'food'}, timestamp=now - timedelta(days=2)))
+    db.add(PracticeSession(user_id='u1', session_type='avatar_conversation', language='fr',
+                           data={'topic': 'travel'}, timestamp=now - timedelta(hours=1)))
+    # Eight consecutive active days; logins do not count towards the streak
+    for i in range(8):
+        db.add(Analytics(id=f'e{i}', user_id='u1', event_type='flashcard_review', event_data={},
+                         timestamp=now - timedelta(days=i)))
+    db.add(Analytics(id='login', user_id='u1', event_type='login', event_data={},
+                     timestamp=now - timedelta(days=9)))
+    db.commit()
+
+def test_comprehensive_progress():
+    """Test the progress figures against hand-computed values"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service, engine = make_service(os.path.join(tmp, 'progress.db'))
+        now = datetime.now()
+        seed(service.get_session(), now)
+
+        progress = service.get_comprehensive_progress('u1', 'all', 'es')
+        assert progress['xp_breakdown'] == {'quiz_xp': 140, 'flashcard_xp': 31, 'practice_xp': 30, 'streak_bonus': 50}
+        assert progress['total_xp'] == 251 and progress['level'] == 1
+        assert progress['current_streak'] == 8 and progress['words_learned'] == 2
+        assert progress['flashcard_stats'] == {'total': 2, 'due_for_review': 1, 'mastered': 1, 'avg_success_rate': 0.5}
+        assert progress['quiz_stats'] == {'completed': 1, 'avg_score': 80.0}
+        assert progress['conversation_stats'] == {'total': 1, 'avg_duration': 100.0, 'last_topic': 'travel'}
+        assert progress['daily_goal'] == 15
+        assert len(progress['activity_data']) == 8
+        assert progress['activity_data'][-1] == {'date': now.date().isoformat(), 'reviews': 4, 'quizzes': 1,
+                                                 'total_activities': 5}
+
+        week = service.get_comprehensive_progress('u1', 'week')
+        assert week['xp_breakdown']['quiz_xp'] == 80 and week['quiz_stats']['completed'] == 1
+        assert week['flashcard_stats']['total'] == 0 and week['flashcard_stats']['avg_success_rate'] == 0.0
+        assert week['words_learned'] == 3 and week['current_streak'] == 8
+        assert week['conversation_stats']['total'] == 2 and week['conversation_stats']['avg_duration'] == 50.0
+        assert len(week['activity_data']) == 8
+
+        service.close_session()
+        engine.dispose()
+    print("✅ Progress figures match hand-computed values")
+
+def test_streak_fallback_and_new_user():
+    """Test the review-based streak fallback and an empty profile"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service, engine = make_service(os.path.join(tmp, 'progress.db'))
+        db = service.get_session()
+        now = datetime.now()
+        db.add(User(id='u2', last_active=now))
+        db.add(Flashcard(id='x', user_id='u2', original_text='x', translated_text='x',
+                         source_lang='en', target_lang='es'))
+        db.flush()
+        for days in (0, 1, 3):
+            db.add(FlashcardReview(flashcard_id='x', correct=False, time_taken=1, timestamp=now - timedelta(days=days)))
+        db.commit()
+        assert service.get_comprehensive_progress('u2')['current_streak'] == 2
+
+        empty = service.get_comprehensive_progress('new-user', 'month')
+        assert empty['total_xp'] == 0 and empty['current_streak'] == 0 and empty['level'] == 1
+        assert empty['conversation_stats'] == {'total': 0, 'avg_duration': 0, 'last_topic': None}
+        assert empty['flashcard_stats']['avg_success_rate'] == 0.0 and empty['quiz_stats']['avg_score'] == 0.0
+        assert len(empty['activity_data']) == 31
+        service.close_session()
+        engine.dispose()
+    print("✅ Streak falls back to review dates; new users get zeros")
+
+def test_query_count_is_constant():
+    """Test that the number of queries does not grow with the number of reviews"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service, engine = make_service(os.path.join(tmp, 'progress.db'))
+        now = datetime.now()
+        seed(service.get_session(), now)
+        service.get_comprehensive_progress('u1', 'month')
+        statements = []
+        event.listen(engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        def count_queries():
+            statements.clear()
+            service.get_comprehensive_progress('u1', 'month')
+            return len(statements)
+
+        before = count_queries()
+        db = service.get_session()
+        db.bulk_insert_mappings(FlashcardReview, [
+            {'flashcard_id': 'a', 'correct': True, 'time_taken': 1, 'timestamp': now - timedelta(days=i % 30)}
+            for i in range(500)
+        ])
+        db.commit()
+        assert count_queries() == before <= 15
+        service.close_session()
+        engine.dispose()
+    print("✅ Query count does not depend on review volume")
+
+if __name__ == "__main__":
+    test_comprehensive_progress()
+    test_streak_fallback_and_new_user()
+    test_query_count_is_constant()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent quiz question pool
+"""
+
+import os
+import tempfile
+import time
+
+from question_pool import QuestionPool
+
+def make_question(i, kind='grammar'):
+    return {
+        'id': f'q{i}',
+        'type': 'multiple_choice',
+        'text': f'{kind} question {i}',
+        'options': ['a', 'b'],
+        'correct_answer': 'a',
+        'explanation': 'e',
+        'points': 12
+    }
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+def test_draw_never_repeats_for_a_user():
+    """Test that a user never gets the same pooled question twice"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = QuestionPool(os.path.join(tmp, 'pool.db'), low_water=0)
+        assert pool.add('es', 'beginner', 'grammar', [make_question(i) for i in range(5)]) == 5
+        assert pool.add('es', 'beginner', 'grammar', [make_question(0)]) == 0
+
+        first = pool.draw('alice', 'es', 'beginner', 'grammar', 3)
+        second = pool.draw('alice', 'es', 'beginner', 'grammar', 3)
+        assert len(first) == 3 and len(second) == 2
+        assert not {q['text'] for q in first} & {q['text'] for q in second}
+        assert all(q['id'] not in ('q0', 'q1', 'q2', 'q3', 'q4') for q in first + second)
+        assert pool.draw('alice', 'es', 'beginner', 'grammar', 1) == []
+
+        assert len(pool.draw('bob', 'es', 'beginner', 'grammar', 5)) == 5
+        assert pool.draw('bob', 'fr', 'beginner', 'grammar', 1) == []
+
+        stats = pool.stats()
+        assert stats['depth'] == {'es/beginner/grammar': 5}
+        assert stats['draws'] == 5 and stats['questions_drawn'] == 10 and stats['shortfalls'] == 3
+        assert stats['draw_ms_p95'] >= 0
+    print("✅ Draws never repeat a question for the same user")
+
+def test_pool_persists_across_instances():
+    """Test that pooled questions and draw history survive a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'pool.db')
+        pool = QuestionPool(path, low_water=0)
+        pool.add('ja', 'advanced', 'conversation', [make_question(i, 'conversation') for i in range(2)])
+        drawn = pool.draw('alice', 'ja', 'advanced', 'conversation', 1)
+
+        reopened = QuestionPool(path, low_water=0)
+        assert reopened.depth('ja', 'advanced', 'conversation') == 2
+        remaining = reopened.draw('alice', 'ja', 'advanced', 'conversation', 2)
+        assert len(remaining) == 1 and remaining[0]['text'] != drawn[0]['text']
+    print("✅ Pool contents and draw history persist")
+
+def test_background_refill_below_low_water():
+    """Test that a draw below the low-water mark refills the pool in the background"""
+    calls = []
+
+    def generate(question_type, language, difficulty, count):
+        calls.append((question_type, language, difficulty, count))
+        start = len(calls) * 100
+        return [make_question(start + i) for i in range(count)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = QuestionPool(os.path.join(tmp, 'pool.db'), generate=generate,
+                            low_water=3, refill_batch=4, max_size=6)
+        assert pool.draw('alice', 'es', 'beginner', 'grammar', 2) == []
+        assert wait_until(lambda: pool.depth('es', 'beginner', 'grammar') == 4)
+        assert calls == [('grammar', 'es', 'beginner', 4)]
+
+        assert len(pool.draw('alice', 'es', 'beginner', 'grammar', 2)) == 2
+        assert wait_until(lambda: pool.depth('es', 'beginner', 'grammar') == 6)
+        assert calls[-1][3] == 2  # capped by max_size
+        assert wait_until(lambda: pool.stats()['pending_refills'] == 0)
+
+        stats = pool.stats()
+        assert stats['refills'] == 2 and stats['questions_added'] == 6
+        assert stats['refill_rate_per_min'] > 0
+    print("✅ Pool refills in the background below the low-water mark")
+
+if __name__ == "__main__":
+    test_draw_never_repeats_for_a_user()
+    test_pool_persists_across_instances()
+    test_background_refill_below_low_water()
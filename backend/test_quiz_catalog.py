@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the indexed quiz catalog
+"""
+
+import json
+import os
+import tempfile
+
+from quiz_catalog import QuizCatalog, read_quizzes_file
+
+def make_quiz(quiz_id, answer='a'):
+    return {
+        'id': quiz_id,
+        'title': f'Quiz {quiz_id}',
+        'questions': [{'question': 'q', 'options': ['a', 'b'], 'correct_answer': answer, 'explanation': 'e'}]
+    }
+
+def write_quizzes(path, quizzes, categories=None):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'quizzes': quizzes, 'categories': categories or [], 'difficulties': ['beginner', 'advanced']}, f)
+
+def test_lookup_by_id_and_level():
+    """Test quiz lookups by id and by language and difficulty"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'quizzes.json')
+        write_quizzes(path, {
+            'es': {'beginner': [make_quiz('es-1'), make_quiz('shared')], 'advanced': [make_quiz('es-2')]},
+            'fr': {'beginner': [make_quiz('shared', 'b')]}
+        }, ['grammar'])
+        catalog = QuizCatalog(path)
+
+        assert [q['id'] for q in catalog.get_quizzes('es', 'beginner')] == ['es-1', 'shared']
+        assert catalog.get_quizzes('es', 'expert') is None
+        assert catalog.has_language('fr') and not catalog.has_language('de')
+
+        language, difficulty, quiz = catalog.find('es-2')
+        assert (language, difficulty, quiz['id']) == ('es', 'advanced', 'es-2')
+        assert catalog.find('shared')[0] == 'es'
+        assert catalog.find('shared', 'fr')[2]['questions'][0]['correct_answer'] == 'b'
+        assert catalog.find('es-1', 'fr') is None
+        assert catalog.find('missing') is None
+        assert catalog.metadata() == {'categories': ['grammar'], 'difficulties': ['beginner', 'advanced']}
+        assert catalog.stats()['loads'] == 1 and catalog.stats()['quizzes'] == 4
+    print("✅ Quizzes are found by id and by level")
+
+def test_reload_on_change():
+    """Test that the file is parsed once and reloaded only after it changes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'quizzes.json')
+        write_quizzes(path, {'es': {'beginner': [make_quiz('es-1')]}})
+        reads = []
+
+        def load(file_path):
+            reads.append(file_path)
+            with open(file_path, encoding='utf-8') as f:
+                return json.load(f)
+
+        catalog = QuizCatalog(path, load=load)
+        for _ in range(5):
+            assert catalog.find('es-1')
+        assert len(reads) == 1
+
+        write_quizzes(path, {'es': {'beginner': [make_quiz('es-1'), make_quiz('es-new')]}})
+        assert catalog.find('es-new')
+        assert len(reads) == 2
+
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{broken')
+        assert catalog.find('es-new'), "Previous catalog is kept when the file cannot be parsed"
+        assert catalog.stats()['load_errors'] == 1
+    print("✅ Catalog reloads only when the file changes")
+
+def test_missing_file():
+    """Test that a missing file is an empty catalog"""
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = QuizCatalog(os.path.join(tmp, 'missing.json'), load=lambda path: {'quizzes': {}})
+        assert catalog.find('x') is None
+        assert not catalog.has_language('es')
+        assert catalog.get_quizzes('es', 'beginner') is None
+    print("✅ Missing file yields an empty catalog")
+
+def test_corrupt_file_is_not_replaced():
+    """Test that the app's loader creates a missing file but never replaces a broken one"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'quizzes.json')
+        saved = []
+
+        def save(file_path, data):
+            saved.append(file_path)
+            write_quizzes(file_path, data['quizzes'])
+
+        catalog = QuizCatalog(path, load=lambda file_path: read_quizzes_file(file_path, save))
+        assert catalog.find('es-1') is None and saved == [path]
+
+        write_quizzes(path, {'es': {'beginner': [make_quiz('es-1')]}})
+        assert catalog.find('es-1')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"quizzes": {"es": ')
+        assert catalog.find('es-1'), "Previous catalog is kept when the file cannot be parsed"
+        assert catalog.stats()['load_errors'] == 1
+        assert saved == [path] and sorted(os.listdir(tmp)) == ['quizzes.json']
+    print("✅ Broken quizzes file is left in place and the catalog kept")
+
+if __name__ == "__main__":
+    test_lookup_by_id_and_level()
+    test_reload_on_change()
+    test_missing_file()
+    test_corrupt_file_is_not_replaced()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script for generated quiz grading
+"""
+
+import random
+
+from fuzzywuzzy import fuzz
+
+from quiz_grading import grade_quiz_answer, grade_quiz_answers, translation_similarities
+
+def random_text(rng):
+    return ''.join(rng.choice('aAbBcé ') for _ in range(rng.randint(0, 30)))
+
+def test_similarity_matches_fuzz_ratio():
+    """Test that batched similarity equals fuzz.ratio on lowercased strings"""
+    rng = random.Random(7)
+    pairs = [(random_text(rng), random_text(rng)) for _ in range(5000)]
+    pairs += [('', ''), ('', 'abc'), ('Hola', 'hola'), ('buenos dias', 'Buenos días')]
+
+    expected = [fuzz.ratio(answer.lower(), correct.lower()) for answer, correct in pairs]
+    assert translation_similarities(pairs) == expected
+    assert translation_similarities(pairs[:1]) == expected[:1]
+    assert translation_similarities([]) == []
+    print(f"✅ Similarity matches fuzz.ratio on {len(pairs)} pairs")
+
+def test_batch_grading_matches_single_grading():
+    """Test that grading a whole quiz gives the same results as grading answer by answer"""
+    questions = [
+        {'type': 'translation', 'correct_answer': 'el perro', 'points': 10},
+        {'type': 'multiple_choice', 'correct_answer': 'gato', 'points': 8},
+        {'type': 'translation', 'correct_answer': 'buenos días', 'points': 10},
+        {'type': 'fill_blank', 'correct_answer': 'Casa', 'points': 5},
+        {'type': 'grammar', 'correct_answer': 'soy', 'points': 12},
+        {'type': 'conversation', 'correct_answer': 'Gracias', 'points': 12},
+        {'type': 'translation', 'correct_answer': 'agua', 'points': 10}
+    ]
+    answers = {0: 'El perro', 1: 'perro', 2: 'buenos dias', 3: 'casa', 4: 'soy', 6: 'leche'}
+
+    graded = grade_quiz_answers(questions, answers)
+    assert [answer['question_index'] for answer in graded] == [0, 1, 2, 3, 4, 6]
+    for answer in graded:
+        index = answer['question_index']
+        assert (answer['correct'], answer['points_earned']) == grade_quiz_answer(questions[index], answers[index])
+
+    by_index = {answer['question_index']: answer for answer in graded}
+    assert by_index[0]['correct'] and by_index[0]['points_earned'] == 10
+    assert by_index[2]['correct'] and by_index[2]['points_earned'] == 9
+    assert not by_index[6]['correct']
+    assert not by_index[1]['correct'] and by_index[3]['correct'] and by_index[4]['correct']
+    print("✅ Batch grading matches per-answer grading")
+
+if __name__ == "__main__":
+    test_similarity_matches_fuzz_ratio()
+    test_batch_grading_matches_single_grading()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script for single-flight request coalescing
+"""
+
+import threading
+import time
+
+from request_coalescer import SingleFlight, make_key
+from request_deadline import Deadline, DeadlineExceeded
+
+def _run_concurrently(count, target):
+    """Start ``count`` threads running ``target`` and wait for them"""
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_concurrent_calls_share_one_execution():
+    """Test that identical concurrent calls execute the function once"""
+    flight = SingleFlight('test')
+    executions = []
+    results = []
+
+    def slow_call():
+        executions.append(1)
+        time.sleep(0.2)
+        return 'translated'
+
+    key = make_key('prompt', 'model', 100, 0.7)
+    _run_concurrently(8, lambda: results.append(flight.do(key, slow_call)))
+
+    assert len(executions) == 1
+    assert results == ['translated'] * 8
+    stats = flight.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 7
+    assert stats['in_flight'] == 0
+    print(f"✅ 8 concurrent calls made {len(executions)} upstream request")
+
+def test_errors_are_shared():
+    """Test that waiting callers receive the leader's exception"""
+    flight = SingleFlight('test')
+    errors = []
+
+    def failing_call():
+        time.sleep(0.2)
+        raise RuntimeError('upstream down')
+
+    def caller():
+        try:
+            flight.do('key', failing_call)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    _run_concurrently(4, caller)
+
+    assert errors == ['upstream down'] * 4
+    assert flight.stats()['errors'] == 1
+    print("✅ Errors are shared with waiting callers")
+
+def test_sequential_calls_are_not_coalesced():
+    """Test that calls after completion execute again"""
+    flight = SingleFlight('test')
+    assert flight.do('key', lambda: 1) == 1
+    assert flight.do('key', lambda: 2) == 2
+    assert flight.stats()['misses'] == 2
+    print("✅ Sequential calls execute independently")
+
+def test_follower_gives_up_at_its_deadline():
+    """Test that a short-budget follower stops waiting while the leader keeps running"""
+    flight = SingleFlight('test')
+    started = threading.Event()
+    results = []
+
+    def slow_call():
+        started.set()
+        time.sleep(0.5)
+        return 'generated'
+
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', slow_call, deadline=Deadline(60))))
+    leader.start()
+    started.wait()
+
+    start = time.perf_counter()
+    try:
+        flight.do('key', slow_call, deadline=Deadline(0.05))
+        assert False, "Expected DeadlineExceeded"
+    except DeadlineExceeded as e:
+        assert e.operation == 'test call'
+    assert time.perf_counter() - start < 0.3
+
+    leader.join()
+    assert results == ['generated']
+    stats = flight.stats()
+    assert stats['hits'] == 1 and stats['follower_timeouts'] == 1 and stats['in_flight'] == 0
+    print("✅ Followers stop waiting when their own deadline runs out")
+
+def test_key_depends_on_parameters():
+    """Test that different generation parameters give different keys"""
+    assert make_key('prompt', 'model', 100) == make_key('prompt', 'model', 100)
+    assert make_key('prompt', 'model', 100) != make_key('prompt', 'model', 200)
+    print("✅ Keys depend on prompt and parameters")
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_execution()
+    test_errors_are_shared()
+    test_sequential_calls_are_not_coalesced()
+    test_follower_gives_up_at_its_deadline()
+    test_key_depends_on_parameters()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for per-request deadline budgets
+"""
+
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, apply_request_deadline, create_db_engine
+from db_service import DatabaseService
+from request_deadline import (
+    Deadline, DeadlineExceeded, parse_budget, start_deadline, get_deadline, clear_deadline,
+    deadline_failure
+)
+
+def test_remaining_budget():
+    """Test that the remaining budget shrinks and bounds layer timeouts"""
+    deadline = Deadline(0.2)
+    assert 0.1 < deadline.remaining() <= 0.2
+    assert deadline.timeout(30) <= 0.2
+    assert deadline.timeout(0.05) == 0.05
+    assert deadline.can_afford(0.1)
+    assert not deadline.can_afford(1)
+
+    time.sleep(0.25)
+    assert deadline.expired
+    assert deadline.remaining() == 0
+    try:
+        deadline.check('LLM call')
+        assert False, "Expected DeadlineExceeded"
+    except DeadlineExceeded as e:
+        assert e.operation == 'LLM call'
+    assert deadline.refuses('database query')
+    assert deadline.refused == 'LLM call'
+    assert Deadline(10).refuses('database query') is False
+    print("✅ Remaining budget bounds timeouts and expires")
+
+def test_parse_budget():
+    """Test header parsing with defaults and a maximum"""
+    assert parse_budget(None, 15, 120) == 15
+    assert parse_budget('5', 15, 120) == 5
+    assert parse_budget('2.5', 15, 120) == 2.5
+    assert parse_budget('600', 15, 120) == 120
+    assert parse_budget('abc', 15, 120) == 15
+    assert parse_budget('-1', 15, 120) == 15
+    print("✅ Header budgets are parsed and clamped")
+
+def test_current_deadline():
+    """Test setting and clearing the current request's deadline"""
+    assert get_deadline() is None
+    deadline = start_deadline(10)
+    assert get_deadline() is deadline
+    clear_deadline()
+    assert get_deadline() is None
+    print("✅ Current deadline is tracked per request")
+
+def test_deadline_failure():
+    """Test that only failed responses are blamed on a refused operation"""
+    assert deadline_failure(500) is None
+    deadline = start_deadline(0.01)
+    time.sleep(0.02)
+    assert deadline_failure(500) is None
+    assert deadline.refuses('database query')
+    assert deadline_failure(200) is None
+    assert deadline_failure(404) is None
+    assert deadline_failure(504) is None
+    assert deadline_failure(500).operation == 'database query'
+    clear_deadline()
+    print("✅ Successful responses are kept after a refusal")
+
+def test_refused_best_effort_write_keeps_response():
+    """Test that a refused track_event is swallowed while a refused read raises"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'deadline.db')}")
+        Base.metadata.create_all(bind=engine)
+        event.listen(engine, 'before_cursor_execute', apply_request_deadline)
+        service = DatabaseService(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+        start_deadline(0.01)
+        time.sleep(0.02)
+        try:
+            assert service.track_event({'user_id': 'u1', 'event_type': 'avatar_conversation'}) is False
+            assert deadline_failure(200) is None
+            try:
+                service.get_flashcards('u1')
+                assert False, "Expected DeadlineExceeded"
+            except DeadlineExceeded as e:
+                assert e.operation == 'database query'
+            assert deadline_failure(500).operation == 'database query'
+        finally:
+            clear_deadline()
+            service.close_session()
+            engine.dispose()
+    print("✅ A refused best-effort write keeps a 200; a refused read raises")
+
+if __name__ == "__main__":
+    test_remaining_budget()
+    test_parse_budget()
+    test_current_deadline()
+    test_deadline_failure()
+    test_refused_best_effort_write_keeps_response()
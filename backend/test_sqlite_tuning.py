@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for SQLite connection tuning and WAL checkpoints
+"""
+
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from sqlite_tuning import WalCheckpointer, apply_sqlite_pragmas, sqlite_pragmas
+
+def make_engine(path, **settings):
+    engine = create_engine(f'sqlite:///{path}')
+    apply_sqlite_pragmas(engine, sqlite_pragmas(**settings))
+    return engine
+
+def test_pragmas_applied_to_connections():
+    """Test that every new connection gets the configured pragmas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(os.path.join(tmp, 'tuned.db'), journal_mode='wal', synchronous='normal',
+                             mmap_size=1 << 20, cache_size=-4096, temp_store='memory', busy_timeout_ms=1234)
+        with engine.connect() as conn:
+            values = [conn.execute(text(f'PRAGMA {name}')).scalar()
+                      for name in ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store', 'busy_timeout')]
+        assert values == ['wal', 1, 1 << 20, -4096, 2, 1234]
+        engine.dispose()
+    print("✅ Pragmas are applied to new connections")
+
+def test_invalid_settings_rejected():
+    """Test that unknown modes are rejected before reaching SQL"""
+    for settings in ({'journal_mode': 'wal; DROP TABLE x'}, {'synchronous': 'sometimes'}, {'temp_store': 'disk'}):
+        try:
+            sqlite_pragmas(**settings)
+            assert False, f"Expected ValueError for {settings}"
+        except ValueError:
+            pass
+    try:
+        WalCheckpointer(None, mode='eventually')
+        assert False, "Expected ValueError for checkpoint mode"
+    except ValueError:
+        pass
+    print("✅ Invalid settings are rejected")
+
+def test_wal_checkpoint():
+    """Test manual and periodic checkpoints of the write-ahead log"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'wal.db')
+        engine = make_engine(path)
+        with engine.begin() as conn:
+            conn.execute(text('CREATE TABLE t (x TEXT)'))
+            for i in range(200):
+                conn.execute(text('INSERT INTO t VALUES (:x)'), {'x': 'x' * 500})
+
+        checkpointer = WalCheckpointer(engine, interval=0.05, mode='truncate')
+        result = checkpointer.checkpoint()
+        assert result['busy'] == 0 and result['log_frames'] == result['checkpointed_frames']
+        assert os.path.getsize(path + '-wal') == 0
+
+        assert checkpointer.start() and not checkpointer.start()
+        deadline = time.time() + 2
+        while checkpointer.stats()['checkpoints'] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        checkpointer.stop()
+        stats = checkpointer.stats()
+        assert stats['checkpoints'] >= 3 and stats['errors'] == 0 and not stats['running']
+        engine.dispose()
+    print("✅ WAL checkpoints run on demand and periodically")
+
+if __name__ == "__main__":
+    test_pragmas_applied_to_connections()
+    test_invalid_settings_rejected()
+    test_wal_checkpoint()
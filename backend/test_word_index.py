@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for random word selection through the word id index
+"""
+
+import os
+import tempfile
+
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from models import Base, WordOfDay, create_db_engine
+from db_service import DatabaseService
+
+def make_service(path, refresh=300):
+    engine = create_db_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(bind=engine)
+    return DatabaseService(sessionmaker(autocommit=False, autoflush=False, bind=engine), refresh), engine
+
+def count_statements(engine):
+    statements = []
+    event.listen(engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+def test_random_pick_loads_one_row():
+    """Test that a random pick queries one row by primary key once the index is built"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service, engine = make_service(os.path.join(tmp, 'words.db'))
+        for i in range(30):
+            assert service.add_word_of_day('es', {'word': f'palabra{i}', 'difficulty': 'advanced' if i % 3 else 'beginner'})
+        assert service.add_word_of_day('fr', {'word': 'mot'})
+
+        assert service.get_word_of_day('es')['word'].startswith('palabra')
+        statements = count_statements(engine)
+        picks = {service.get_word_of_day('es')['word'] for _ in range(50)}
+        assert len(picks) > 5
+        assert 0 < len(statements) <= 50
+        assert all('WHERE words_of_day.id = ?' in statement for statement in statements)
+
+        beginner = {service.get_detailed_word('es', 'beginner')['word'] for _ in range(30)}
+        assert beginner <= {f'palabra{i}' for i in range(0, 30, 3)}
+        assert service.get_detailed_word('es', 'all')['word'].startswith('palabra')
+        assert service.get_detailed_word('es', 'expert') is None
+        assert service.get_word_of_day('de') is None
+        assert service.get_detailed_word('es', search_term='palabra7')['word'] == 'palabra7'
+        service.close_session()
+        engine.dispose()
+    print("✅ Random picks load a single row by primary key")
+
+def test_index_follows_writes():
+    """Test that added words are picked up and deleted words are skipped"""
+    with tempfile.TemporaryDirectory() as tmp:
+        service, engine = make_service(os.path.join(tmp, 'words.db'))
+        assert service.get_word_of_day('it') is None
+        assert service.add_word_of_day('it', {'word': 'parola'})
+        assert service.get_word_of_day('it')['word'] == 'parola'
+
+        # Another process replaces the word behind the index's back
+        db = service.get_session()
+        db.query(WordOfDay).filter(WordOfDay.language == 'it').delete()
+        db.add(WordOfDay(language='it', word='nuova', difficulty='beginner'))
+        db.commit()
+        assert service.get_word_of_day('it')['word'] == 'nuova'
+        service.close_session()
+        engine.dispose()
+    print("✅ Index follows added and deleted words")
+
+if __name__ == "__main__":
+    test_random_pick_loads_one_row()
+    test_index_follows_writes()
@@ -5,6 +5,7 @@ from sentence_transformers import SentenceTransformer
 import os
 import json
 import logging
+import time
 from rag_error_handler import (
     handle_vector_service_errors, 
     IndexLoadError, 
@@ -94,7 +95,7 @@ class VectorService:
             return False
     
     @handle_vector_service_errors
-    def search(self, query_text: str, k: int = 5, language_filter: str = None):
+    def search(self, query_text: str, k: int = 5, language_filter: str = None, timeout: float = None):
         """
         Searches the index for the most similar documents.
         
@@ -102,11 +103,18 @@ class VectorService:
             query_text (str): The text to search for
             k (int): Number of similar documents to return (default: 5)
             language_filter (str): Optional language code to filter results
+            timeout (float): Optional time budget in seconds; the search is
+                skipped when the budget is used up
             
         Returns:
             list: List of similar documents with metadata, empty list if no index loaded
         """
         try:
+            if timeout is not None and timeout <= 0:
+                logger.warning("No time budget left for vector search, skipping")
+                return []
+            search_start = time.monotonic()
+            
             # Check if index is loaded
             if self.index is None:
                 logger.warning("No vector index loaded, attempting to load...")
@@ -130,6 +138,10 @@ class VectorService:
             # Encode query text
             query_vector = self.model.encode([query_text.strip()]).astype('float32')
             
+            if timeout is not None and time.monotonic() - search_start > timeout:
+                logger.warning(f"Vector search exceeded its {timeout:.2f}s budget while encoding, skipping")
+                return []
+            
             # Normalize for cosine similarity
             faiss.normalize_L2(query_vector)
             